@@ -0,0 +1,77 @@
+"""Add points_ledger table
+
+Revision ID: 3e9a0c7b5f18
+Revises: d17e5b3f0a42
+Create Date: 2026-10-17 16:48:52.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e9a0c7b5f18'
+down_revision: Union[str, Sequence[str], None] = 'd17e5b3f0a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Carry existing balances over as opening rows so that the reconciliation
+# (db/reconcile_points.py) reproduces them exactly:
+#   - per-event earnings from user_event_data,
+#   - total_earned minus those as one global opening row (negative when the
+#     per-event tallies exceed total_earned; opening rows count signed),
+#   - total_spent as one purchase row,
+#   - whatever remains to reach users.points as an 'adjustment' row, which
+#     moves points only (never total_earned / total_spent).
+OPENING_EVENT_ROWS_SQL = """
+    INSERT INTO points_ledger (user_id, event_id, delta, source, source_ref, created_at)
+    SELECT user_id, event_id, points_earned, 'opening', 'user_event_data', now()
+    FROM user_event_data
+    WHERE points_earned > 0
+"""
+
+OPENING_USER_ROWS_SQL = """
+    WITH b AS (
+        SELECT u.id, u.points, u.total_earned, u.total_spent,
+               COALESCE((SELECT SUM(d.points_earned) FROM user_event_data d
+                         WHERE d.user_id = u.id AND d.points_earned > 0), 0) AS event_earned
+        FROM users u
+    )
+    INSERT INTO points_ledger (user_id, event_id, delta, source, source_ref, created_at)
+    SELECT id, NULL::integer, total_earned - event_earned, 'opening', 'users', now()
+    FROM b WHERE total_earned <> event_earned
+    UNION ALL
+    SELECT id, NULL::integer, -total_spent, 'purchase', 'opening', now()
+    FROM b WHERE total_spent > 0
+    UNION ALL
+    SELECT id, NULL::integer, points - (total_earned - total_spent), 'adjustment', 'opening', now()
+    FROM b WHERE points <> total_earned - total_spent
+"""
+
+
+def upgrade():
+    op.create_table(
+        'points_ledger',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('event_id', sa.Integer(), sa.ForeignKey('events.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('delta', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(), nullable=False),
+        sa.Column('source_ref', sa.String(), nullable=True),
+        sa.Column('created_by', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_points_ledger_user_created', 'points_ledger', ['user_id', 'created_at'])
+    op.create_index('ix_points_ledger_event_user', 'points_ledger', ['event_id', 'user_id'])
+
+    op.execute(OPENING_EVENT_ROWS_SQL)
+    op.execute(OPENING_USER_ROWS_SQL)
+
+
+def downgrade():
+    op.drop_index('ix_points_ledger_event_user', table_name='points_ledger')
+    op.drop_index('ix_points_ledger_user_created', table_name='points_ledger')
+    op.drop_table('points_ledger')
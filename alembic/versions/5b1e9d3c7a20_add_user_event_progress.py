@@ -0,0 +1,41 @@
+"""Add user_event_progress table
+
+Revision ID: 5b1e9d3c7a20
+Revises: 12c600778ba8
+Create Date: 2026-10-17 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e9d3c7a20'
+down_revision: Union[str, Sequence[str], None] = '12c600778ba8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Rows are created lazily by the trigger engine; run db/rebuild_progress.py to backfill eagerly.
+    op.create_table(
+        'user_event_progress',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('event_id', sa.Integer(), sa.ForeignKey('events.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('report_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('action_counts_json', sa.Text(), nullable=False, server_default='{}'),
+        sa.Column('prompt_counts_json', sa.Text(), nullable=False, server_default='{}'),
+        sa.Column('distinct_prompt_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('participation_days_json', sa.Text(), nullable=False, server_default='[]'),
+        sa.Column('participation_day_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_participation_day', sa.String(), nullable=True),
+        sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.String(), nullable=False),
+        sa.UniqueConstraint('user_id', 'event_id', name='uix_user_event_progress')
+    )
+
+def downgrade():
+    op.drop_table('user_event_progress')
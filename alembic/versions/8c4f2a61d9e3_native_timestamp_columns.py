@@ -0,0 +1,87 @@
+"""Native timestamp/date columns for time-range queries
+
+Revision ID: 8c4f2a61d9e3
+Revises: 5b1e9d3c7a20
+Create Date: 2026-10-17 14:03:52.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2a61d9e3'
+down_revision: Union[str, Sequence[str], None] = '5b1e9d3c7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, nullable)
+TIMESTAMP_COLUMNS = [
+    ('user_actions', 'created_at', False),
+    ('user_event_data', 'joined_at', False),
+    ('user_event_data', 'last_active_at', True),
+    ('user_event_trigger_log', 'granted_at', False),
+]
+DATE_COLUMNS = [
+    ('events', 'start_date', False),
+    ('events', 'end_date', True),
+]
+
+# Same text shape as now_iso() so code still reading strings after a downgrade keeps working
+_ISO_TEXT = """to_char({col} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"+00:00"')"""
+
+
+def _source(col, nullable):
+    return f"NULLIF({col}, '')" if nullable else col
+
+
+def upgrade():
+    # ISO strings carrying an offset keep it; naive legacy values are read as UTC.
+    op.execute("SET LOCAL TIME ZONE 'UTC'")
+
+    for table, col, nullable in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table, col,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.String(),
+            existing_nullable=nullable,
+            postgresql_using=f"{_source(col, nullable)}::timestamptz",
+        )
+    for table, col, nullable in DATE_COLUMNS:
+        op.alter_column(
+            table, col,
+            type_=sa.Date(),
+            existing_type=sa.String(),
+            existing_nullable=nullable,
+            postgresql_using=f"{_source(col, nullable)}::date",
+        )
+
+    op.create_index('ix_user_actions_user_event_created', 'user_actions', ['user_id', 'event_id', 'created_at'])
+    op.create_index('ix_user_actions_event_created', 'user_actions', ['event_id', 'created_at'])
+    op.create_index('ix_user_actions_action_event_created', 'user_actions', ['action_event_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_user_actions_action_event_created', table_name='user_actions')
+    op.drop_index('ix_user_actions_event_created', table_name='user_actions')
+    op.drop_index('ix_user_actions_user_event_created', table_name='user_actions')
+
+    for table, col, nullable in DATE_COLUMNS:
+        op.alter_column(
+            table, col,
+            type_=sa.String(),
+            existing_type=sa.Date(),
+            existing_nullable=nullable,
+            postgresql_using=f"{col}::text",
+        )
+    for table, col, nullable in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table, col,
+            type_=sa.String(),
+            existing_type=sa.DateTime(timezone=True),
+            existing_nullable=nullable,
+            postgresql_using=_ISO_TEXT.format(col=col),
+        )
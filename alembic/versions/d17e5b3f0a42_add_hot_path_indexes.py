@@ -0,0 +1,45 @@
+"""Add secondary indexes for hot filter columns
+
+Revision ID: d17e5b3f0a42
+Revises: 8c4f2a61d9e3
+Create Date: 2026-10-17 15:21:07.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd17e5b3f0a42'
+down_revision: Union[str, Sequence[str], None] = '8c4f2a61d9e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # user_actions (user_id/event_id/action_event_id) is covered by 8c4f2a61d9e3;
+    # action_events.event_id, inventory_rewards.user_id and user_action_prompts.user_action_id
+    # are the leading columns of their unique constraints.
+    op.create_index('ix_event_triggers_event', 'event_triggers', ['event_id'])
+    op.create_index('ix_user_event_trigger_log_trigger', 'user_event_trigger_log', ['event_trigger_id'])
+    op.create_index('ix_user_action_prompts_prompt_action', 'user_action_prompts', ['event_prompt_id', 'user_action_id'])
+    op.create_index('ix_reward_events_availability_event', 'reward_events', ['availability', 'event_id'])
+    op.create_index(
+        'ix_user_event_data_event_points', 'user_event_data',
+        ['event_id', sa.text('points_earned DESC')],
+    )
+    op.create_index(
+        'ix_inventory_rewards_user_equipped', 'inventory_rewards', ['user_id'],
+        postgresql_where=sa.text('is_equipped IS true'),     # same predicate as db/schema.py and inventory_crud
+    )
+
+
+def downgrade():
+    op.drop_index('ix_inventory_rewards_user_equipped', table_name='inventory_rewards')
+    op.drop_index('ix_user_event_data_event_points', table_name='user_event_data')
+    op.drop_index('ix_reward_events_availability_event', table_name='reward_events')
+    op.drop_index('ix_user_action_prompts_prompt_action', table_name='user_action_prompts')
+    op.drop_index('ix_user_event_trigger_log_trigger', table_name='user_event_trigger_log')
+    op.drop_index('ix_event_triggers_event', table_name='event_triggers')
@@ -0,0 +1,280 @@
+# benchmarks/bench_hot_paths.py
+"""
+Hot-path benchmark suite, run against a dataset from benchmarks/dataset.py.
+
+Times the code behind the busiest commands, each call in its own session like
+run_in_session does (connection checkout included, setup excluded):
+
+    submit_user_action, check_and_apply_triggers_for_action (rolled back)
+    the three leaderboards, list_actions_for_action_events (one civic day),
+    page_actions_for_action_events (first page), get_inshop_catalog_grouped,
+    fetch_user_inventory_ordered, generate_profile_card (no DB)
+
+Results go to JSON so runs can be compared:
+
+    DB_MODE=test python benchmarks/dataset.py create
+    DB_MODE=test python benchmarks/bench_hot_paths.py --out before.json
+    ... change something ...
+    DB_MODE=test python benchmarks/bench_hot_paths.py --out after.json --compare before.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PIL import Image
+from sqlalchemy import func, select
+
+from benchmarks.dataset import dataset_counts, synthetic_users
+from db.database import ENGINE_SETTINGS, SessionLocal, get_pool_stats, mode
+from db.schema import ActionEvent, Event, User, UserAction
+from bot.crud.inventory_crud import fetch_user_inventory_ordered
+from bot.crud.reporting_crud import (
+    leaderboard_actions_by_action_events,
+    leaderboard_points_by_event,
+    leaderboard_prompts_by_event,
+    list_actions_for_action_events,
+    page_actions_for_action_events,
+)
+from bot.crud.shop_crud import get_inshop_catalog_grouped
+from bot.domain.dto import UserActionCreateDTO
+from bot.services.event_triggers_service import check_and_apply_triggers_for_action
+from bot.services.user_actions_service import submit_user_action
+from bot.ui.renderers.profile_card import generate_profile_card
+
+LEADERBOARD_LIMIT = 25
+
+# ---------------------------------------------------------------------------
+# Dataset context
+# ---------------------------------------------------------------------------
+
+def load_context(prefix: str, rng: random.Random) -> SimpleNamespace:
+    """Ids the cases draw from; loaded once, outside any timing."""
+    like = f"{prefix}\\_%"
+    with SessionLocal() as s:
+        events = []
+        for ev_id, ev_key in s.execute(select(Event.id, Event.event_key).where(Event.event_key.like(like)).order_by(Event.id)):
+            aes = s.execute(
+                select(ActionEvent.id, ActionEvent.prompts_required).where(ActionEvent.event_id == ev_id)
+            ).all()
+            lo, hi = s.execute(
+                select(func.min(UserAction.id), func.max(UserAction.id)).where(UserAction.event_id == ev_id)
+            ).one()
+            events.append(SimpleNamespace(
+                id=ev_id, key=ev_key,
+                ae_ids=[a.id for a in aes],
+                plain_ae_ids=[a.id for a in aes if not a.prompts_required],
+                action_id_range=(lo, hi),
+            ))
+        if not events or events[0].action_id_range[0] is None:
+            raise SystemExit(f"❌ No dataset '{prefix}' found: run benchmarks/dataset.py create first.")
+
+        users = s.execute(
+            select(User.id, User.user_discord_id, User.username, User.display_name, User.nickname)
+            .where(*synthetic_users(prefix))
+        ).all()
+        days = [d for (d,) in s.execute(
+            select(func.distinct(func.date(UserAction.created_at))).where(UserAction.event_id == events[0].id)
+        )]
+        counts = dataset_counts(s, prefix)
+
+    return SimpleNamespace(events=events, users=users, days=sorted(str(d) for d in days), counts=counts, rng=rng)
+
+def _member(row) -> SimpleNamespace:
+    return SimpleNamespace(id=int(row.user_discord_id), name=row.username, display_name=row.display_name,
+                           global_name=None, nick=row.nickname)
+
+def _random_action(s, ctx):
+    """A random existing report (ids have gaps after drops; retry)."""
+    for _ in range(50):
+        ev = ctx.rng.choice(ctx.events)
+        ua = s.get(UserAction, ctx.rng.randint(*ev.action_id_range))
+        if ua is not None:
+            return ua
+    raise RuntimeError("no user_action found")
+
+# ---------------------------------------------------------------------------
+# Cases: each returns the seconds spent in the measured call
+# ---------------------------------------------------------------------------
+
+def _timed(fn, *args, **kwargs) -> float:
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - t0
+
+def case_submit_user_action(ctx) -> float:
+    ev, user = ctx.rng.choice(ctx.events), ctx.rng.choice(ctx.users)
+    payload = UserActionCreateDTO(
+        user_discord_id=user.user_discord_id, action_event_id=ctx.rng.choice(ev.plain_ae_ids),
+        url_value="https://archiveofourown.org/works/1", numeric_value=1200,
+        text_value="bench", boolean_value=None, date_value=None,
+    )
+    s = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        result = submit_user_action(s, _member(user), payload)
+        s.flush()
+        dt = time.perf_counter() - t0
+        if isinstance(result, str):
+            raise RuntimeError(f"submit_user_action refused: {result}")
+        return dt
+    finally:
+        s.rollback()
+        s.close()
+
+def case_check_and_apply_triggers(ctx) -> float:
+    s = SessionLocal()
+    try:
+        ua = _random_action(s, ctx)
+        user, event = s.get(User, ua.user_id), s.get(Event, ua.event_id)
+        t0 = time.perf_counter()
+        check_and_apply_triggers_for_action(s, user=user, event=event, current_action=ua)
+        s.flush()
+        return time.perf_counter() - t0
+    finally:
+        s.rollback()
+        s.close()
+
+def _read_case(fn, args_for):
+    """Time fn(session, *args, **kwargs) in a fresh session; args_for(ctx) -> (args, kwargs)."""
+    def run(ctx) -> float:
+        args, kwargs = args_for(ctx)
+        t0 = time.perf_counter()
+        with SessionLocal() as s:
+            fn(s, *args, **kwargs)
+        return time.perf_counter() - t0
+    return run
+
+def _top_of_event(ctx):
+    return (ctx.rng.choice(ctx.events).id,), {"limit": LEADERBOARD_LIMIT}
+
+def _top_of_action_events(ctx):
+    ev = ctx.rng.choice(ctx.events)
+    return (ev.id, ev.ae_ids), {"limit": LEADERBOARD_LIMIT}
+
+def _one_civic_day(ctx):
+    ev = ctx.events[0]
+    return (ev.id, ev.ae_ids, ctx.rng.choice(ctx.days), "created_at", False), {}
+
+def _first_page(ctx):
+    ev = ctx.rng.choice(ctx.events)
+    return (ev.id, ev.ae_ids, None, "created_at", False), {"limit": 25}
+
+def _random_user(ctx):
+    return (ctx.rng.choice(ctx.users).id,), {}
+
+CASES = {
+    "submit_user_action": case_submit_user_action,
+    "check_and_apply_triggers_for_action": case_check_and_apply_triggers,
+    "leaderboard_points_by_event": _read_case(leaderboard_points_by_event, _top_of_event),
+    "leaderboard_prompts_by_event": _read_case(leaderboard_prompts_by_event, _top_of_event),
+    "leaderboard_actions_by_action_events": _read_case(leaderboard_actions_by_action_events, _top_of_action_events),
+    "list_actions_for_action_events_day": _read_case(list_actions_for_action_events, _one_civic_day),
+    "page_actions_for_action_events": _read_case(page_actions_for_action_events, _first_page),
+    "get_inshop_catalog_grouped": _read_case(get_inshop_catalog_grouped, lambda ctx: ((), {})),
+    "fetch_user_inventory_ordered": _read_case(fetch_user_inventory_ordered, _random_user),
+}
+
+def _profile_card_case():
+    avatar = io.BytesIO()
+    Image.new("RGB", (128, 128), (90, 60, 140)).save(avatar, format="PNG")
+    avatar = avatar.getvalue()
+    badges = [Image.new("RGBA", (40, 40), (200, 160, 40, 255)) for _ in range(6)] + ["⭐", "🌙"]
+
+    def run(ctx) -> float:
+        return _timed(generate_profile_card, avatar, "Member 42", 1234, 56789, "Prompt Master", badges)
+    return run
+
+CASES["generate_profile_card"] = _profile_card_case()
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def summarize(samples: list[float]) -> dict:
+    ms = sorted(x * 1000 for x in samples)
+    return {
+        "n": len(ms),
+        "min_ms": round(ms[0], 3),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare(results: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        base = json.load(f)["results"]
+    print(f"\n{'case':<40} {'base p50':>10} {'p50':>10} {'change':>8}")
+    for name, r in results.items():
+        b = base.get(name)
+        if not b:
+            print(f"{name:<40} {'-':>10} {r['p50_ms']:>10.2f} {'new':>8}")
+            continue
+        change = (r["p50_ms"] - b["p50_ms"]) / b["p50_ms"] * 100 if b["p50_ms"] else 0.0
+        print(f"{name:<40} {b['p50_ms']:>10.2f} {r['p50_ms']:>10.2f} {change:>+7.1f}%")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--prefix", default="bench", help="dataset prefix (benchmarks/dataset.py)")
+    ap.add_argument("--repeat", type=int, default=30, help="timed calls per case")
+    ap.add_argument("--warmup", type=int, default=3, help="untimed calls per case (caches, plans)")
+    ap.add_argument("--only", nargs="*", choices=sorted(CASES), help="run a subset of cases")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--compare", help="baseline JSON to compare p50s against")
+    args = ap.parse_args()
+
+    ctx = load_context(args.prefix, random.Random(args.seed))
+    results = {}
+    for name in args.only or CASES:
+        case = CASES[name]
+        for _ in range(args.warmup):
+            case(ctx)
+        results[name] = summarize([case(ctx) for _ in range(args.repeat)])
+        r = results[name]
+        print(f"{name:<40} p50={r['p50_ms']:>9.2f} ms  p95={r['p95_ms']:>9.2f} ms  max={r['max_ms']:>9.2f} ms")
+
+    report = {
+        "meta": {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "db_mode": mode,
+            "engine": ENGINE_SETTINGS,
+            "python": platform.python_version(),
+            "dataset": {"prefix": args.prefix, **ctx.counts},
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "pool": get_pool_stats(),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"📝 Results written to {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+# benchmarks/bench_purchase.py
+"""
+Concurrent shop purchase benchmark.
+
+N buyers (threads, one DB session each, like the bot's DB executor) hammer the
+same stackable shop item. Reports throughput/latency and checks the invariants
+the atomic purchase must keep: nobody overspends, every debit has exactly one
+inventory unit and one number_granted bump.
+
+    DB_MODE=test python benchmarks/bench_purchase.py --buyers 50 --rounds 20
+
+Creates its own event/reward/users (key prefix 'benchpurch') and deletes them afterwards.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db.database import db_session, get_pool_stats
+from db.schema import Event, EventStatus, Inventory, Reward, RewardEvent, User
+from bot.crud.purchase_crud import PurchaseError, purchase_reward
+
+PREFIX = "benchpurch"
+
+def _setup(buyers: int, price: int, starting_points: int) -> tuple[int, list[int]]:
+    now = datetime.now(timezone.utc).isoformat()
+    with db_session() as s:
+        ev = Event(
+            event_key=f"{PREFIX}_ev", event_name="Bench event", event_type="freeform",
+            event_description="bench", start_date="2025-01-01", event_status=EventStatus.active,
+            created_by="bench", created_at=now,
+        )
+        rw = Reward(
+            reward_key=f"{PREFIX}_rw", reward_type="title", reward_name="Bench title",
+            is_released_on_active=False, is_stackable=True, number_granted=0,
+            created_by="bench", created_at=now,
+        )
+        s.add_all([ev, rw])
+        s.flush()
+        s.add(RewardEvent(
+            reward_event_key=f"{PREFIX}_re", event_id=ev.id, reward_id=rw.id,
+            availability="inshop", price=price, created_by="bench", created_at=now,
+        ))
+        users = [
+            User(user_discord_id=f"{PREFIX}{i}", username=f"{PREFIX}{i}", display_name=f"Buyer {i}",
+                 points=starting_points, created_at=now)
+            for i in range(buyers)
+        ]
+        s.add_all(users)
+        s.flush()
+        return rw.id, [u.id for u in users]
+
+def _teardown(reward_id: int, user_ids: list[int]) -> None:
+    with db_session() as s:
+        s.query(Inventory).filter(Inventory.reward_id == reward_id).delete(synchronize_session=False)
+        s.query(RewardEvent).filter(RewardEvent.reward_event_key == f"{PREFIX}_re").delete(synchronize_session=False)
+        s.query(Reward).filter(Reward.id == reward_id).delete(synchronize_session=False)
+        s.query(Event).filter(Event.event_key == f"{PREFIX}_ev").delete(synchronize_session=False)
+        s.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+
+def _buyer(user_id: int, rounds: int, barrier: threading.Barrier, latencies: list, outcome: dict, lock):
+    barrier.wait()
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        try:
+            with db_session() as s:
+                purchase_reward(s, user_id, f"{PREFIX}_re")
+            key = "ok"
+        except PurchaseError:
+            key = "refused"
+        except Exception as e:
+            print(f"❌ purchase failed: {e}")
+            key = "error"
+        dt = time.perf_counter() - t0
+        with lock:
+            latencies.append(dt)
+            outcome[key] += 1
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--buyers", type=int, default=50)
+    ap.add_argument("--rounds", type=int, default=20, help="purchase attempts per buyer")
+    ap.add_argument("--price", type=int, default=10)
+    ap.add_argument("--points", type=int, default=150, help="starting wallet (default: enough for 15 of 20 rounds)")
+    args = ap.parse_args()
+
+    reward_id, user_ids = _setup(args.buyers, args.price, args.points)
+    latencies, outcome, lock = [], {"ok": 0, "refused": 0, "error": 0}, threading.Lock()
+    barrier = threading.Barrier(args.buyers)
+    threads = [
+        threading.Thread(target=_buyer, args=(uid, args.rounds, barrier, latencies, outcome, lock))
+        for uid in user_ids
+    ]
+    try:
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+
+        with db_session() as s:
+            users = s.query(User).filter(User.id.in_(user_ids)).all()
+            units = sum(q for (q,) in s.query(Inventory.quantity).filter(Inventory.reward_id == reward_id))
+            granted = s.query(Reward.number_granted).filter(Reward.id == reward_id).scalar()
+            overspent = [u.id for u in users if u.points < 0]
+            spent = sum(u.total_spent for u in users)
+            wallet_ok = all(u.points + u.total_spent == args.points for u in users)
+
+        lat_ms = sorted(x * 1000 for x in latencies)
+        p95 = lat_ms[int(len(lat_ms) * 0.95) - 1] if lat_ms else 0.0
+        print(f"buyers={args.buyers} attempts={len(latencies)} elapsed={elapsed:.2f}s "
+              f"throughput={len(latencies) / elapsed:.1f} purchases/s")
+        print(f"outcomes: {outcome}")
+        print(f"latency ms: p50={statistics.median(lat_ms):.1f} p95={p95:.1f} max={lat_ms[-1]:.1f}")
+        print(f"pool: {get_pool_stats()}")
+        print(f"invariants: units={units} number_granted={granted} successes={outcome['ok']} "
+              f"spent={spent} (= {outcome['ok']} x {args.price}) overspent={overspent} wallets_consistent={wallet_ok}")
+        ok = (units == granted == outcome["ok"] and spent == outcome["ok"] * args.price
+              and not overspent and wallet_ok and outcome["error"] == 0)
+        print("✅ invariants hold" if ok else "❌ invariants violated")
+        return 0 if ok else 1
+    finally:
+        _teardown(reward_id, user_ids)
+
+if __name__ == "__main__":
+    sys.exit(main())
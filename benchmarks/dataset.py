@@ -0,0 +1,344 @@
+# benchmarks/dataset.py
+"""
+Synthetic community dataset for benchmarks.
+
+Populates users, events, actions/action events, prompts, triggers, shop
+rewards, inventories and a large user_actions / user_action_prompts history
+with skewed, community-like distributions:
+
+- activity per user is heavy-tailed (Pareto): a few regulars post most reports
+- prompt popularity follows a Zipf curve, 1-3 prompts per prompt report
+- reports spread over the last EVENT_DAYS days, peaking in the evening (UTC)
+- balances (users, user_event_data) and an opening points_ledger row per
+  (user, event) are consistent with the generated history, and
+  user_event_progress is built, as in production after the backfill
+
+    DB_MODE=test python benchmarks/dataset.py create --users 5000 --events 4 --reports 2000000
+    DB_MODE=test python benchmarks/dataset.py drop
+
+Everything is keyed by --prefix (default 'bench') so `drop` removes exactly
+what `create` inserted: users are matched by their synthetic Discord id range
+(one range per prefix), never by name alone. Refuses to run with DB_MODE=prod.
+Postgres only (RETURNING on multi-row inserts).
+"""
+import argparse
+import json
+import zlib
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete, func, insert, select, update
+
+from db.database import db_session, mode
+from bot.crud.user_event_progress_crud import rebuild_all_user_event_progress
+from db.schema import (
+    Action, ActionEvent, Event, EventPrompt, EventStatus, EventTrigger, Inventory, PointsLedger,
+    Reward, RewardEvent, User, UserAction, UserActionPrompt, UserEventData,
+)
+
+EVENT_DAYS = 30
+DISCORD_ID_BASE = 900_000_000_000_000_000     # synthetic snowflakes, far from real ones
+PREFIX_ID_SLOT = 1_000_000_000                 # ids per prefix; all synthetic ids keep 18 digits
+PREFIX_SLOTS = 100_000_000
+BATCH = 5000
+
+# (action key suffix, input fields, is prompt action)
+ACTION_KINDS = [
+    ("submit_prompt", ["url_value"], True),
+    ("submit_fic", ["url_value"], False),
+    ("word_count", ["numeric_value"], False),
+    ("comment", ["text_value"], False),
+    ("check_in", [], False),
+]
+
+# (trigger type, config) per event; thresholds sized for the default dataset
+TRIGGERS = [
+    ("event_count", {"min_reports": 10}),
+    ("event_count", {"min_reports": 50}),
+    ("prompt_unique", {"min_count": 5}),
+    ("prompt_unique", {"min_count": 15, "group": "sfw"}),
+    ("prompt_count", {"min_count": 3}),
+    ("streak", {"min_days": 7}),
+    ("participation_days", {"min_days": 14}),
+    ("points_won", {"min_points": 500}),
+    ("global_count", {"min_reports": 100}),
+]
+
+def _id_base(prefix: str) -> int:
+    return DISCORD_ID_BASE + (zlib.crc32(prefix.encode()) % PREFIX_SLOTS) * PREFIX_ID_SLOT
+
+def discord_id(prefix: str, i: int) -> str:
+    return str(_id_base(prefix) + i)
+
+def synthetic_users(prefix: str):
+    """Users created by create_dataset(prefix): the prefix's id range AND username."""
+    lo, hi = discord_id(prefix, 0), discord_id(prefix, PREFIX_ID_SLOT - 1)
+    return (
+        func.length(User.user_discord_id) == len(lo),      # same length, so string order == numeric order
+        User.user_discord_id.between(lo, hi),
+        User.username.like(f"{prefix}\\_u%"),
+    )
+
+def _chunks(seq, size=BATCH):
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+def _zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return [1.0 / ((rank + 1) ** s) for rank in range(n)]
+
+def _report_time(rng: random.Random, start: datetime) -> datetime:
+    day = rng.randrange(EVENT_DAYS)
+    hour = rng.gauss(20, 4) % 24      # evening peak
+    return start + timedelta(days=day, hours=hour)
+
+def create_dataset(
+    *, prefix: str, users: int, events: int, reports: int, prompts_per_event: int,
+    shop_items: int, seed: int,
+) -> dict:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    now_s = now.isoformat()
+    start = (now - timedelta(days=EVENT_DAYS)).replace(hour=0, minute=0, second=0, microsecond=0)
+    t0 = time.perf_counter()
+
+    with db_session() as s:
+        user_ids = s.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {"user_discord_id": discord_id(prefix, i), "username": f"{prefix}_u{i}", "display_name": f"Member {i}",
+                 "nickname": None if i % 3 else f"Nick {i}", "points": 0, "total_earned": 0, "total_spent": 0,
+                 "created_at": now_s}
+                for i in range(users)
+            ],
+        ).scalars().all()
+
+        action_ids = s.execute(
+            insert(Action).returning(Action.id, sort_by_parameter_order=True),
+            [
+                {"action_key": f"{prefix}_{key}", "is_active": True, "action_description": key.replace("_", " ").title(),
+                 "input_fields_json": json.dumps(fields), "created_at": now_s}
+                for key, fields, _ in ACTION_KINDS
+            ],
+        ).scalars().all()
+
+        reward_ids = s.execute(
+            insert(Reward).returning(Reward.id, sort_by_parameter_order=True),
+            [
+                {"reward_key": f"{prefix}_rw{i}", "reward_type": "badge" if i % 2 else "title",
+                 "reward_name": f"Bench reward {i}", "reward_description": "Synthetic reward",
+                 "emoji": "⭐" if i % 2 else None, "is_released_on_active": False, "is_stackable": False,
+                 "number_granted": 0, "created_by": "bench", "created_at": now_s}
+                for i in range(shop_items)
+            ],
+        ).scalars().all()
+
+        plan = []       # per event: (event_id, [(ae_id, points, fields, is_prompt)], [prompt ids])
+        for e in range(events):
+            event_id = s.execute(insert(Event).returning(Event.id), {
+                "event_key": f"{prefix}_ev{e}", "event_name": f"Bench event {e}", "event_type": "prompt",
+                "event_description": "Synthetic event", "start_date": start.date(), "priority": e,
+                "event_status": EventStatus.active, "created_by": "bench", "created_at": now_s,
+            }).scalar_one()
+
+            aes = []
+            for (key, fields, is_prompt), action_id in zip(ACTION_KINDS, action_ids):
+                points = rng.choice((5, 10, 10, 20, 50))
+                ae_id = s.execute(insert(ActionEvent).returning(ActionEvent.id), {
+                    "action_event_key": f"{prefix}_ev{e}_{key}", "action_id": action_id, "event_id": event_id,
+                    "variant": "default", "points_granted": points, "is_self_reportable": True,
+                    "is_repeatable": True, "prompts_required": is_prompt, "created_by": "bench", "created_at": now_s,
+                }).scalar_one()
+                aes.append((ae_id, points, fields, is_prompt))
+
+            prompt_ids = s.execute(
+                insert(EventPrompt).returning(EventPrompt.id, sort_by_parameter_order=True),
+                [
+                    {"event_id": event_id, "group": "nsfw" if p % 4 == 3 else "sfw", "day_index": p % 31 + 1,
+                     "code": f"p{p:03d}", "label": f"Prompt {p}", "is_active": True,
+                     "created_by": "bench", "created_at": now_s}
+                    for p in range(prompts_per_event)
+                ],
+            ).scalars().all()
+
+            re_ids = s.execute(
+                insert(RewardEvent).returning(RewardEvent.id, sort_by_parameter_order=True),
+                [
+                    {"reward_event_key": f"{prefix}_ev{e}_rw{i}", "event_id": event_id, "reward_id": rid,
+                     "availability": "inshop", "price": 50 * (i % 5 + 1), "created_by": "bench", "created_at": now_s}
+                    for i, rid in enumerate(reward_ids)
+                ],
+            ).scalars().all()
+
+            s.execute(insert(EventTrigger), [
+                {"event_id": event_id, "trigger_type": ttype, "config_json": json.dumps(cfg),
+                 "points_granted": None if i % 3 == 0 else 25,
+                 "reward_event_id": re_ids[i % len(re_ids)] if i % 3 == 0 and re_ids else None,
+                 "created_at": now_s}
+                for i, (ttype, cfg) in enumerate(TRIGGERS)
+            ])
+            plan.append((event_id, aes, prompt_ids))
+
+    # --- reports, in committed batches so memory stays flat ---
+    discord_by_user = {uid: discord_id(prefix, i) for i, uid in enumerate(user_ids)}
+    activity = [rng.paretovariate(1.2) for _ in user_ids]
+    event_weights = [1.0 / (e + 1) for e in range(events)]          # older/smaller events get less traffic
+    kind_weights = [5, 2, 2, 3, 1][: len(ACTION_KINDS)]
+    prompt_weights = {ev: _zipf_weights(len(pids)) for ev, _, pids in plan}
+    earned: dict = defaultdict(int)     # (user_id, event_id) -> points
+    written = links = 0
+
+    remaining = reports
+    while remaining > 0:
+        n = min(BATCH, remaining)
+        remaining -= n
+        rows, prompt_picks = [], []
+        for uid, ev_idx in zip(rng.choices(user_ids, activity, k=n), rng.choices(range(events), event_weights, k=n)):
+            event_id, aes, prompt_ids = plan[ev_idx]
+            ae_id, points, fields, is_prompt = rng.choices(aes, kind_weights)[0]
+            row = {
+                "user_id": uid, "action_event_id": ae_id, "event_id": event_id,
+                "created_by": discord_by_user[uid],
+                "created_at": _report_time(rng, start),
+                "url_value": None, "numeric_value": None, "text_value": None,
+            }
+            if "url_value" in fields:
+                row["url_value"] = f"https://archiveofourown.org/works/{rng.randrange(10**7, 6 * 10**7)}"
+            if "numeric_value" in fields:
+                row["numeric_value"] = int(rng.lognormvariate(7, 1))
+            if "text_value" in fields:
+                row["text_value"] = rng.choice(("Loved it!", "Great prompt", "Posted chapter 2", "Kudos"))
+            rows.append(row)
+            earned[(uid, event_id)] += points
+            picks = ()
+            if is_prompt and prompt_ids:
+                k = rng.choices((1, 2, 3), (6, 3, 1))[0]
+                picks = set(rng.choices(prompt_ids, prompt_weights[event_id], k=k))
+            prompt_picks.append(picks)
+
+        with db_session() as s:
+            ua_ids = s.execute(insert(UserAction).returning(UserAction.id, sort_by_parameter_order=True), rows).scalars().all()
+            uap = [{"user_action_id": ua, "event_prompt_id": p} for ua, picks in zip(ua_ids, prompt_picks) for p in picks]
+            for chunk in _chunks(uap):
+                s.execute(insert(UserActionPrompt), chunk)
+        written += n
+        links += len(uap)
+        if written % (BATCH * 20) == 0 or remaining == 0:
+            print(f"… {written}/{reports} reports ({time.perf_counter() - t0:.0f}s)")
+
+    # --- balances, ledger, inventories ---
+    joined = start - timedelta(days=1)
+    with db_session() as s:
+        ued = [
+            {"user_id": uid, "event_id": ev, "points_earned": pts, "joined_at": joined, "created_by": "bench"}
+            for (uid, ev), pts in earned.items()
+        ]
+        for chunk in _chunks(ued):
+            s.execute(insert(UserEventData), chunk)
+        ledger = [
+            {"user_id": uid, "event_id": ev, "delta": pts, "source": "opening", "created_by": "bench", "created_at": now}
+            for (uid, ev), pts in earned.items()
+        ]
+        for chunk in _chunks(ledger):
+            s.execute(insert(PointsLedger), chunk)
+
+        totals: dict = defaultdict(int)
+        for (uid, _), pts in earned.items():
+            totals[uid] += pts
+        for chunk in _chunks(list(totals.items())):
+            s.execute(update(User), [{"id": uid, "points": pts, "total_earned": pts} for uid, pts in chunk])
+
+        title_ids = set(reward_ids[::2])
+        inventory = []
+        for uid in user_ids:
+            owned = rng.sample(reward_ids, min(len(reward_ids), int(rng.expovariate(1 / 4))))
+            titles = [r for r in owned if r in title_ids]
+            badges = [r for r in owned if r not in title_ids]
+            equipped = set(titles[:1] + badges[:3])
+            inventory += [{"user_id": uid, "reward_id": r, "quantity": 1, "is_equipped": r in equipped} for r in owned]
+        for chunk in _chunks(inventory):
+            s.execute(insert(Inventory), chunk)
+        granted = defaultdict(int)
+        for row in inventory:
+            granted[row["reward_id"]] += 1
+        if granted:
+            s.execute(update(Reward), [{"id": rid, "number_granted": n} for rid, n in granted.items()])
+
+    # --- trigger progress counters (what db/rebuild_progress.py does), so reports
+    # hit the incremental path instead of rebuilding from history ---
+    progress = 0
+    for event_id, _, _ in plan:
+        with db_session() as s:
+            progress += rebuild_all_user_event_progress(s, event_id)
+    print(f"… {progress} user/event progress rows ({time.perf_counter() - t0:.0f}s)")
+
+    summary = {
+        "users": users, "events": events, "user_actions": reports, "user_action_prompts": links,
+        "user_event_data": len(earned), "user_event_progress": progress, "inventory": len(inventory), "seconds": round(time.perf_counter() - t0, 1),
+    }
+    print(f"✅ Dataset '{prefix}' created: {summary}")
+    return summary
+
+def drop_dataset(prefix: str) -> None:
+    like = f"{prefix}\\_%"
+    with db_session() as s:
+        event_ids = s.scalars(select(Event.id).where(Event.event_key.like(like))).all()
+        user_ids = select(User.id).where(*synthetic_users(prefix)).scalar_subquery()
+        if event_ids:
+            # user_actions / user_event_data RESTRICT event deletes; prompts links cascade
+            s.execute(delete(UserAction).where(UserAction.event_id.in_(event_ids)))
+            s.execute(delete(UserEventData).where(UserEventData.event_id.in_(event_ids)))
+        s.execute(delete(User).where(User.id.in_(user_ids)))
+        if event_ids:
+            s.execute(delete(Event).where(Event.id.in_(event_ids)))
+        s.execute(delete(Reward).where(Reward.reward_key.like(like)))
+        s.execute(delete(Action).where(Action.action_key.like(like)))
+    print(f"🧹 Dataset '{prefix}' dropped.")
+
+def dataset_counts(session, prefix: str) -> dict:
+    like = f"{prefix}\\_%"
+    event_ids = select(Event.id).where(Event.event_key.like(like)).scalar_subquery()
+    return {
+        "users": session.scalar(select(func.count()).select_from(User).where(*synthetic_users(prefix))),
+        "events": session.scalar(select(func.count()).select_from(Event).where(Event.event_key.like(like))),
+        "user_actions": session.scalar(select(func.count()).select_from(UserAction).where(UserAction.event_id.in_(event_ids))),
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("command", choices=("create", "drop"))
+    ap.add_argument("--prefix", default="bench")
+    ap.add_argument("--users", type=int, default=2000)
+    ap.add_argument("--events", type=int, default=4)
+    ap.add_argument("--reports", type=int, default=200_000, help="user_actions rows to generate")
+    ap.add_argument("--prompts", type=int, default=62, help="prompts per event")
+    ap.add_argument("--shop-items", type=int, default=24, help="rewards sold in every event shop")
+    ap.add_argument("--seed", type=int, default=2508)
+    args = ap.parse_args()
+
+    if mode == "prod":
+        print("❌ Refusing to create or drop a benchmark dataset with DB_MODE=prod.")
+        return 1
+    if args.users > PREFIX_ID_SLOT:
+        print(f"❌ At most {PREFIX_ID_SLOT} users per dataset.")
+        return 1
+    if args.command == "drop":
+        drop_dataset(args.prefix)
+        return 0
+    with db_session() as s:
+        if dataset_counts(s, args.prefix)["events"]:
+            print(f"❌ Dataset '{args.prefix}' already exists; drop it first.")
+            return 1
+    create_dataset(
+        prefix=args.prefix, users=args.users, events=args.events, reports=args.reports,
+        prompts_per_event=args.prompts, shop_items=args.shop_items, seed=args.seed,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
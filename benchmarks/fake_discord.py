@@ -0,0 +1,300 @@
+# benchmarks/fake_discord.py
+"""
+Offline stand-ins for the parts of discord.py / aiohttp the cogs touch, for
+the load-test harness. Nothing here talks to the network:
+
+- FakeInteraction / FakeResponse / FakeFollowup record what the bot sends
+  (content, embeds, views, modals, files) and sleep `api_latency` seconds per
+  call, like a round trip to the Discord API would.
+- FakeMember carries the identity fields users_crud reads plus a CDN avatar URL.
+- FakeHTTPSession replaces the shared aiohttp client: every GET returns a
+  small PNG after `cdn_latency` seconds (avatars, emoji badges).
+
+set_select_values / fill_text_input / dispatch mirror what discord.py does
+when it dispatches a component interaction to a view.
+"""
+import asyncio
+import io
+import itertools
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+import discord
+from PIL import Image
+
+from bot.utils.metrics import current_timing
+
+_ids = itertools.count(1_300_000_000_000_000_000)
+FAILURE_PREFIXES = ("❌", "⚠️", "⛔")
+
+def _png(size: int, color: tuple) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", (size, size), color).save(buf, format="PNG")
+    return buf.getvalue()
+
+# ---------------------------------------------------------------------------
+# Members
+# ---------------------------------------------------------------------------
+
+class FakeAsset:
+    def __init__(self, url: str):
+        self.url = url
+
+    def replace(self, **_):
+        return self
+
+@dataclass
+class FakeMember:
+    id: int
+    name: str
+    display_name: str
+    nick: Optional[str] = None
+    global_name: Optional[str] = None
+    bot: bool = False
+    roles: list = field(default_factory=list)
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    @property
+    def display_avatar(self) -> FakeAsset:
+        return FakeAsset(f"https://cdn.discordapp.com/avatars/{self.id}/{self.id % 997:x}.png?size=128")
+
+    @property
+    def guild_permissions(self):
+        return discord.Permissions.all()
+
+# ---------------------------------------------------------------------------
+# Discord API
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Sent:
+    """One payload the bot sent (initial response, edit, followup, channel message)."""
+    kind: str
+    content: Optional[str] = None
+    view: Any = None
+    modal: Any = None
+    kwargs: dict = field(default_factory=dict)
+
+class FakeMessage:
+    def __init__(self, api: "FakeAPI", sent: Sent):
+        self.id = next(_ids)
+        self._api = api
+        self.sent = sent
+
+    async def edit(self, **kwargs):
+        await self._api.call(Sent("message_edit", kwargs.get("content"), kwargs.get("view"), kwargs=kwargs))
+        return self
+
+    async def delete(self, **_):
+        await self._api.roundtrip()
+
+class FakeAPI:
+    """Shared by one interaction chain: latency model + log of everything sent."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, rng: Optional[random.Random] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.log: List[Sent] = []
+
+    async def roundtrip(self):
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+    async def call(self, sent: Sent) -> FakeMessage:
+        await self.roundtrip()
+        self.log.append(sent)
+        return FakeMessage(self, sent)
+
+    def last_view(self):
+        return next((s.view for s in reversed(self.log) if s.view is not None), None)
+
+    def last_modal(self):
+        return next((s.modal for s in reversed(self.log) if s.modal is not None), None)
+
+    def failures(self) -> List[str]:
+        """Error replies the bot sent (❌ / ⚠️ / ⛔ prefixed)."""
+        return [s.content for s in self.log if s.content and s.content.lstrip().startswith(FAILURE_PREFIXES)]
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._parent = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, kind: str, sent: Sent) -> None:
+        if self._done:
+            raise discord.InteractionResponded(self._parent)  # type: ignore[arg-type]
+        self._done = True
+        await self._parent.api.call(sent)
+        self._parent.acked_at = time.perf_counter()
+        timing = current_timing.get()
+        if timing is not None:
+            timing.mark_response(kind)
+
+    async def defer(self, **kwargs):
+        await self._respond("defer", Sent("defer", kwargs=kwargs))
+
+    async def send_message(self, content=None, **kwargs):
+        await self._respond("send_message", Sent("send_message", content, kwargs.get("view"), kwargs=kwargs))
+
+    async def edit_message(self, **kwargs):
+        await self._respond("edit_message", Sent("edit_message", kwargs.get("content"), kwargs.get("view"), kwargs=kwargs))
+
+    async def send_modal(self, modal):
+        await self._respond("send_modal", Sent("send_modal", modal=modal))
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._parent = interaction
+
+    async def send(self, content=None, **kwargs):
+        return await self._parent.api.call(Sent("followup", content, kwargs.get("view"), kwargs=kwargs))
+
+class FakeChannel:
+    def __init__(self, api: FakeAPI):
+        self.id = next(_ids)
+        self._api = api
+
+    async def send(self, content=None, **kwargs):
+        return await self._api.call(Sent("channel_send", content, kwargs.get("view"), kwargs=kwargs))
+
+    @asynccontextmanager
+    async def _typing(self):
+        await self._api.roundtrip()
+        yield
+
+    def typing(self):
+        return self._typing()
+
+class FakeGuild:
+    def __init__(self, member: FakeMember):
+        self.id = 1
+        self._member = member
+
+    async def fetch_member(self, _id: int):
+        return self._member
+
+    def get_member(self, _id: int):
+        return self._member
+
+class FakeInteraction:
+    """
+    Minimal Interaction: what cogs and views read (user, guild, channel,
+    response, followup, data...). Chains of interactions (command -> select ->
+    button) share one FakeAPI so the latest view can be followed.
+    """
+
+    def __init__(self, user: FakeMember, api: FakeAPI, *, command: Optional[str] = None, custom_id: Optional[str] = None):
+        self.id = next(_ids)
+        self.user = user
+        self.api = api
+        self.guild = FakeGuild(user)
+        self.guild_id = self.guild.id
+        self.channel = FakeChannel(api)
+        self.channel_id = self.channel.id
+        self.created_at = datetime.now(timezone.utc)
+        self.created = time.perf_counter()
+        self.acked_at: Optional[float] = None
+        if command is not None:
+            self.type = discord.InteractionType.application_command
+            self.data = {"name": command, "type": 1}
+        else:
+            self.type = discord.InteractionType.component
+            self.data = {"custom_id": custom_id or ""}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.message = None
+
+    @property
+    def ack_seconds(self) -> Optional[float]:
+        return None if self.acked_at is None else self.acked_at - self.created
+
+    async def edit_original_response(self, **kwargs):
+        return await self.api.call(Sent("edit_original", kwargs.get("content"), kwargs.get("view"), kwargs=kwargs))
+
+    async def original_response(self):
+        await self.api.roundtrip()
+        return FakeMessage(self.api, Sent("original"))
+
+# ---------------------------------------------------------------------------
+# Driving views like discord.py's dispatcher does
+# ---------------------------------------------------------------------------
+
+def set_select_values(select: discord.ui.Select, values: List[str], interaction: FakeInteraction) -> None:
+    """What the dispatcher does with the payload of a select interaction."""
+    select._refresh_state(interaction, {"custom_id": select.custom_id, "component_type": select.type.value, "values": values})  # type: ignore[arg-type]
+
+def fill_text_input(text_input: discord.ui.TextInput, value: str) -> None:
+    text_input._refresh_state({"custom_id": text_input.custom_id, "type": 4, "value": value})  # type: ignore[arg-type]
+
+async def dispatch(view: discord.ui.View, item: discord.ui.Item, interaction: FakeInteraction) -> bool:
+    """interaction_check then the item callback; False when the check refused it."""
+    if not await view.interaction_check(interaction):  # type: ignore[arg-type]
+        return False
+    await item.callback(interaction)  # type: ignore[arg-type]
+    return True
+
+def find_item(view: discord.ui.View, cls=None, *, label: Optional[str] = None):
+    for item in view.children:
+        if cls is not None and not isinstance(item, cls):
+            continue
+        if label is not None and getattr(item, "label", None) != label:
+            continue
+        return item
+    return None
+
+# ---------------------------------------------------------------------------
+# CDN (shared aiohttp client replacement)
+# ---------------------------------------------------------------------------
+
+class _FakeHTTPResponse:
+    def __init__(self, body: bytes):
+        self.status = 200
+        self.headers = {"content-type": "image/png"}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def raise_for_status(self) -> None:
+        pass
+
+class FakeHTTPSession:
+    """Drop-in for the aiohttp.ClientSession in bot.utils.http_client: PNG for every GET."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.closed = False
+        self.requests = 0
+        self._avatar = _png(128, (90, 60, 140, 255))
+        self._emoji = _png(72, (230, 180, 40, 255))
+
+    @asynccontextmanager
+    async def _get(self, url: str):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        yield _FakeHTTPResponse(self._avatar if "/avatars/" in url else self._emoji)
+
+    def get(self, url: str, **_):
+        return self._get(url)
+
+    async def close(self) -> None:
+        self.closed = True
+
+def install_fake_http(latency: float = 0.0) -> FakeHTTPSession:
+    """Point bot.utils.http_client at a FakeHTTPSession (call before any cog runs)."""
+    from bot.utils import http_client
+    session = FakeHTTPSession(latency)
+    http_client._session = session     # get_http_client() returns it while .closed is False
+    return session
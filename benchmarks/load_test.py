@@ -0,0 +1,397 @@
+# benchmarks/load_test.py
+"""
+Concurrent load test: N virtual users drive the real cogs and views with fake
+interactions (benchmarks/fake_discord.py), against a dataset from
+benchmarks/dataset.py. Fully offline: Discord API calls and CDN downloads are
+simulated (with configurable latency); the database is the real local one.
+
+Scenarios (each a full user flow, every step a separate interaction):
+
+    report_action        /report_action -> pick event -> pick action -> modal submit (writes a report)
+    shop                 /shop
+    shop_purchase        /shop -> pick a reward (real purchase, rejections count as failed)
+    profile              /profile (profile card render + CDN fetches)
+    reports_leaderboard  /admin_reports -> event -> Leaderboards -> points|prompts
+    reports_actions      /admin_reports -> event -> Action List -> pick action events -> Run
+
+    DB_MODE=test python benchmarks/dataset.py create
+    DB_MODE=test python benchmarks/load_test.py --users 50 --duration 60
+    DB_MODE=test python benchmarks/load_test.py --users 200 --ramp 0 --iterations 3 --mix report_action=1   # launch spike
+
+Reports per scenario: latency p50/p95/p99/max of the whole flow, the slowest
+acknowledgement of any of its interactions (late = over Discord's 3 s), errors
+(exceptions), failed (❌/⚠️ replies) and SQL per flow; plus event-loop lag and
+pool stats. Writes go to the benchmark dataset: drop it afterwards.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+import traceback
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import discord
+from sqlalchemy import select
+
+from benchmarks.bench_hot_paths import _git_commit
+from benchmarks.dataset import dataset_counts, synthetic_users
+from benchmarks.fake_discord import (
+    FakeAPI,
+    FakeInteraction,
+    FakeMember,
+    dispatch,
+    fill_text_input,
+    find_item,
+    install_fake_http,
+    set_select_values,
+)
+from db.database import ENGINE_SETTINGS, SessionLocal, get_pool_stats, mode
+from db.instrumentation import command_stats, percentile, trace_command
+from db.schema import Event, User
+from bot.cogs.admin.reporting_cog import ReportingCog
+from bot.cogs.user.event_cog import EventCog
+from bot.cogs.user.profile_cog import ProfileCog
+from bot.commands.user.shop import ShopCommands
+from bot.ui.admin.reporting_views import ActionListView, ActionRunButton, AdminReportsHomeView, LeaderboardsView, ReportTypeSelect
+from bot.ui.user.shop_dashboard_view import ShopSelect
+from bot.utils.metrics import INTERACTION_DEADLINE, track_interaction
+
+LAG_PROBE_INTERVAL = 0.05
+
+# ---------------------------------------------------------------------------
+# One user flow
+# ---------------------------------------------------------------------------
+
+class Flow:
+    """A chain of interactions by one member; every step shares one FakeAPI."""
+
+    def __init__(self, ctx, member: FakeMember, rng: random.Random):
+        self.ctx = ctx
+        self.member = member
+        self.rng = rng
+        self.api = FakeAPI(ctx.api_latency, ctx.api_jitter, rng)
+        self.interactions: list[FakeInteraction] = []
+
+    def _new(self, **kwargs) -> FakeInteraction:
+        inter = FakeInteraction(self.member, self.api, **kwargs)
+        self.interactions.append(inter)
+        return inter
+
+    async def command(self, cog, cmd, *args):
+        """Like InstrumentedCommandTree: the app command callback inside track_interaction."""
+        inter = self._new(command=cmd.name)
+        with track_interaction(inter, "command", cmd.qualified_name):
+            await cmd.callback(cog, inter, *args)
+
+    async def select(self, view, item, values: list[str]):
+        inter = self._new(custom_id=item.custom_id)
+        set_select_values(item, values, inter)
+        await dispatch(view, item, inter)
+
+    async def click(self, view, item):
+        await dispatch(view, item, self._new(custom_id=item.custom_id))
+
+    async def submit(self, modal, values: dict):
+        inter = self._new(custom_id=modal.custom_id)
+        for key, text_input in modal.inputs.items():
+            fill_text_input(text_input, values[key])
+        if await modal.interaction_check(inter):
+            await modal.on_submit(inter)
+
+    def last_sent_kind(self) -> str | None:
+        return self.api.log[-1].kind if self.api.log else None
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def _modal_values(rng: random.Random) -> dict:
+    return {
+        "url_value": f"https://archiveofourown.org/works/{rng.randint(1, 10**8)}",
+        "numeric_value": str(rng.randint(100, 5000)),
+        "text_value": "load test",
+        "boolean_value": rng.choice(["yes", "no"]),
+        "date_value": date.today().isoformat(),
+    }
+
+async def scenario_report_action(flow: Flow):
+    cog = flow.ctx.cogs.events
+    await flow.command(cog, cog.report_action)
+    view = flow.api.last_view()
+    if view is None:
+        return
+    picker = find_item(view, discord.ui.Select)
+    keys = [o.value for o in picker.options]
+    await flow.select(view, picker, [flow.rng.choice([k for k in keys if k in flow.ctx.event_keys] or keys)])
+
+    action_view = flow.api.last_view()
+    if action_view is view:         # no actions for that event: a ⚠️ reply, counted as failed
+        return
+    picker = find_item(action_view, discord.ui.Select)
+    await flow.select(action_view, picker, [flow.rng.choice(picker.options).value])
+    if flow.last_sent_kind() == "send_modal":
+        await flow.submit(flow.api.last_modal(), _modal_values(flow.rng))
+
+async def scenario_shop(flow: Flow):
+    cog = flow.ctx.cogs.shop
+    await flow.command(cog, cog.shop)
+
+async def scenario_shop_purchase(flow: Flow):
+    await scenario_shop(flow)
+    view = flow.api.last_view()
+    picker = find_item(view, ShopSelect) if view is not None else None
+    if picker is not None:
+        await flow.select(view, picker, [flow.rng.choice(picker.options).value])
+
+async def scenario_profile(flow: Flow):
+    cog = flow.ctx.cogs.profile
+    await flow.command(cog, cog.profile, None)
+
+async def _open_report(flow: Flow, report_type: str):
+    cog = flow.ctx.cogs.reporting
+    await flow.command(cog, cog.admin_reports)
+    home = flow.api.last_view()
+    if not isinstance(home, AdminReportsHomeView):
+        return None
+    ids = [o.value for o in home.event_select.options]
+    await flow.select(home, home.event_select, [flow.rng.choice([i for i in ids if i in flow.ctx.event_ids] or ids)])
+    await flow.select(home, find_item(home, ReportTypeSelect), [report_type])
+    return flow.api.last_view()
+
+async def scenario_reports_leaderboard(flow: Flow):
+    view = await _open_report(flow, "leaderboards")
+    if isinstance(view, LeaderboardsView):
+        await flow.select(view, view.kind_select, [flow.rng.choice(["points", "prompts"])])
+
+async def scenario_reports_actions(flow: Flow):
+    view = await _open_report(flow, "actions")
+    if not isinstance(view, ActionListView):
+        return
+    ids = [o.value for o in view.action_select.options]
+    await flow.select(view, view.action_select, flow.rng.sample(ids, k=flow.rng.randint(1, len(ids))))
+    await flow.click(view, find_item(view, ActionRunButton))
+
+SCENARIOS = {
+    "report_action": scenario_report_action,
+    "shop": scenario_shop,
+    "shop_purchase": scenario_shop_purchase,
+    "profile": scenario_profile,
+    "reports_leaderboard": scenario_reports_leaderboard,
+    "reports_actions": scenario_reports_actions,
+}
+DEFAULT_MIX = "report_action=4,shop=2,shop_purchase=1,profile=3,reports_leaderboard=1,reports_actions=1"
+
+def parse_mix(spec: str) -> dict:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"❌ Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def load_context(prefix: str) -> SimpleNamespace:
+    like = f"{prefix}\\_%"
+    with SessionLocal() as s:
+        events = s.execute(select(Event.id, Event.event_key).where(Event.event_key.like(like))).all()
+        users = s.execute(
+            select(User.user_discord_id, User.username, User.display_name, User.nickname).where(*synthetic_users(prefix))
+        ).all()
+        counts = dataset_counts(s, prefix)
+    if not events or not users:
+        raise SystemExit(f"❌ No dataset '{prefix}' found: run benchmarks/dataset.py create first.")
+    members = [
+        FakeMember(id=int(u.user_discord_id), name=u.username, display_name=u.display_name or u.username, nick=u.nickname)
+        for u in users
+    ]
+    return SimpleNamespace(
+        event_ids={str(e.id) for e in events},
+        event_keys={e.event_key for e in events},
+        members=members,
+        counts=counts,
+        cogs=SimpleNamespace(events=EventCog(None), shop=ShopCommands(None), profile=ProfileCog(None), reporting=ReportingCog(None)),
+    )
+
+class Results:
+    def __init__(self):
+        self.latency = defaultdict(list)        # scenario -> [seconds]
+        self.slowest_ack = defaultdict(list)    # scenario -> [seconds], slowest step of each flow
+        self.late = Counter()
+        self.unanswered = Counter()
+        self.failed = Counter()
+        self.errors = Counter()
+        self.messages = defaultdict(Counter)    # scenario -> failure text / exception -> count
+
+    def record(self, name: str, flow: Flow, elapsed: float, error: BaseException | None) -> None:
+        self.latency[name].append(elapsed)
+        acks = [i.ack_seconds for i in flow.interactions if i.ack_seconds is not None]
+        if acks:
+            self.slowest_ack[name].append(max(acks))
+        self.late[name] += sum(1 for a in acks if a > INTERACTION_DEADLINE)
+        self.unanswered[name] += sum(1 for i in flow.interactions if i.acked_at is None)
+        if error is not None:
+            self.errors[name] += 1
+            self.messages[name][f"{type(error).__name__}: {error}"[:120]] += 1
+        elif flow.api.failures():
+            self.failed[name] += 1
+            for text in flow.api.failures():
+                self.messages[name][text.splitlines()[0][:120]] += 1
+
+async def run_flow(ctx, results: Results | None, name: str, rng: random.Random) -> None:
+    flow = Flow(ctx, rng.choice(ctx.members), rng)
+    error = None
+    t0 = time.perf_counter()
+    with trace_command(f"load:{name}"):
+        try:
+            await SCENARIOS[name](flow)
+        except Exception as e:
+            error = e
+            if results is not None and not results.errors[name]:
+                traceback.print_exc()       # first one of each scenario, the rest are counted
+    if results is not None:
+        results.record(name, flow, time.perf_counter() - t0, error)
+
+async def virtual_user(ctx, results: Results, mix: dict, seed: int, start_delay: float, deadline: float | None, iterations: int | None, think: float):
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    await asyncio.sleep(start_delay)
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.perf_counter() < deadline):
+        await run_flow(ctx, results, rng.choices(names, weights)[0], rng)
+        done += 1
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+
+async def probe_loop_lag(samples: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - t0 - LAG_PROBE_INTERVAL))
+
+def _ms(values: list, q: float) -> float:
+    return round(percentile(values, q) * 1000, 2)
+
+def summarize(results: Results, wall: float) -> dict:
+    sql = {row["command"]: row for row in command_stats.snapshot()}
+    out = {}
+    for name, samples in results.latency.items():
+        db = sql.get(f"load:{name}", {})
+        out[name] = {
+            "n": len(samples),
+            "per_s": round(len(samples) / wall, 2),
+            "p50_ms": _ms(samples, 0.50),
+            "p95_ms": _ms(samples, 0.95),
+            "p99_ms": _ms(samples, 0.99),
+            "max_ms": round(max(samples) * 1000, 2),
+            "ack_p95_ms": _ms(results.slowest_ack[name], 0.95),
+            "late_acks": results.late[name],
+            "unanswered": results.unanswered[name],
+            "failed": results.failed[name],
+            "errors": results.errors[name],
+            "queries_avg": db.get("queries_avg"),
+            "db_p95_ms": db.get("db_p95_ms"),
+            "top_failures": results.messages[name].most_common(3),
+        }
+    return out
+
+def print_report(summary: dict, lag: list, wall: float) -> None:
+    print(f"\n{'scenario':<22} {'n':>6} {'/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'ack95':>8} {'late':>5} {'fail':>5} {'err':>5} {'sql':>6}")
+    for name, r in sorted(summary.items()):
+        print(
+            f"{name:<22} {r['n']:>6} {r['per_s']:>7.2f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['max_ms']:>8.1f} {r['ack_p95_ms']:>8.1f} {r['late_acks']:>5} {r['failed']:>5} {r['errors']:>5} "
+            f"{r['queries_avg'] if r['queries_avg'] is not None else '-':>6}"
+        )
+    for name, r in sorted(summary.items()):
+        for text, count in r["top_failures"]:
+            print(f"   ⚠️ {name}: {count}× {text}")
+    print(f"\n⏱️ {wall:.1f} s — event loop lag p50={_ms(lag, 0.50)} ms p95={_ms(lag, 0.95)} ms max={round(max(lag, default=0) * 1000, 2)} ms")
+    print(f"🔌 Pool: {get_pool_stats()}")
+
+async def run(args) -> dict:
+    ctx = load_context(args.prefix)
+    ctx.api_latency, ctx.api_jitter = args.api_ms / 1000, args.api_jitter_ms / 1000
+    cdn = install_fake_http(args.cdn_ms / 1000)
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+
+    for name in mix:                        # warm caches and pool, not recorded
+        for _ in range(args.warmup):
+            await run_flow(ctx, None, name, rng)
+    command_stats.reset()
+
+    results, lag = Results(), []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(probe_loop_lag(lag, stop))
+    t0 = time.perf_counter()
+    deadline = None if args.iterations else t0 + args.ramp + args.duration
+    await asyncio.gather(*(
+        virtual_user(ctx, results, mix, args.seed * 100_003 + i, args.ramp * i / args.users,
+                     deadline, args.iterations, args.think_ms / 1000)
+        for i in range(args.users)
+    ))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await prober
+
+    summary = summarize(results, wall)
+    print_report(summary, lag, wall)
+    return {
+        "meta": {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "db_mode": mode,
+            "engine": ENGINE_SETTINGS,
+            "python": platform.python_version(),
+            "dataset": {"prefix": args.prefix, **ctx.counts},
+            "args": vars(args),
+            "wall_s": round(wall, 2),
+            "cdn_requests": cdn.requests,
+            "pool": get_pool_stats(),
+        },
+        "loop_lag": {"p50_ms": _ms(lag, 0.50), "p95_ms": _ms(lag, 0.95), "max_ms": round(max(lag, default=0) * 1000, 2)},
+        "results": summary,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--prefix", default="bench", help="dataset prefix (benchmarks/dataset.py)")
+    ap.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    ap.add_argument("--duration", type=float, default=30, help="seconds of load after the ramp")
+    ap.add_argument("--iterations", type=int, help="flows per user instead of --duration")
+    ap.add_argument("--ramp", type=float, default=5, help="seconds to start all users (0 = spike)")
+    ap.add_argument("--think-ms", type=float, default=500, help="mean pause between a user's flows")
+    ap.add_argument("--api-ms", type=float, default=80, help="simulated Discord API round trip")
+    ap.add_argument("--api-jitter-ms", type=float, default=40)
+    ap.add_argument("--cdn-ms", type=float, default=30, help="simulated avatar/emoji download")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help="scenario=weight,... (default: %(default)s)")
+    ap.add_argument("--warmup", type=int, default=1, help="unrecorded flows per scenario before the run")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="write results JSON here")
+    args = ap.parse_args()
+    if args.users < 1:
+        ap.error("--users must be at least 1")
+
+    report = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"📝 Results written to {args.out}")
+    errors = sum(r["errors"] for r in report["results"].values())
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
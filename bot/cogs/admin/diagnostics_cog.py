@@ -0,0 +1,140 @@
+# bot/cogs/admin/diagnostics_cog.py
+from __future__ import annotations
+
+import asyncio
+import io
+from datetime import datetime, timezone
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from db.instrumentation import SLOW_QUERY_MS, command_stats, recent_slow_queries
+from bot.utils.profiler import (
+    PROFILE_MAX_SECONDS,
+    PSTATS_TOP,
+    recent_slow_callbacks,
+    run_cprofile,
+    run_sampler,
+    set_slow_callback_detection,
+    slow_callback_status,
+)
+from bot.utils.permissions import admin_only_check, admin_or_mod_check
+
+DIAG_TOP_COMMANDS = 15
+DIAG_SLOW_QUERIES = 5
+DIAG_SLOW_CALLBACKS = 8
+
+def _clip(s: str, n: int) -> str:
+    return s if len(s) <= n else s[: n - 1] + "…"
+
+def format_command_stats(rows: list[dict], limit: int = DIAG_TOP_COMMANDS) -> str:
+    if not rows:
+        return "_No slash commands traced yet._"
+    lines = [f"{'command':<24} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'q/call':>7} {'q max':>6}"]
+    for r in rows[:limit]:
+        lines.append(
+            f"{_clip(r['command'], 24):<24} {r['calls']:>6} {r['db_p50_ms']:>8.1f} "
+            f"{r['db_p95_ms']:>8.1f} {r['queries_avg']:>7.1f} {r['queries_max']:>6}"
+        )
+    return "```\n" + "\n".join(lines) + "\n```"
+
+def format_slow_queries(entries: list[dict]) -> str:
+    if not entries:
+        return f"_No statements over {SLOW_QUERY_MS:.0f} ms._"
+    lines = []
+    for e in entries:
+        at = datetime.fromtimestamp(e["at"], tz=timezone.utc).strftime("%H:%M:%S")
+        lines.append(f"`{at}` **{e['ms']:.0f} ms** /{e['command'] or 'background'}\n`{_clip(e['sql'], 220)}`")
+    return "\n".join(lines)
+
+def format_slow_callbacks(entries: list[dict], status: dict) -> str:
+    state = f"{'on' if status['enabled'] else 'off'}, threshold {status['threshold_ms']:.0f} ms"
+    if not entries:
+        return f"_No slow loop callbacks recorded ({state})._"
+    lines = [f"_Detection {state}._"]
+    for e in entries:
+        at = datetime.fromtimestamp(e["at"], tz=timezone.utc).strftime("%H:%M:%S")
+        lines.append(f"`{at}` **{e['ms']:.0f} ms**\n`{_clip(e['callback'], 220)}`")
+    return "\n".join(lines)
+
+def format_sampler_summary(result: dict, seconds: int) -> str:
+    lines = [f"🔬 **Stack samples** — {seconds} s, {result['rounds']} rounds. Event loop busy {result['loop_busy_pct']:.1f}% of samples."]
+    for frame, pct in result["loop_top"]:
+        lines.append(f"`{pct:>5.1f}%` {_clip(frame, 90)}")
+    lines.append("_Attachment: collapsed stacks (flamegraph.pl / speedscope)._")
+    return "\n".join(lines)
+
+class DiagnosticsCog(commands.Cog, name="Admin Diagnostics"):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @admin_or_mod_check()
+    @app_commands.command(name="admin_db_stats", description="Admin: per-command DB time and slow queries.")
+    @app_commands.describe(reset="Clear the collected stats after showing them")
+    async def admin_db_stats(self, interaction: discord.Interaction, reset: bool = False):
+        content = (
+            "🩺 **DB time per slash command** (recent window, busiest first)\n"
+            + format_command_stats(command_stats.snapshot())
+            + "\n**Slow queries**\n"
+            + format_slow_queries(recent_slow_queries(DIAG_SLOW_QUERIES))
+        )
+        if reset:
+            command_stats.reset()
+            content += "\n_Stats reset._"
+        await interaction.response.send_message(content[:2000], ephemeral=True)
+
+    @admin_only_check()
+    @app_commands.command(name="admin_profile", description="Admin: profile the running bot for N seconds.")
+    @app_commands.describe(
+        seconds=f"How long to profile (1-{PROFILE_MAX_SECONDS})",
+        mode="Stack sampler (cheap, collapsed stacks) or cProfile (slows the bot down, pstats)",
+    )
+    @app_commands.choices(
+        mode=[
+            app_commands.Choice(name="Stack sampler", value="sample"),
+            app_commands.Choice(name="cProfile", value="cprofile"),
+        ]
+    )
+    async def admin_profile(self, interaction: discord.Interaction, seconds: int = 10, mode: app_commands.Choice[str] | None = None):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        selected = mode.value if mode else "sample"
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        try:
+            if selected == "cprofile":
+                result = await run_cprofile(seconds)
+                content = f"🔬 **cProfile** — {seconds} s, {result['calls']:,} calls. Top {PSTATS_TOP} by cumulative time in the .txt; the .pstats loads with `pstats` / snakeviz."
+                files = [
+                    discord.File(io.BytesIO(result["text"]), filename=f"profile-{stamp}.txt"),
+                    discord.File(io.BytesIO(result["pstats"]), filename=f"profile-{stamp}.pstats"),
+                ]
+            else:
+                result = await run_sampler(seconds)
+                content = format_sampler_summary(result, seconds)
+                files = [discord.File(io.BytesIO(result["collapsed"]), filename=f"stacks-{stamp}.collapsed.txt")]
+        except ValueError as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+        await interaction.followup.send(content[:2000], files=files, ephemeral=True)
+
+    @admin_only_check()
+    @app_commands.command(name="admin_slow_callbacks", description="Admin: event-loop callbacks that blocked too long.")
+    @app_commands.describe(
+        enable="Turn asyncio slow-callback detection on or off (debug mode, some overhead)",
+        threshold_ms="Report callbacks running longer than this (default 100 ms)",
+    )
+    async def admin_slow_callbacks(self, interaction: discord.Interaction, enable: bool | None = None, threshold_ms: int = 100):
+        if enable and threshold_ms < 1:
+            await interaction.response.send_message("❌ threshold_ms must be at least 1.", ephemeral=True)
+            return
+        loop = asyncio.get_running_loop()
+        if enable is not None:
+            set_slow_callback_detection(loop, threshold_ms if enable else 0)
+        content = (
+            "🐢 **Slow event-loop callbacks** (newest first)\n"
+            + format_slow_callbacks(recent_slow_callbacks(DIAG_SLOW_CALLBACKS), slow_callback_status(loop))
+        )
+        await interaction.response.send_message(content[:2000], ephemeral=True)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(DiagnosticsCog(bot))
@@ -6,6 +6,8 @@ from discord import app_commands
 from discord.ext import commands
 import traceback
 
+from db.database import run_in_session
+from bot.services.reporting_service import build_event_options
 from bot.ui.admin.reporting_views import AdminReportsHomeView
 from bot.utils.permissions import admin_or_mod_check
 
@@ -19,7 +21,8 @@ class ReportingCog(commands.Cog, name="Admin Reporting"):
     async def admin_reports(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            view = AdminReportsHomeView(author_id=interaction.user.id)
+            ev_opts = await run_in_session(build_event_options)
+            view = AdminReportsHomeView(author_id=interaction.user.id, event_options=ev_opts)
             await interaction.followup.send("📊 **Admin Reporting** — pick an event and a report type.", view=view, ephemeral=True)
         except Exception:
             traceback.print_exc()
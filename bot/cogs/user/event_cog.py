@@ -3,6 +3,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from db.database import run_db
+
 # Services
 from bot.services.events_service import list_user_browseable_events, get_event_message_refs_dto
 
@@ -27,7 +29,7 @@ class EventCog(commands.Cog):
 
         async def render_list(cb_inter: discord.Interaction, *, initial: bool):
             # Build options
-            dtos = list_user_browseable_events(limit=25)
+            dtos = await run_db(list_user_browseable_events, limit=25)
             vms = make_event_options(dtos, fmt=event_default_fmt)
             if not vms:
                 if initial:
@@ -50,7 +52,7 @@ class EventCog(commands.Cog):
                 )
 
         async def on_event_selected(cb_inter: discord.Interaction, event_key: str):            
-            refs = get_event_message_refs_dto(event_key)
+            refs = await run_db(get_event_message_refs_dto, event_key)
             if not refs:
                 await cb_inter.response.send_message("❌ Event not found anymore.", ephemeral=True)
                 return
@@ -109,7 +111,7 @@ class EventCog(commands.Cog):
 
     @app_commands.command(name="report_action", description="Report an action for an event.")
     async def report_action(self, interaction: discord.Interaction):
-        view = make_event_select_view(interaction.user.id)
+        view = await make_event_select_view(interaction.user.id)
         if view is None:
             await interaction.response.send_message("⚠️ No events available right now.", ephemeral=True)
             return
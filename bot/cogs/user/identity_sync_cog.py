@@ -0,0 +1,66 @@
+# bot/cogs/user/identity_sync_cog.py
+import os
+
+import discord
+from discord.ext import commands, tasks
+
+from db.database import run_in_session
+from bot.crud.users_crud import identity_fingerprint, sync_user_identities
+
+IDENTITY_SYNC_INTERVAL = float(os.getenv("IDENTITY_SYNC_INTERVAL", "30"))     # seconds
+
+class IdentitySyncCog(commands.Cog):
+    """
+    Push name/nickname changes to the users table as they happen, in batches,
+    so commands rarely have to re-sync identities themselves.
+    Only members that already have a users row are touched.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._pending: dict[int, discord.Member] = {}     # discord id -> latest member state
+        self.flush_identities.change_interval(seconds=IDENTITY_SYNC_INTERVAL)
+        self.flush_identities.start()
+
+    async def cog_unload(self):
+        self.flush_identities.cancel()
+        await self._flush()
+
+    def _queue(self, before, after: discord.Member) -> None:
+        if identity_fingerprint(before) != identity_fingerprint(after):
+            self._pending[after.id] = after
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        self._queue(before, after)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        # username/global name changes: store them with the guild nickname
+        for guild in after.mutual_guilds:
+            member = guild.get_member(after.id)
+            if member is not None:
+                self._queue(before, member)
+                break
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        members, self._pending = list(self._pending.values()), {}
+        try:
+            changed = await run_in_session(sync_user_identities, members)
+            if changed:
+                print(f"🔄 Synced {changed} user identities")
+        except Exception as e:
+            print(f"❌ Identity sync failed: {e}")
+
+    @tasks.loop(seconds=30)
+    async def flush_identities(self):
+        await self._flush()
+
+    @flush_identities.before_loop
+    async def _before_flush(self):
+        await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(IdentitySyncCog(bot))
@@ -6,7 +6,7 @@ from discord.ext import commands
 
 from bot.config.constants import MAX_BADGES
 from bot.utils.discord_helpers import resolve_display_name
-from db.database import db_session
+from db.database import run_db, run_in_session
 
 # UI
 from bot.ui.user.profile_views import ProfileView
@@ -25,6 +25,13 @@ from bot.services.inventory_service import get_user_publishables_for_preview
 # CRUD
 from bot.crud.inventory_crud import fetch_user_inventory_ordered
 
+def _load_inventory_state(session, target):
+    """Everything the inventory panel needs, in one unit of work (runs on the DB executor)."""
+    user = get_or_create_user_dto(session, target)
+    items = fetch_user_inventory_ordered(session, user.id)
+    publishables = get_user_publishables_for_preview(session, user.id)
+    return items, resolve_display_name(user), publishables
+
 class ProfileCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -32,14 +39,10 @@ class ProfileCog(commands.Cog):
     # ---------------- internal callbacks ----------------
 
     async def _open_inventory(self, inter: Interaction, target: discord.Member | discord.User):
-        with db_session() as s:
-            user = get_or_create_user_dto(s, target)
-            items = fetch_user_inventory_ordered(s, user.id)
-            display_name = resolve_display_name(user)
-            publishables = get_user_publishables_for_preview(s, user.id)
+        items, display_name, publishables = await run_in_session(_load_inventory_state, target)
 
         async def _view_profile(cb_inter: discord.Interaction):
-            vm = fetch_profile_vm(target)
+            vm = await run_db(fetch_profile_vm, target)
             file, _ = await build_profile_file_and_name(vm)
             is_owner = (target.id == cb_inter.user.id)
             view = ProfileView(
@@ -68,7 +71,7 @@ class ProfileCog(commands.Cog):
         target = inter.user  # owner
 
         async def refresh_profile():
-            vm = fetch_profile_vm(target)
+            vm = await run_db(fetch_profile_vm, target)
             file, _ = await build_profile_file_and_name(vm)
             view = ProfileView(
                 on_open_inventory=lambda i: self._open_inventory(i, target),
@@ -79,7 +82,7 @@ class ProfileCog(commands.Cog):
             )
             await origin_msg.edit(attachments=[file], embed=None, view=view)
 
-        user_db_id, options = get_title_select_options(inter.user)
+        user_db_id, options = await run_db(get_title_select_options, inter.user)
         if not options:
             await inter.response.send_message("ℹ️ You don't own any title yet.", ephemeral=True)
             return
@@ -98,7 +101,7 @@ class ProfileCog(commands.Cog):
         target = inter.user  # owner
 
         async def refresh_profile():
-            vm = fetch_profile_vm(target)
+            vm = await run_db(fetch_profile_vm, target)
             file, _ = await build_profile_file_and_name(vm)
             view = ProfileView(
                 on_open_inventory=lambda i: self._open_inventory(i, target),
@@ -109,7 +112,7 @@ class ProfileCog(commands.Cog):
             )
             await origin_msg.edit(attachments=[file], embed=None, view=view)
 
-        user_db_id, options = get_badge_select_options(inter.user)
+        user_db_id, options = await run_db(get_badge_select_options, inter.user)
         if not options:
             await inter.response.send_message("ℹ️ You don't own any badges yet.", ephemeral=True)
             return
@@ -128,7 +131,7 @@ class ProfileCog(commands.Cog):
         await interaction.response.defer(ephemeral=False)
         target = member or interaction.user
         
-        vm = fetch_profile_vm(target)
+        vm = await run_db(fetch_profile_vm, target)
         file, _ = await build_profile_file_and_name(vm)
     
         is_owner = (target.id == interaction.user.id)
@@ -147,14 +150,10 @@ class ProfileCog(commands.Cog):
     async def inventory(self, interaction: Interaction, member: discord.Member | None = None):
         target = member or interaction.user
 
-        with db_session() as s:
-            user = get_or_create_user_dto(s, target)                 # DB user DTO
-            publishables = get_user_publishables_for_preview(s, user.id)  # DB id (FIX)
-            items = fetch_user_inventory_ordered(s, user.id)
-            display_name = resolve_display_name(user)
+        items, display_name, publishables = await run_in_session(_load_inventory_state, target)
 
         async def _back(cb_inter: Interaction):
-            vm = fetch_profile_vm(target)
+            vm = await run_db(fetch_profile_vm, target)
             file, _ = await build_profile_file_and_name(vm)
             is_owner = (target.id == cb_inter.user.id)
             view = ProfileView(
@@ -190,7 +189,7 @@ class ProfileCog(commands.Cog):
         except discord.InteractionResponded:
             pass
 
-        user_db_id, options = get_badge_select_options(interaction.user)
+        user_db_id, options = await run_db(get_badge_select_options, interaction.user)
         
         if not options:
             await interaction.followup.send("ℹ️ You don't own any badges yet.", ephemeral=True)
@@ -211,7 +210,7 @@ class ProfileCog(commands.Cog):
         except discord.InteractionResponded:
             pass
 
-        user_db_id, options = get_title_select_options(interaction.user)
+        user_db_id, options = await run_db(get_title_select_options, interaction.user)
         if not options:
             await interaction.followup.send("ℹ️ You don't own any title yet.", ephemeral=True)
             return
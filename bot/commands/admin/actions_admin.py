@@ -7,6 +7,7 @@ from typing import Optional, List
 from bot.crud import actions_crud, action_events_crud
 from bot.crud.users_crud import ae_is_used_by_action_id
 from bot.config import ALLOWED_ACTION_INPUT_FIELDS, ACTIONS_PER_PAGE
+from bot.services.trigger_rules_cache import invalidate_trigger_rules_on_commit
 from bot.utils.time_parse_paginate import admin_or_mod_check, paginate_embeds, now_iso
 from db.database import db_session
 from db.schema import Action, ActionEvent
@@ -232,6 +233,7 @@ class AdminActionCommands(commands.GroupCog, name="admin_action"):
                 )
                 if ok:
                     deleted_configs += 1
+                    invalidate_trigger_rules_on_commit(session, ae.event_id)
 
             # Finally delete the Action itself (simple CRUD delete)
             deleted = actions_crud.delete_action(session=session, action_key=shortcode)
@@ -287,6 +289,7 @@ class AdminActionCommands(commands.GroupCog, name="admin_action"):
                 action_key=shortcode,
                 action_update_data=action_create_data
             )
+            invalidate_trigger_rules_on_commit(session)  # action_repeat labels of every event using it
 
         await interaction.followup.send(
             f"✅ Action `{shortcode}` has been deactivated and renamed to `{candidate_key}`.\n"
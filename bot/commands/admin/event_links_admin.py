@@ -6,6 +6,7 @@ from db.schema import RewardEvent, ActionEvent, Action
 from bot.crud import events_crud, rewards_crud, reward_events_crud, actions_crud, action_events_crud
 from bot.utils.time_parse_paginate import parse_required_fields, parse_help_texts
 from bot.config.constants import CURRENCY
+from bot.services.trigger_rules_cache import invalidate_trigger_rules_on_commit
 from bot.ui.admin.event_link_views import (
     EventSelect, RewardSelect, RewardEventSelect, AvailabilitySelect, PricePicker, ForceConfirmView, ActionEventSelect,
     ActionSelect, VariantPickerView, HelpTextPerFieldView, YesNoView, ToggleYesNoView,
@@ -431,6 +432,7 @@ class EventLinksAdminFriendly(commands.Cog):
                     iso_now,
                     force=force)
                 session.flush()
+                invalidate_trigger_rules_on_commit(session, existing_action_event.event_id)
 
             if new_availability == "inshop":
                 new_availability_display = f"now in shop for {new_price} {CURRENCY}"
@@ -671,6 +673,7 @@ class EventLinksAdminFriendly(commands.Cog):
                     iso_now,
                     force=force)
                 session.flush()
+                invalidate_trigger_rules_on_commit(session, linked_action_event.event_id)
                 msg_ae_deleted = f"🗑️ Deleted associated action-event: `{linked_action_event.action_event_key}`"
 
             # Step 6: Unlink reward-event
@@ -992,6 +995,7 @@ class EventLinksAdminFriendly(commands.Cog):
     
             if not updated:
                 return await interaction.followup.send("❌ Failed to update action-event.", ephemeral=True)
+            invalidate_trigger_rules_on_commit(session, updated.event_id)
     
             return await interaction.followup.send(
                 f"✅ Updated action-event **{ae.action.action_key}** ({ae.variant}) "
@@ -1067,6 +1071,7 @@ class EventLinksAdminFriendly(commands.Cog):
     
             if not success:
                 return await interaction.followup.send("❌ Deletion failed.", ephemeral=True)
+            invalidate_trigger_rules_on_commit(session, event.id)
     
             return await interaction.followup.send(
                 f"🗑️ Deleted action-event **{ae.action.action_key}** ({ae.variant}) from **{event.event_name}**.",
@@ -8,6 +8,7 @@ from db.schema import RewardEvent, ActionEvent, Action
 from bot.crud import events_crud, rewards_crud, reward_events_crud, actions_crud, action_events_crud, event_triggers_crud
 from bot.utils.time_parse_paginate import parse_required_fields, parse_help_texts
 from bot.config.constants import CURRENCY
+from bot.services.trigger_rules_cache import invalidate_trigger_rules_on_commit
 from bot.ui.admin.event_link_views import (
     EventSelect, RewardSelect, RewardEventSelect, AvailabilitySelect, PricePicker, ForceConfirmView, ActionEventSelect,
     ActionSelect, VariantPickerView, HelpTextPerFieldView, YesNoView, ToggleYesNoView,
@@ -89,34 +90,46 @@ def _ensure_reward_event(session, event, reward, availability: str, price: int,
     }, force=True)
 
 def _attach_reward_to_action_event(session, ae_key: str, reward_event_id: int, actor_id: str):
-    return action_events_crud.update_action_event(session, ae_key, {
+    ae = action_events_crud.update_action_event(session, ae_key, {
         "reward_event_id": reward_event_id,
         "modified_by": actor_id,
         "modified_at": now_iso()
     }, force=True)
+    if ae:
+        invalidate_trigger_rules_on_commit(session, ae.event_id)
+    return ae
 
 def _set_points_for_action_event(session, ae_key: str, points: int | None, actor_id: str):
-    return action_events_crud.update_action_event(session, ae_key, {
+    ae = action_events_crud.update_action_event(session, ae_key, {
         "points_granted": points,
         "modified_by": actor_id,
         "modified_at": now_iso()
     }, force=True)
+    if ae:
+        invalidate_trigger_rules_on_commit(session, ae.event_id)
+    return ae
 
 def _attach_reward_to_trigger(session, trigger_id: int, reward_event_id: int, actor_id: str):
     # TODO: adjust fields to your actual trigger model
-    return event_triggers_crud.update_event_trigger(session, trigger_id, {
+    trigger = event_triggers_crud.update_event_trigger(session, trigger_id, {
         "reward_event_id": reward_event_id,
         "modified_by": actor_id,
         "modified_at": now_iso()
     }, force=True)
+    if trigger:
+        invalidate_trigger_rules_on_commit(session, trigger.event_id)
+    return trigger
 
 def _set_points_for_trigger(session, trigger_id: int, points: int | None, actor_id: str):
     # TODO: adjust fields to your actual trigger model
-    return event_triggers_crud.update_event_trigger(session, trigger_id, {
+    trigger = event_triggers_crud.update_event_trigger(session, trigger_id, {
         "points_granted": points,
         "modified_by": actor_id,
         "modified_at": now_iso()
     }, force=True)
+    if trigger:
+        invalidate_trigger_rules_on_commit(session, trigger.event_id)
+    return trigger
 
 def _get_reward_access_paths(session, event_id: int, reward_id: int):
     """Return a list of dicts describing how the reward is currently reachable in this event."""
@@ -10,8 +10,7 @@ from bot.utils.time_parse_paginate import admin_or_mod_check, safe_parse_date, c
 from db.database import db_session
 from db.schema import EventLog, EventStatus, ActionEvent, Action
 from bot.ui.admin.event_dashboard_view import EventDashboardView, build_event_embed
-from io import StringIO, BytesIO
-import csv
+from bot.utils.csv_export import send_csv_parts, write_csv_parts
 from collections import defaultdict
 from typing import Iterable
 
@@ -214,11 +213,10 @@ class ReportResultsView(discord.ui.View):
     Buttons: Post in channel, Export CSV, Toggle group (Action/User).
     Holds raw rows so it can rebuild pages when toggling.
     """
-    def __init__(self, *, rows: list[dict], title: str, csv_bytes: bytes, initial_group: str = "action"):
+    def __init__(self, *, rows: list[dict], title: str, initial_group: str = "action"):
         super().__init__(timeout=180)
         self.rows = rows
         self.title = title
-        self.csv_bytes = csv_bytes
         self.group_mode = initial_group  # "action" | "user"
         self.pages: list[discord.Embed] = self._build_pages()
 
@@ -250,8 +248,13 @@ class ReportResultsView(discord.ui.View):
     @discord.ui.button(label="Export CSV", style=discord.ButtonStyle.secondary, row=0)
     async def export_csv(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True, thinking=False)
-        file = discord.File(BytesIO(self.csv_bytes), filename="actions_report.csv")
-        await interaction.followup.send(content="Here’s your CSV:", file=file, ephemeral=True)
+        # encoded on demand, row by row, instead of keeping a CSV copy of the rows alive
+        columns = list(self.rows[0].keys()) if self.rows else []
+        parts = write_csv_parts(
+            ([r.get(c, "") for c in columns] for r in self.rows),
+            columns, filename="actions_report.csv", preamble=[[self.title], []],
+        )
+        await send_csv_parts(interaction.followup.send, parts, content="Here’s your CSV:", ephemeral=True)
 
     @discord.ui.button(label="Group by: User", style=discord.ButtonStyle.secondary, row=1)
     async def group_toggle(self, interaction: discord.Interaction, button: discord.ui.Button):
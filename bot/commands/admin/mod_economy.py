@@ -9,6 +9,7 @@ from sqlalchemy import func, or_
 from db.database import db_session
 from db.schema import Reward, Inventory
 from bot.crud.users_crud import get_or_create_user
+from bot.crud.points_ledger_crud import record_points, take_points
 from bot.utils.time_parse_paginate import admin_or_mod_check  # your mod check
 from bot.config import PUBLISHABLE_REWARD_TYPES
 
@@ -81,15 +82,18 @@ class PointsModal(discord.ui.Modal, title="Adjust Points"):
             await interaction.response.send_message("❌ Amount must be a positive integer.", ephemeral=True)
             return
 
+        reason = str(self.reason.value or "").strip() or None
         with db_session() as session:
             db_user = get_or_create_user(session, self.target)
             if self.mode == "grant":
-                db_user.points += amt
-                db_user.total_earned += amt
+                record_points(
+                    session, user_id=db_user.id, delta=amt, source="mod",
+                    source_ref=reason, created_by=str(interaction.user.id),
+                )
                 verb = "Granted"
                 prep = "to"
             else:
-                db_user.points = max(0, db_user.points - amt)
+                amt = take_points(session, user_id=db_user.id, amount=amt, created_by=str(interaction.user.id), reason=reason)
                 verb = "Took"
                 prep = "from"
             who = display_name_from_db_user(db_user)
@@ -1,13 +1,19 @@
 from discord import app_commands, Interaction, SelectOption, Embed
 from discord.ext import commands
 from discord.ui import View, Button, Select
-from db.database import db_session
+from db.database import run_in_session
 from bot.crud import users_crud
-from bot.crud.shop_crud import get_inshop_catalog_grouped
-from bot.crud.purchase_crud import fetch_reward_event, apply_purchase, PurchaseError
+from bot.crud.shop_crud import get_shop_catalog
 from bot.ui.user.shop_dashboard_view import ShopPager
 
 
+def _load_shop_state(session, member):
+    """Catalog pages (cached, no query unless invalidated) + the member's wallet, in one unit of work."""
+    pages = get_shop_catalog(session)
+    user_id = users_crud.get_or_create_user_id(session, member)
+    return pages, users_crud.get_user_points(session, user_id)
+
+
 class ShopCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -16,10 +22,7 @@ class ShopCommands(commands.Cog):
     @app_commands.command(name="shop", description="Browse the event shop.")
     async def shop(self, interaction: Interaction):
         await interaction.response.defer(ephemeral=True, thinking=True)
-        with db_session() as session:
-            pages = get_inshop_catalog_grouped(session)
-            user = users_crud.get_or_create_user(session, interaction.user)
-            user_points = user.points
+        pages, user_points = await run_in_session(_load_shop_state, interaction.user)
         if not pages:
             await interaction.followup.send("No active event has items in the shop right now.")
             return
@@ -55,14 +55,14 @@ class UserInventory(commands.Cog):
 
         with db_session() as session:
             # Ensure user exists
-            user = users_crud.get_or_create_user(session, interaction.user)
+            user_id = users_crud.get_or_create_user_id(session, interaction.user)
 
             # Fetch only usable presets the user owns
             rows = (
                 session.query(Inventory, Reward)
                 .join(Reward, Inventory.reward_id == Reward.id)
                 .filter(
-                    Inventory.user_id == user.id,
+                    Inventory.user_id == user_id,
                     Reward.reward_type == "preset",
                     Reward.use_channel_discord_id.isnot(None),
                     Reward.use_message_discord_id.isnot(None),
@@ -79,6 +79,22 @@ def get_action_event_bundle(
     ae, action, revent, ev = row  # unpack Row -> real tuple
     return ae, action, revent, ev
 
+# --- READ: action descriptions for a set of action-events (label rendering) ---
+def get_action_descriptions_by_action_event_ids(
+    session: Session,
+    action_event_ids: Iterable[int],
+) -> dict[int, str]:
+    ids = {int(i) for i in action_event_ids}
+    if not ids:
+        return {}
+    rows = (
+        session.query(ActionEvent.id, Action.action_description)
+        .join(Action, ActionEvent.action_id == Action.id)
+        .filter(ActionEvent.id.in_(ids))
+        .all()
+    )
+    return {int(ae_id): desc for ae_id, desc in rows}
+
 # --- READ: repeatability check (non-repeatable already done?) ---
 def user_already_completed_non_repeatable(
     session: Session,
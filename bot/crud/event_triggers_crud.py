@@ -94,6 +94,20 @@ def has_user_event_trigger_log(session: Session, user_id: int, trigger_id: int)
         is not None
     )
 
+def get_granted_trigger_ids(session: Session, user_id: int, trigger_ids: list[int]) -> set[int]:
+    """Which of trigger_ids were already granted to the user (one query for a whole evaluation)."""
+    if not trigger_ids:
+        return set()
+    rows = (
+        session.query(UserEventTriggerLog.event_trigger_id)
+        .filter(
+            UserEventTriggerLog.user_id == user_id,
+            UserEventTriggerLog.event_trigger_id.in_(trigger_ids),
+        )
+        .all()
+    )
+    return {int(r[0]) for r in rows}
+
 def delete_user_event_trigger_log(session: Session, log_id: int) -> bool:
     log = session.query(UserEventTriggerLog).get(log_id)
     if not log:
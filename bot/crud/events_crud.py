@@ -3,6 +3,7 @@ from typing import Optional
 from bot.config import EXCLUDED_LOG_FIELDS
 from bot.crud import general_crud
 from bot.utils.time_parse_paginate import now_iso
+from bot.crud.shop_crud import invalidate_shop_catalog_on_commit
 from db.schema import EventLog
 
 # -----------------------------------------------------------------------------
@@ -189,6 +190,7 @@ def update_event(
         log_description=log_description
     )
 
+    invalidate_shop_catalog_on_commit(session)
     return event
 
 
@@ -224,7 +226,8 @@ def delete_event(
     )
 
     session.delete(event)
-    
+
+    invalidate_shop_catalog_on_commit(session)
     return True
 
     
@@ -332,4 +335,5 @@ def set_event_status(
         log_description=log_description
     )
 
+    invalidate_shop_catalog_on_commit(session)
     return event
\ No newline at end of file
@@ -0,0 +1,149 @@
+# bot/crud/points_ledger_crud.py
+from typing import Optional, Tuple
+
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from db.schema import PointsLedger, User, UserEventData
+from bot.utils.formatting import now_iso
+
+# Every points movement is one ledger row; the balances on users and
+# user_event_data are updated in the same transaction with relative
+# `x = x + :delta` updates, so concurrent writers never lose each other's work.
+#
+# How balances derive from the ledger (reconcile_points_balances does the same in bulk):
+#   users.points                 = SUM(delta)
+#   users.total_earned           = SUM(delta) of positive action/trigger/mod rows + all opening rows
+#   users.total_spent            = -SUM(delta) of purchase rows
+#   ("adjustment" rows, the migration's balance carry-over, move points only)
+#   user_event_data.points_earned = positive EVENT_EARNING_SOURCES rows of that event
+
+POINTS_SOURCES = ("action", "trigger", "purchase", "mod", "opening", "adjustment")
+EVENT_EARNING_SOURCES = ("action", "trigger", "opening")    # "opening": balances carried over by the migration
+
+def record_points(
+    session: Session,
+    *,
+    user_id: int,
+    delta: int,
+    source: str,
+    event_id: Optional[int] = None,
+    source_ref: Optional[str] = None,
+    created_by: Optional[str] = None,
+) -> None:
+    """
+    Append one ledger row and apply it to the materialized balances.
+    The user_event_data row must already exist for event earnings to be tallied.
+    Let caller commit.
+    """
+    if not delta:
+        return
+    if source not in POINTS_SOURCES:
+        raise ValueError(f"Unknown points source '{source}'.")
+
+    session.add(PointsLedger(
+        user_id=user_id,
+        event_id=event_id,
+        delta=delta,
+        source=source,
+        source_ref=str(source_ref) if source_ref is not None else None,
+        created_by=created_by,
+        created_at=now_iso(),
+    ))
+
+    values = {"points": User.points + delta}
+    if source == "purchase":
+        values["total_spent"] = User.total_spent - delta
+    elif source == "opening" or (delta > 0 and source != "adjustment"):
+        values["total_earned"] = User.total_earned + delta
+    # ORM-enabled UPDATE: loaded User objects are synchronized in place
+    session.execute(update(User).where(User.id == user_id).values(**values))
+
+    if event_id is not None and delta > 0 and source in EVENT_EARNING_SOURCES:
+        session.execute(
+            update(UserEventData)
+            .where(UserEventData.user_id == user_id, UserEventData.event_id == event_id)
+            .values(points_earned=UserEventData.points_earned + delta)
+        )
+    session.flush()
+
+def take_points(
+    session: Session,
+    *,
+    user_id: int,
+    amount: int,
+    created_by: Optional[str] = None,
+    reason: Optional[str] = None,
+) -> int:
+    """Remove up to `amount` points (never below zero) as a mod action. Returns the amount actually taken."""
+    current = (
+        session.query(User.points)
+        .filter(User.id == user_id)
+        .with_for_update()
+        .scalar()
+    )
+    taken = min(max(current or 0, 0), amount)
+    record_points(session, user_id=user_id, delta=-taken, source="mod", source_ref=reason, created_by=created_by)
+    return taken
+
+def get_points_history(session: Session, user_id: int, limit: int = 50) -> list[PointsLedger]:
+    """Most recent ledger rows of a user, newest first."""
+    return (
+        session.query(PointsLedger)
+        .filter(PointsLedger.user_id == user_id)
+        .order_by(PointsLedger.created_at.desc(), PointsLedger.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+# ---------------------------------------------------------------------------
+# Reconciliation
+# ---------------------------------------------------------------------------
+
+_RECONCILE_USERS_SQL = text("""
+UPDATE users u
+SET points = t.points, total_earned = t.total_earned, total_spent = t.total_spent
+FROM (
+    SELECT u2.id,
+           COALESCE(SUM(l.delta), 0) AS points,
+           COALESCE(SUM(l.delta) FILTER (
+               WHERE l.source = 'opening' OR (l.delta > 0 AND l.source NOT IN ('purchase', 'adjustment'))
+           ), 0) AS total_earned,
+           COALESCE(-SUM(l.delta) FILTER (WHERE l.source = 'purchase'), 0) AS total_spent
+    FROM users u2
+    LEFT JOIN points_ledger l ON l.user_id = u2.id
+    WHERE CAST(:user_id AS integer) IS NULL OR u2.id = :user_id
+    GROUP BY u2.id
+) t
+WHERE u.id = t.id
+  AND (u.points, u.total_earned, u.total_spent) IS DISTINCT FROM (t.points, t.total_earned, t.total_spent)
+""")
+
+_RECONCILE_EVENT_DATA_SQL = text("""
+UPDATE user_event_data d
+SET points_earned = t.points_earned
+FROM (
+    SELECT d2.id,
+           COALESCE(SUM(l.delta) FILTER (WHERE l.delta > 0 AND l.source IN ('action', 'trigger', 'opening')), 0)
+               AS points_earned
+    FROM user_event_data d2
+    LEFT JOIN points_ledger l ON l.user_id = d2.user_id AND l.event_id = d2.event_id
+    WHERE CAST(:user_id AS integer) IS NULL OR d2.user_id = :user_id
+    GROUP BY d2.id
+) t
+WHERE d.id = t.id AND d.points_earned IS DISTINCT FROM t.points_earned
+""")
+
+def reconcile_points_balances(session: Session, user_id: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Rebuild users and user_event_data balances from the ledger in two set-based
+    UPDATEs (all users, or one). Only drifted rows are written.
+    Returns (users fixed, user_event_data rows fixed). Let caller commit.
+    """
+    session.flush()
+    params = {"user_id": user_id}
+    users_fixed = session.execute(_RECONCILE_USERS_SQL, params).rowcount
+    ued_fixed = session.execute(_RECONCILE_EVENT_DATA_SQL, params).rowcount
+    # raw SQL bypassed the identity map
+    session.expire_all()
+    return users_fixed, ued_fixed
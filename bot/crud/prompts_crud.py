@@ -31,6 +31,24 @@ def get_prompt_by_code_and_event(
 ) -> Optional[EventPrompt]:
     return session.query(EventPrompt).filter(EventPrompt.code == code, EventPrompt.event_id == event_id).first()
 
+def get_prompt_index_for_event(session: Session, event_id: int) -> list[tuple[int, str, Optional[str]]]:
+    """(id, code, group) for every prompt of the event, for in-memory lookups."""
+    return [
+        (int(pid), code, group)
+        for pid, code, group in (
+            session.query(EventPrompt.id, EventPrompt.code, EventPrompt.group)
+            .filter(EventPrompt.event_id == event_id)
+            .all()
+        )
+    ]
+
+def get_prompt_labels_by_code(session: Session, event_id: int) -> dict[str, str]:
+    return dict(
+        session.query(EventPrompt.code, EventPrompt.label)
+        .filter(EventPrompt.event_id == event_id)
+        .all()
+    )
+
 def upsert_prompts_bulk(
     session: Session,
     *,
@@ -127,6 +145,14 @@ def delete_prompt_safe(session: Session, prompt_id: int) -> bool:
 
 # ---------- USER ACTION <-> PROMPTS ----------
 
+def get_prompt_ids_for_user_action(session: Session, user_action_id: int) -> set[int]:
+    rows = (
+        session.query(UserActionPrompt.event_prompt_id)
+        .filter(UserActionPrompt.user_action_id == user_action_id)
+        .all()
+    )
+    return {int(r[0]) for r in rows}
+
 def replace_user_action_prompts(
     session: Session,
     *,
@@ -1,8 +1,18 @@
-from sqlalchemy.exc import IntegrityError
-from db.schema import RewardEvent, Reward, Inventory, User, Event, EventStatus
+from dataclasses import dataclass
+from sqlalchemy import text
+from db.schema import RewardEvent, Reward, Event, EventStatus
 
 class PurchaseError(Exception): ...
 
+@dataclass(frozen=True)
+class PurchaseResult:
+    reward_id: int
+    reward_name: str
+    event_name: str
+    price: int
+    balance: int        # wallet after the debit
+    quantity: int       # owned quantity after the purchase
+
 def fetch_reward_event(session, reward_event_key: str):
     re = (
         session.query(RewardEvent, Reward, Event)
@@ -22,34 +32,105 @@ def fetch_reward_event(session, reward_event_key: str):
         raise PurchaseError("This preset hasn't been published yet.")
     return reward_event, reward, event
 
-def already_owned_nonstackable(session, user_id: int, reward_id: int, is_stackable: bool) -> bool:
-    if is_stackable:
-        return False
-    inv = session.query(Inventory).filter_by(user_id=user_id, reward_id=reward_id).first()
-    return bool(inv)
-
-def apply_purchase(session, user: User, reward_event: RewardEvent, reward: Reward):
-    price = reward_event.price or 0
-    if user.points < price:
-        raise PurchaseError("Not enough points.")
-
-    if already_owned_nonstackable(session, user.id, reward.id, reward.is_stackable):
-        raise PurchaseError("You already own this (not stackable).")
-
-    # points
-    user.points -= price
-    user.total_spent += price
-    
-    # inventory
-    inv = session.query(Inventory).filter_by(user_id=user.id, reward_id=reward.id).first()
-    if inv:
-        inv.quantity += 1
-    else:
-        inv = Inventory(user_id=user.id, reward_id=reward.id, quantity=1)
-        session.add(inv)
-        
-    # stats
-    reward.number_granted += 1
-    
-    # Let caller commit
-    return inv, price
+# ---------------------------------------------------------------------------
+# Atomic purchase
+# ---------------------------------------------------------------------------
+# Statement 1 resolves the item (same rules as fetch_reward_event) and debits
+# the wallet only if the balance covers the price and a non-stackable item is
+# not owned yet, appending the matching points_ledger row. The conditional
+# UPDATE locks the user row, so concurrent purchases by the same user queue up
+# and re-check the balance.
+# Statement 2 upserts the inventory row and bumps the reward counter. Running
+# it last keeps the reward row lock as short as possible (the caller commits
+# right after).
+
+_DEBIT_SQL = text("""
+WITH item AS (
+    SELECT r.id AS reward_id, r.reward_name, r.is_stackable, e.id AS event_id, e.event_name,
+           COALESCE(re.price, 0) AS price
+    FROM reward_events re
+    JOIN rewards r ON r.id = re.reward_id
+    JOIN events e ON e.id = re.event_id
+    WHERE re.reward_event_key = :reward_event_key
+      AND re.availability = 'inshop'
+      AND e.event_status = 'active'
+      AND (r.reward_type <> 'preset' OR (r.preset_by IS NOT NULL AND r.preset_at IS NOT NULL))
+),
+debit AS (
+    UPDATE users u
+    SET points = u.points - item.price, total_spent = u.total_spent + item.price
+    FROM item
+    WHERE u.id = :user_id
+      AND u.points >= item.price
+      AND (item.is_stackable OR NOT EXISTS (
+          SELECT 1 FROM inventory_rewards i WHERE i.user_id = u.id AND i.reward_id = item.reward_id
+      ))
+    RETURNING u.points AS balance, u.user_discord_id
+),
+ledger AS (
+    INSERT INTO points_ledger (user_id, event_id, delta, source, source_ref, created_by, created_at)
+    SELECT :user_id, item.event_id, -item.price, 'purchase', :reward_event_key, debit.user_discord_id, now()
+    FROM item, debit
+    WHERE item.price <> 0
+)
+SELECT item.*,
+       (SELECT balance FROM debit) AS balance,
+       EXISTS (
+           SELECT 1 FROM inventory_rewards i WHERE i.user_id = :user_id AND i.reward_id = item.reward_id
+       ) AS owned
+FROM item
+""")
+
+_GRANT_SQL = text("""
+WITH inv AS (
+    INSERT INTO inventory_rewards (user_id, reward_id, quantity, is_equipped)
+    VALUES (:user_id, :reward_id, 1, false)
+    ON CONFLICT ON CONSTRAINT uix_user_reward
+    DO UPDATE SET quantity = inventory_rewards.quantity + 1 WHERE :is_stackable
+    RETURNING quantity
+),
+bump AS (
+    UPDATE rewards SET number_granted = number_granted + 1
+    WHERE id = :reward_id AND EXISTS (SELECT 1 FROM inv)
+    RETURNING id
+)
+SELECT (SELECT quantity FROM inv) AS quantity
+""")
+
+def purchase_reward(session, user_id: int, reward_event_key: str) -> PurchaseResult:
+    """
+    Buy one unit of a shop item for user_id in two statements. Raises PurchaseError
+    (with nothing written: the work runs in a savepoint) when the purchase is refused.
+    Let caller commit.
+    """
+    session.flush()
+    with session.begin_nested():   # an exception inside rolls the debit back
+        row = session.execute(
+            _DEBIT_SQL, {"user_id": user_id, "reward_event_key": reward_event_key}
+        ).mappings().first()
+        if row is None:
+            fetch_reward_event(session, reward_event_key)   # raises the precise reason
+            raise PurchaseError("This item is not available.")
+        if row["balance"] is None:
+            if row["owned"] and not row["is_stackable"]:
+                raise PurchaseError("You already own this (not stackable).")
+            raise PurchaseError("Not enough points.")
+
+        grant = session.execute(
+            _GRANT_SQL,
+            {"user_id": user_id, "reward_id": row["reward_id"], "is_stackable": bool(row["is_stackable"])},
+        ).mappings().first()
+        if grant["quantity"] is None:
+            # a concurrent purchase of the same non-stackable item committed first
+            raise PurchaseError("You already own this (not stackable).")
+
+    # raw SQL bypassed the identity map: reload users/inventory/rewards on next access
+    session.expire_all()
+    return PurchaseResult(
+        reward_id=row["reward_id"],
+        reward_name=row["reward_name"],
+        event_name=row["event_name"],
+        price=row["price"],
+        balance=row["balance"],
+        quantity=grant["quantity"],
+    )
@@ -1,8 +1,9 @@
 # bot/crud/reporting_crud.py
 from __future__ import annotations
 
-from typing import Iterable, List, Optional, Sequence, Tuple, Dict, Any
-from sqlalchemy import func, case, and_, or_, literal
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Dict, Any
+from sqlalchemy import func, case, and_, or_, literal, select, tuple_
 from sqlalchemy.orm import Session
 
 from db.schema import (
@@ -39,83 +40,113 @@ def list_action_events_for_event(session: Session, event_id: int) -> List[Tuple[
     return [(ae, a) for (ae, a) in rows]
 
 # ---------- Leaderboards ----------
+# Each leaderboard is one query: aggregate per user, rank with a window
+# function over the whole board, then page (limit/offset) or pick one user
+# ("my rank") from the ranked set. Ties share a rank (RANK(): 1, 1, 3).
+# Every row also carries `total` (participants on the board).
+# stream=True returns a generator over a server-side cursor (CSV export).
 
-def leaderboard_points_by_event(session, event_id: int) -> list[dict]:
-    q = (
+REPORT_YIELD_PER = 1000  # rows per server-side cursor fetch when streaming exports
+
+def _page_ranked(
+    session: Session, ranked, *tiebreak,
+    limit: Optional[int], offset: int, user_discord_id: Optional[str], stream: bool = False,
+):
+    q = session.query(ranked)
+    if user_discord_id is not None:
+        q = q.filter(ranked.c.user_discord_id == str(user_discord_id))
+    q = q.order_by(ranked.c.rank.asc(), *tiebreak, ranked.c.user_id.asc())
+    if offset:
+        q = q.offset(offset)
+    if limit is not None:
+        q = q.limit(limit)
+    if stream:
+        return (dict(r._mapping) for r in q.yield_per(REPORT_YIELD_PER))
+    return [dict(r._mapping) for r in q.all()]
+
+def leaderboard_points_by_event(
+    session: Session,
+    event_id: int,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_discord_id: Optional[str] = None,
+    stream: bool = False,
+) -> Iterable[Dict[str, Any]]:
+    """
+    Rows: { user_id, user_discord_id, display_name, points, rank, total }, best first.
+    Served by ix_user_event_data_event_points.
+    """
+    ranked = (
         session.query(
             User.id.label("user_id"),
             User.user_discord_id.label("user_discord_id"),
             User.display_name.label("display_name"),
             UserEventData.points_earned.label("points"),
+            func.rank().over(order_by=UserEventData.points_earned.desc()).label("rank"),
+            func.count().over().label("total"),
         )
         .join(UserEventData, UserEventData.user_id == User.id)
         .filter(UserEventData.event_id == event_id)
-        .order_by(UserEventData.points_earned.desc(), User.display_name.asc())
+    ).subquery()
+    return _page_ranked(
+        session, ranked, ranked.c.display_name.asc(),
+        limit=limit, offset=offset, user_discord_id=user_discord_id, stream=stream,
     )
-    return [dict(r._asdict()) for r in q.all()]
 
-def leaderboard_prompts_by_event(session: Session, event_id: int) -> List[Dict[str, Any]]:
+def leaderboard_prompts_by_event(
+    session: Session,
+    event_id: int,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_discord_id: Optional[str] = None,
+    stream: bool = False,
+) -> Iterable[Dict[str, Any]]:
     """
     For 'prompt' events: count total selected prompts (duplicates allowed)
-    and unique prompts per user.
-    Returns rows: { user_id, user_discord_id, display_name, total_prompts, unique_prompts }
+    and unique prompts per user, ranked by unique then total.
+    Returns rows: { user_id, user_discord_id, display_name, total_prompts, unique_prompts, rank, total }
     """
-    # Join UserActionPrompt -> UserAction -> ActionEvent (filter event)
-    base = (
+    total_prompts = func.count()
+    unique_prompts = func.count(func.distinct(UserActionPrompt.event_prompt_id))
+    ranked = (
         session.query(
             User.id.label("user_id"),
             User.user_discord_id.label("user_discord_id"),
             User.display_name.label("display_name"),
-            UserActionPrompt.event_prompt_id.label("pid")
+            total_prompts.label("total_prompts"),
+            unique_prompts.label("unique_prompts"),
+            func.rank().over(order_by=(unique_prompts.desc(), total_prompts.desc())).label("rank"),
+            func.count().over().label("total"),
         )
+        .select_from(UserActionPrompt)
         .join(UserAction, UserActionPrompt.user_action_id == UserAction.id)
         .join(ActionEvent, UserAction.action_event_id == ActionEvent.id)
         .join(User, UserAction.user_id == User.id)
         .filter(ActionEvent.event_id == event_id)
+        .group_by(User.id, User.user_discord_id, User.display_name)
     ).subquery()
-
-    # total prompts
-    q_total = (
-        session.query(
-            base.c.user_id,
-            func.count().label("total_prompts")
-        ).group_by(base.c.user_id)
+    return _page_ranked(
+        session, ranked, func.lower(ranked.c.display_name).asc(),
+        limit=limit, offset=offset, user_discord_id=user_discord_id, stream=stream,
     )
-    totals = {r.user_id: r.total_prompts for r in q_total.all()}
-
-    # unique prompts
-    q_unique = (
-        session.query(
-            base.c.user_id,
-            func.count(func.distinct(base.c.pid)).label("unique_prompts")
-        ).group_by(base.c.user_id)
-    )
-    uniques = {r.user_id: r.unique_prompts for r in q_unique.all()}
-
-    # Names
-    users = session.query(User).filter(User.id.in_(set(totals) | set(uniques))).all()
-    by_id = {u.id: u for u in users}
-
-    rows = []
-    for uid in set(totals) | set(uniques):
-        u = by_id[uid]
-        rows.append({
-            "user_id": uid,
-            "user_discord_id": u.user_discord_id,
-            "display_name": u.display_name,
-            "total_prompts": int(totals.get(uid, 0)),
-            "unique_prompts": int(uniques.get(uid, 0))
-        })
-
-    return sorted(rows, key=lambda x: (-x["unique_prompts"], -x["total_prompts"], x["display_name"].casefold()))
 
 def leaderboard_actions_by_action_events(
-    session: Session, event_id: int, action_event_ids: Sequence[int]
-) -> List[Dict[str, Any]]:
+    session: Session,
+    event_id: int,
+    action_event_ids: Sequence[int],
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_discord_id: Optional[str] = None,
+    stream: bool = False,
+) -> Iterable[Dict[str, Any]]:
     """
     Count actions per user across selected ActionEvent ids.
     If an ActionEvent has is_numeric_multiplier=True, we count numeric_value (if >0) for that row;
     otherwise the row counts as 1.
+    Rows: { user_id, user_discord_id, display_name, count, rank, total }
     """
     if not action_event_ids:
         return []
@@ -131,42 +162,61 @@ def leaderboard_actions_by_action_events(
         (ActionEvent.is_numeric_multiplier.is_(True) & (num <= 0), literal(0)),
         else_=literal(1),
     )
+    count = func.sum(qty_expr)
 
-    q = (
+    ranked = (
         session.query(
             User.id.label("user_id"),
             User.user_discord_id.label("user_discord_id"),
             User.display_name.label("display_name"),
-            func.sum(qty_expr).label("count"),
+            count.label("count"),
+            func.rank().over(order_by=count.desc()).label("rank"),
+            func.count().over().label("total"),
         )
         .join(UserAction, UserAction.user_id == User.id)
         .join(ActionEvent, UserAction.action_event_id == ActionEvent.id)
         .filter(ActionEvent.event_id == event_id)
         .filter(UserAction.action_event_id.in_(list(action_event_ids)))
         .group_by(User.id, User.user_discord_id, User.display_name)
-        .order_by(func.sum(qty_expr).desc(), User.display_name.asc())
+    ).subquery()
+    return _page_ranked(
+        session, ranked, ranked.c.display_name.asc(),
+        limit=limit, offset=offset, user_discord_id=user_discord_id, stream=stream,
     )
 
-    return [dict(r._asdict()) for r in q.all()]
-
 
 # ---------- Action List ----------
 
-def list_actions_for_action_events(
+def civic_day_bounds(day: str | date) -> Tuple[datetime, datetime]:
+    """UTC [start, end) of a 'YYYY-MM-DD' day, for timestamptz range filters."""
+    d = date.fromisoformat(day) if isinstance(day, str) else day
+    since = datetime.combine(d, time.min, tzinfo=timezone.utc)
+    return since, since + timedelta(days=1)
+
+# order_field -> (column, key of that column in the result rows)
+_ACTION_SORTS = {
+    "created_at": (UserAction.created_at, "created_at"),
+    "url": (UserAction.url_value, "url_value"),
+    "numeric": (UserAction.numeric_value, "numeric_value"),
+    "text": (UserAction.text_value, "text_value"),
+    "bool": (UserAction.boolean_value, "boolean_value"),
+    "date": (UserAction.date_value, "date_value"),
+}
+
+def _actions_query(
     session: Session,
-    event_id: int,
     action_event_ids: Sequence[int],
-    date_iso: Optional[str],  # 'YYYY-MM-DD' to consider that whole civic day
-    order_field: str,         # 'created_at'|'url'|'numeric'|'text'|'bool'|'date'
-    ascending: bool
-) -> List[Dict[str, Any]]:
-    """
-    Return action rows for selected action events + optional civic date filter.
-    Dynamically include only used value columns.
-    """
-    if not action_event_ids:
-        return []
-
+    date_iso: Optional[str],
+    order_field: str,
+    ascending: bool,
+    after: Optional[Tuple[Any, int]] = None,
+):
+    prompts_count = (
+        select(func.count(UserActionPrompt.id))
+        .where(UserActionPrompt.user_action_id == UserAction.id)
+        .correlate(UserAction)
+        .scalar_subquery()
+    )
     q = (
         session.query(
             UserAction.id.label("id"),
@@ -179,44 +229,114 @@ def list_actions_for_action_events(
             UserAction.boolean_value.label("boolean_value"),
             UserAction.date_value.label("date_value"),
             UserAction.action_event_id.label("action_event_id"),
+            prompts_count.label("prompts_count"),
         )
         .join(User, User.id == UserAction.user_id)
         .filter(UserAction.action_event_id.in_(list(action_event_ids)))
     )
 
     if date_iso:
-        # civic day -> filter from 'YYYY-MM-DDT00:00:00' inclusive to next day exclusive;
-        since = f"{date_iso}T00:00:00"
-        until = f"{date_iso}T23:59:59"
-        q = q.filter(and_(UserAction.created_at >= since, UserAction.created_at <= until))
-
-    # sorting
-    col_map = {
-        "created_at": UserAction.created_at,
-        "url": UserAction.url_value,
-        "numeric": UserAction.numeric_value,
-        "text": UserAction.text_value,
-        "bool": UserAction.boolean_value,
-        "date": UserAction.date_value,
-    }
-    sort_col = col_map.get(order_field, UserAction.created_at)
-    q = q.order_by(sort_col.asc() if ascending else sort_col.desc())
-
-    rows = [dict(r._asdict()) for r in q.all()]
-
-    # add prompts_count per action if any
-    if rows:
-        ids = [r["id"] for r in rows]
-        q_prompts = (
-            session.query(
-                UserActionPrompt.user_action_id,
-                func.count(UserActionPrompt.id)
-            )
-            .filter(UserActionPrompt.user_action_id.in_(ids))
-            .group_by(UserActionPrompt.user_action_id)
-        )
-        counts = {k: v for k, v in q_prompts.all()}
-        for r in rows:
-            r["prompts_count"] = int(counts.get(r["id"], 0))
+        # civic day (UTC) -> [day 00:00, next day 00:00), an index range scan on (action_event_id, created_at)
+        since, until = civic_day_bounds(date_iso)
+        q = q.filter(and_(UserAction.created_at >= since, UserAction.created_at < until))
+
+    # sorting: (value, id) in the chosen direction, NULL values last either way,
+    # so (value, id) of the last row is a stable keyset cursor
+    sort_col = _ACTION_SORTS.get(order_field, _ACTION_SORTS["created_at"])[0]
+    if after is not None:
+        value, last_id = after
+        if value is None:
+            # already in the trailing NULL block
+            q = q.filter(sort_col.is_(None), UserAction.id > last_id if ascending else UserAction.id < last_id)
+        else:
+            key, cur = tuple_(sort_col, UserAction.id), tuple_(literal(value), literal(last_id))
+            q = q.filter(or_(key > cur if ascending else key < cur, sort_col.is_(None)))
+    if ascending:
+        return q.order_by(sort_col.asc().nulls_last(), UserAction.id.asc())
+    return q.order_by(sort_col.desc().nulls_last(), UserAction.id.desc())
+
+def list_actions_for_action_events(
+    session: Session,
+    event_id: int,
+    action_event_ids: Sequence[int],
+    date_iso: Optional[str],  # 'YYYY-MM-DD' to consider that whole civic day
+    order_field: str,         # 'created_at'|'url'|'numeric'|'text'|'bool'|'date'
+    ascending: bool
+) -> List[Dict[str, Any]]:
+    """
+    Return action rows for selected action events + optional civic date filter,
+    each with its prompts_count.
+    """
+    if not action_event_ids:
+        return []
+    q = _actions_query(session, action_event_ids, date_iso, order_field, ascending)
+    return [dict(r._mapping) for r in q.all()]
+
+def page_actions_for_action_events(
+    session: Session,
+    event_id: int,
+    action_event_ids: Sequence[int],
+    date_iso: Optional[str],
+    order_field: str,
+    ascending: bool,
+    *,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 25,
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, int]]]:
+    """
+    One keyset page of list_actions_for_action_events: rows after `after`
+    (the cursor of the previous page, None for the first) and the cursor of
+    the next page (None on the last page). Cost is one LIMIT query whatever the offset.
+    """
+    if not action_event_ids:
+        return [], None
+    q = _actions_query(session, action_event_ids, date_iso, order_field, ascending, after=after)
+    rows = [dict(r._mapping) for r in q.limit(limit + 1).all()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    sort_key = _ACTION_SORTS.get(order_field, _ACTION_SORTS["created_at"])[1]
+    return rows, (rows[-1][sort_key], rows[-1]["id"])
+
+def iter_actions_for_action_events(
+    session: Session,
+    event_id: int,
+    action_event_ids: Sequence[int],
+    date_iso: Optional[str],
+    order_field: str,
+    ascending: bool,
+) -> Iterator[Dict[str, Any]]:
+    """Same rows as list_actions_for_action_events, streamed from a server-side cursor."""
+    if not action_event_ids:
+        return
+    q = _actions_query(session, action_event_ids, date_iso, order_field, ascending)
+    for r in q.yield_per(REPORT_YIELD_PER):
+        yield dict(r._mapping)
 
-    return rows
+def action_value_columns_used(
+    session: Session,
+    action_event_ids: Sequence[int],
+    date_iso: Optional[str],
+) -> Dict[str, bool]:
+    """Which optional value columns hold data in the report, in one aggregate (no row materialization)."""
+    keys = ("url_value", "numeric_value", "text_value", "boolean_value", "date_value", "prompts_count")
+    if not action_event_ids:
+        return dict.fromkeys(keys, False)
+    has_prompt = (
+        select(UserActionPrompt.id)
+        .where(UserActionPrompt.user_action_id == UserAction.id)
+        .correlate(UserAction)
+        .exists()
+    )
+    q = session.query(
+        func.bool_or(func.coalesce(UserAction.url_value, "") != ""),
+        func.bool_or(UserAction.numeric_value.isnot(None)),
+        func.bool_or(func.coalesce(UserAction.text_value, "") != ""),
+        func.bool_or(UserAction.boolean_value.isnot(None)),
+        func.bool_or(func.coalesce(UserAction.date_value, "") != ""),
+        func.bool_or(has_prompt),
+    ).filter(UserAction.action_event_id.in_(list(action_event_ids)))
+    if date_iso:
+        since, until = civic_day_bounds(date_iso)
+        q = q.filter(and_(UserAction.created_at >= since, UserAction.created_at < until))
+    return {k: bool(v) for k, v in zip(keys, q.one())}
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from bot.config import EXCLUDED_LOG_FIELDS
 from bot.crud import general_crud
+from bot.crud.shop_crud import invalidate_shop_catalog_on_commit
 from db.schema import RewardEvent, Reward, Event, RewardEventLog
 
 
@@ -53,6 +54,7 @@ def create_reward_event(
         forced=force
     )
 
+    invalidate_shop_catalog_on_commit(session)
     return re
 
 
@@ -90,6 +92,7 @@ def update_reward_event(
         forced=force
     )
 
+    invalidate_shop_catalog_on_commit(session)
     return re
 
 
@@ -126,4 +129,5 @@ def delete_reward_event(
 
     session.delete(re)
 
+    invalidate_shop_catalog_on_commit(session)
     return True
\ No newline at end of file
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from bot.crud import general_crud
 from bot.utils.time_parse_paginate import now_iso
+from bot.crud.shop_crud import invalidate_shop_catalog_on_commit
 from db.schema import Reward, RewardLog, RewardEvent, Event, EventStatus
 
 def get_reward_by_reward_event_id(session: Session, reward_event_id: int) -> Reward | None:
@@ -104,6 +105,7 @@ def update_reward(
         forced=forced
     )
 
+    invalidate_shop_catalog_on_commit(session)
     return reward
 
 
@@ -139,7 +141,8 @@ def delete_reward(
     )
 
     session.delete(reward)
-    
+
+    invalidate_shop_catalog_on_commit(session)
     return True
 
 
@@ -242,6 +245,7 @@ def publish_preset(
         forced=forced
     )
 
+    invalidate_shop_catalog_on_commit(session)
     return reward
     
 
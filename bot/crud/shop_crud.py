@@ -1,5 +1,8 @@
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import joinedload
+import threading
+from types import MappingProxyType
+from typing import Optional, Tuple
+from sqlalchemy import and_, or_, event as sa_event
+from sqlalchemy.orm import joinedload, Session
 from db.schema import Event, RewardEvent, Reward, EventStatus
 
 def is_preset_published_clause(Reward):
@@ -48,4 +51,61 @@ def get_inshop_catalog_grouped(session):
         })
 
     # Return a list of event pages
-    return list(pages_by_event.values())
\ No newline at end of file
+    return list(pages_by_event.values())
+
+# ---------------------------------------------------------------------------
+# Versioned catalog cache
+# ---------------------------------------------------------------------------
+# The catalog only changes on admin writes (rewards, reward links, event status/
+# priority, preset publish), which call invalidate_shop_catalog_on_commit().
+# Pages are frozen (tuples of read-only mappings) since every /shop shares them.
+
+_catalog_lock = threading.Lock()
+_catalog_version = 0
+_catalog: Optional[Tuple[int, tuple]] = None        # (version it was loaded at, pages)
+
+def _freeze_pages(pages: list) -> tuple:
+    return tuple(
+        MappingProxyType({**p, "items": tuple(MappingProxyType(it) for it in p["items"])})
+        for p in pages
+    )
+
+def get_shop_catalog(session: Session) -> tuple:
+    """In-shop catalog pages, from memory unless an admin write invalidated them."""
+    global _catalog
+    with _catalog_lock:
+        cached, version = _catalog, _catalog_version
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    pages = _freeze_pages(get_inshop_catalog_grouped(session))
+    with _catalog_lock:
+        # an invalidation during the load means these rows may already be stale
+        if _catalog_version == version:
+            _catalog = (version, pages)
+    return pages
+
+def get_shop_catalog_version() -> int:
+    with _catalog_lock:
+        return _catalog_version
+
+def invalidate_shop_catalog() -> None:
+    global _catalog_version, _catalog
+    with _catalog_lock:
+        _catalog_version += 1
+        _catalog = None
+
+def _invalidate_after_commit(session) -> None:
+    session.info.pop("_shop_catalog_invalidate", None)
+    invalidate_shop_catalog()
+
+def invalidate_shop_catalog_on_commit(session: Session) -> None:
+    """
+    Call from catalog write paths. Bumps the version now (so in-flight loads are
+    discarded) and again once the transaction commits (so a load that read the
+    pre-commit rows in between is not served).
+    """
+    invalidate_shop_catalog()
+    if not session.info.get("_shop_catalog_invalidate"):
+        session.info["_shop_catalog_invalidate"] = True
+        sa_event.listen(session, "after_commit", _invalidate_after_commit, once=True)
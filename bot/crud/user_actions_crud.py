@@ -31,4 +31,7 @@ def insert_user_action(
     )
     session.add(ua)
     session.flush()
-    return ua
\ No newline at end of file
+    return ua
+
+def count_user_actions(session: Session, user_id: int) -> int:
+    return session.query(UserAction).filter(UserAction.user_id == user_id).count()
@@ -15,12 +15,3 @@ def get_or_create_user_event_data(
     session.add(ued)
     session.flush()
     return ued
-
-def add_points_to_user_event_data(session: Session, *, user_id: int, event_id: int, delta_points: int) -> None:
-    if not delta_points:
-        return
-    ued = session.query(UserEventData).filter(UserEventData.user_id == user_id, UserEventData.event_id == event_id).first()
-    if not ued:
-        return  # caller must ensure creation first
-    ued.points_earned = (ued.points_earned or 0) + delta_points
-    session.flush()
\ No newline at end of file
@@ -0,0 +1,230 @@
+# bot/crud/user_event_progress_crud.py
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from db.schema import UserAction, UserActionPrompt, UserEventProgress
+from bot.utils.formatting import now_iso
+
+# ---------------------------------------------------------------------------
+# Decoding helpers (JSON columns -> python)
+# ---------------------------------------------------------------------------
+
+def progress_action_counts(prog: UserEventProgress) -> Dict[int, int]:
+    return {int(k): int(v) for k, v in json.loads(prog.action_counts_json or "{}").items()}
+
+def progress_prompt_counts(prog: UserEventProgress) -> Dict[int, int]:
+    return {int(k): int(v) for k, v in json.loads(prog.prompt_counts_json or "{}").items()}
+
+def progress_participation_days(prog: UserEventProgress) -> Set[date]:
+    return {date.fromisoformat(d) for d in json.loads(prog.participation_days_json or "[]")}
+
+def day_of(created_at) -> Optional[date]:
+    """Civil (UTC) day of a user_actions.created_at value (datetime, or ISO string before flush)."""
+    if not created_at:
+        return None
+    if isinstance(created_at, datetime):
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        return created_at.date()
+    if isinstance(created_at, date):
+        return created_at
+    s = str(created_at)
+    try:
+        if len(s) == 10 and s[4] == "-" and s[7] == "-":
+            return date.fromisoformat(s)
+        return day_of(datetime.fromisoformat(s))
+    except ValueError:
+        return None
+
+def _ending_streak(days: Set[date]) -> int:
+    if not days:
+        return 0
+    cur = max(days)
+    length = 1
+    while cur - timedelta(days=1) in days:
+        cur -= timedelta(days=1)
+        length += 1
+    return length
+
+def _store_days(prog: UserEventProgress, days: Set[date]) -> None:
+    prog.participation_days_json = json.dumps(sorted(d.isoformat() for d in days))
+    prog.participation_day_count = len(days)
+    prog.last_participation_day = max(days).isoformat() if days else None
+    prog.current_streak = _ending_streak(days)
+
+def _store_prompt_counts(prog: UserEventProgress, counts: Dict[int, int]) -> None:
+    counts = {pid: c for pid, c in counts.items() if c > 0}
+    prog.prompt_counts_json = json.dumps({str(k): v for k, v in counts.items()})
+    prog.distinct_prompt_count = len(counts)
+
+# ---------------------------------------------------------------------------
+# Read / rebuild
+# ---------------------------------------------------------------------------
+
+def get_user_event_progress(
+    session: Session, user_id: int, event_id: int, *, for_update: bool = False
+) -> Optional[UserEventProgress]:
+    q = session.query(UserEventProgress).filter(
+        UserEventProgress.user_id == user_id, UserEventProgress.event_id == event_id
+    )
+    if for_update:
+        q = q.with_for_update()
+    return q.first()
+
+def _lock_progress_row(session: Session, user_id: int, event_id: int) -> UserEventProgress:
+    """
+    Make sure the (user, event) row exists and lock it. Two first reports racing
+    on a missing row both insert with ON CONFLICT DO NOTHING, so neither fails on
+    uix_user_event_progress; the second then waits on the row lock.
+    """
+    session.execute(
+        pg_insert(UserEventProgress)
+        .values(user_id=user_id, event_id=event_id, updated_at=now_iso())
+        .on_conflict_do_nothing(index_elements=["user_id", "event_id"])
+    )
+    return (
+        session.query(UserEventProgress)
+        .filter(UserEventProgress.user_id == user_id, UserEventProgress.event_id == event_id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
+
+def rebuild_user_event_progress(session: Session, user_id: int, event_id: int) -> UserEventProgress:
+    """
+    Recompute every counter for (user, event) from user_actions / user_action_prompts.
+    Creates the row when missing, overwrites it otherwise. The row is locked
+    before history is read, so a concurrent report is either counted here or
+    waits and increments the rebuilt row.
+    """
+    prog = _lock_progress_row(session, user_id, event_id)
+
+    action_counts = dict(
+        session.query(UserAction.action_event_id, func.count(UserAction.id))
+        .filter(UserAction.user_id == user_id, UserAction.event_id == event_id)
+        .group_by(UserAction.action_event_id)
+        .all()
+    )
+    prompt_counts = dict(
+        session.query(UserActionPrompt.event_prompt_id, func.count(UserActionPrompt.id))
+        .join(UserAction, UserAction.id == UserActionPrompt.user_action_id)
+        .filter(UserAction.user_id == user_id, UserAction.event_id == event_id)
+        .group_by(UserActionPrompt.event_prompt_id)
+        .all()
+    )
+    days: Set[date] = set()
+    for (ca,) in (
+        session.query(UserAction.created_at)
+        .filter(UserAction.user_id == user_id, UserAction.event_id == event_id)
+        .distinct()
+    ):
+        d = day_of(ca)
+        if d:
+            days.add(d)
+
+    prog.report_count = sum(int(c) for c in action_counts.values())
+    prog.action_counts_json = json.dumps({str(k): int(v) for k, v in action_counts.items()})
+    _store_prompt_counts(prog, {int(k): int(v) for k, v in prompt_counts.items()})
+    _store_days(prog, days)
+    prog.updated_at = now_iso()
+    session.flush()
+    return prog
+
+def get_or_rebuild_user_event_progress(
+    session: Session, user_id: int, event_id: int, *, for_update: bool = False
+) -> UserEventProgress:
+    """Counters for (user, event); rows missing (pre-existing history) are rebuilt lazily."""
+    prog = get_user_event_progress(session, user_id, event_id, for_update=for_update)
+    if prog:
+        return prog
+    return rebuild_user_event_progress(session, user_id, event_id)
+
+def rebuild_all_user_event_progress(session: Session, event_id: Optional[int] = None) -> int:
+    """Rebuild counters for every (user, event) pair with reports. Returns the number of rows rebuilt."""
+    q = session.query(UserAction.user_id, UserAction.event_id).filter(UserAction.event_id.isnot(None))
+    if event_id is not None:
+        q = q.filter(UserAction.event_id == event_id)
+    pairs = q.distinct().all()
+    for uid, eid in pairs:
+        rebuild_user_event_progress(session, uid, eid)
+    return len(pairs)
+
+# ---------------------------------------------------------------------------
+# Incremental updates
+# ---------------------------------------------------------------------------
+
+def record_action_in_progress(
+    session: Session, *, user_id: int, event_id: int, action_event_id: int, created_at
+) -> UserEventProgress:
+    """
+    Count one new report. Call after the user_actions row is flushed: when the
+    progress row does not exist yet, it is rebuilt from history (which already
+    includes the new report) instead of incremented.
+    """
+    prog = get_user_event_progress(session, user_id, event_id, for_update=True)
+    if not prog:
+        return rebuild_user_event_progress(session, user_id, event_id)
+
+    prog.report_count = (prog.report_count or 0) + 1
+
+    counts = progress_action_counts(prog)
+    counts[int(action_event_id)] = counts.get(int(action_event_id), 0) + 1
+    prog.action_counts_json = json.dumps({str(k): v for k, v in counts.items()})
+
+    d = day_of(created_at)
+    last = date.fromisoformat(prog.last_participation_day) if prog.last_participation_day else None
+    if d and d != last:
+        if last is None or d > last:
+            days_json = json.loads(prog.participation_days_json or "[]")
+            days_json.append(d.isoformat())
+            prog.participation_days_json = json.dumps(days_json)
+            prog.participation_day_count = len(days_json)
+            prog.current_streak = (prog.current_streak or 0) + 1 if last and d == last + timedelta(days=1) else 1
+            prog.last_participation_day = d.isoformat()
+        else:
+            # back-dated report: rare, recompute the day-derived counters
+            days = progress_participation_days(prog)
+            days.add(d)
+            _store_days(prog, days)
+
+    prog.updated_at = now_iso()
+    session.flush()
+    return prog
+
+def record_prompt_selection_in_progress(
+    session: Session,
+    *,
+    user_action_id: int,
+    old_prompt_ids: Iterable[int],
+    new_prompt_ids: Iterable[int],
+) -> Optional[UserEventProgress]:
+    """Apply the delta of a prompt re-selection on one report to its (user, event) counters."""
+    ua = session.get(UserAction, user_action_id)
+    if not ua or ua.event_id is None:
+        return None
+
+    prog = get_user_event_progress(session, ua.user_id, ua.event_id, for_update=True)
+    if not prog:
+        return rebuild_user_event_progress(session, ua.user_id, ua.event_id)
+
+    old_set = {int(p) for p in old_prompt_ids}
+    new_set = {int(p) for p in new_prompt_ids}
+    if old_set == new_set:
+        return prog
+
+    counts = progress_prompt_counts(prog)
+    for pid in old_set - new_set:
+        counts[pid] = counts.get(pid, 0) - 1
+    for pid in new_set - old_set:
+        counts[pid] = counts.get(pid, 0) + 1
+    _store_prompt_counts(prog, counts)
+    prog.updated_at = now_iso()
+    session.flush()
+    return prog
@@ -1,7 +1,11 @@
 # bot/crud/users_crud.py
-from sqlalchemy import or_
+import os
+import time
+from sqlalchemy import or_, event as sa_event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterable, Optional, Tuple
+from bot.utils.cache import LRUCache
 from bot.utils.time_parse_paginate import now_iso
 from db.schema import User, Action, UserAction, ActionEvent
 
@@ -12,57 +16,134 @@ def get_user_by_discord_id(session: Session, user_discord_id: str) -> User | Non
         .first()
     )
 
-def create_user_from_member(session: Session, member) -> User:
-    user = User(
+# ---------------------------------------------------------------------------
+# Identity sync
+# ---------------------------------------------------------------------------
+# Every command resolves the invoking member to a users row. The cache maps
+# discord id -> (users.id, identity fingerprint), so the common case (known
+# member, same names) needs no query at all; the upsert only runs for new
+# members, changed names, or expired entries. Entries are published after
+# commit, so a rolled-back creation never leaves a dangling id behind.
+
+USER_IDENTITY_CACHE_SIZE = int(os.getenv("USER_IDENTITY_CACHE_SIZE", "2048"))
+USER_IDENTITY_CACHE_TTL = float(os.getenv("USER_IDENTITY_CACHE_TTL", "900"))     # seconds
+
+_identity_cache = LRUCache(maxsize=USER_IDENTITY_CACHE_SIZE, name="user_identity")
+
+def identity_fingerprint(member) -> Tuple[str, str, Optional[str]]:
+    """(username, display_name, nickname) as stored on users."""
+    username = member.name
+    display = getattr(member, "display_name", None) or getattr(member, "global_name", None) or member.name
+    return username, display, getattr(member, "nick", None)
+
+def invalidate_user_identity(user_discord_id: Optional[str] = None) -> None:
+    """Forget one member (or everyone); the next lookup re-syncs from the DB."""
+    if user_discord_id is None:
+        _identity_cache.clear()
+    else:
+        _identity_cache.pop(str(user_discord_id))
+
+def _publish_after_commit(session) -> None:
+    for discord_id, entry in session.info.pop("_user_identity_pending", {}).items():
+        _identity_cache.set(discord_id, entry)
+
+def _remember_on_commit(session: Session, discord_id: str, user_id: int, fingerprint: tuple) -> None:
+    pending = session.info.setdefault("_user_identity_pending", {})
+    if not pending:
+        sa_event.listen(session, "after_commit", _publish_after_commit, once=True)
+    pending[discord_id] = (user_id, fingerprint, time.monotonic() + USER_IDENTITY_CACHE_TTL)
+
+def upsert_user_identity(session: Session, member) -> Tuple[int, bool]:
+    """
+    Create the user or refresh its names in one INSERT ... ON CONFLICT DO UPDATE.
+    The update only fires when a name actually changed. Returns (users.id, written).
+    """
+    username, display, nick = identity_fingerprint(member)
+    now = now_iso()
+    ins = pg_insert(User).values(
         user_discord_id=str(member.id),
-        username=member.name,
-        display_name=getattr(member, "display_name", None) or getattr(member, "global_name", None) or member.name,
-        nickname=getattr(member, "nick", None),
+        username=username,
+        display_name=display,
+        nickname=nick,
         points=0,
         total_earned=0,
         total_spent=0,
-        created_at=now_iso(),
-        modified_at=None,
+        created_at=now,
     )
-    session.add(user)
+    stmt = ins.on_conflict_do_update(
+        index_elements=[User.user_discord_id],
+        set_={
+            "username": ins.excluded.username,
+            "display_name": ins.excluded.display_name,
+            "nickname": ins.excluded.nickname,
+            "modified_at": now,
+        },
+        where=or_(
+            User.username.is_distinct_from(ins.excluded.username),
+            User.display_name.is_distinct_from(ins.excluded.display_name),
+            User.nickname.is_distinct_from(ins.excluded.nickname),
+        ),
+    ).returning(User.id)
+
     session.flush()
-    return user
+    user_id = session.execute(stmt).scalar()
+    if user_id is not None:
+        return user_id, True
+    # conflict with unchanged names: nothing written, nothing returned
+    return session.execute(select(User.id).where(User.user_discord_id == str(member.id))).scalar_one(), False
 
-def update_user_identity_if_changed(session: Session, user: User, member) -> bool:
-    changed = False
-    new_username = member.name
-    new_display  = getattr(member, "display_name", None) or getattr(member, "global_name", None) or member.name
-    new_nick     = getattr(member, "nick", None)
-
-    if user.username != new_username:
-        user.username = new_username; changed = True
-    if user.display_name != new_display:
-        user.display_name = new_display; changed = True
-    if user.nickname != new_nick:
-        user.nickname = new_nick; changed = True
-
-    if changed:
-        user.modified_at = now_iso()
-        session.flush()
-    return changed
+def _resolve_user_id(session: Session, member) -> Tuple[int, bool]:
+    discord_id = str(member.id)
+    fingerprint = identity_fingerprint(member)
+    entry = _identity_cache.get(discord_id)
+    if entry is not None and entry[1] == fingerprint and entry[2] > time.monotonic():
+        return entry[0], False
+    user_id, written = upsert_user_identity(session, member)
+    _remember_on_commit(session, discord_id, user_id, fingerprint)
+    return user_id, written
+
+def get_or_create_user_id(session: Session, member) -> int:
+    """users.id of the member, creating/syncing the row only when the cache says so."""
+    return _resolve_user_id(session, member)[0]
 
 def get_or_create_user(session: Session, member) -> User:
-    user = get_user_by_discord_id(session, str(member.id))
-    if not user:
-        user = create_user_from_member(session, member)
-    else:
-        update_user_identity_if_changed(session, user, member)
-    return user
+    user_id, written = _resolve_user_id(session, member)
+    # the upsert bypassed the identity map: refresh a copy this session already holds
+    return session.get(User, user_id, populate_existing=written)
 
-def add_points_to_user(session: Session, user_id: int, delta_points: int) -> None:
-    if not delta_points:
-        return
-    user = session.query(User).get(user_id)
-    if not user:
-        return
-    user.points = (user.points or 0) + delta_points
-    user.total_earned = (user.total_earned or 0) + delta_points
-    session.flush()
+def sync_user_identities(session: Session, members: Iterable) -> int:
+    """
+    Batch-apply name changes of members that already have a users row (no creation).
+    Returns the number of rows updated. Let caller commit.
+    """
+    changed = 0
+    for member in members:
+        discord_id = str(member.id)
+        fingerprint = identity_fingerprint(member)
+        username, display, nick = fingerprint
+        user_id = session.execute(
+            User.__table__.update()
+            .where(
+                User.user_discord_id == discord_id,
+                or_(
+                    User.username.is_distinct_from(username),
+                    User.display_name.is_distinct_from(display),
+                    User.nickname.is_distinct_from(nick),
+                ),
+            )
+            .values(username=username, display_name=display, nickname=nick, modified_at=now_iso())
+            .returning(User.id)
+        ).scalar()
+        if user_id is not None:
+            changed += 1
+            _remember_on_commit(session, discord_id, user_id, fingerprint)
+        else:
+            # unknown member, or names already current: drop any stale fingerprint
+            _identity_cache.pop(discord_id)
+    return changed
+
+def get_user_points(session: Session, user_id: int) -> int:
+    return session.query(User.points).filter(User.id == user_id).scalar() or 0
 
 # ------------------------------
 
@@ -89,6 +170,7 @@ def update_user(
             setattr(user, key, value)
 
     user.modified_at = iso_now
+    invalidate_user_identity(user_discord_id)
     
     return user
  
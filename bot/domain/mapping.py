@@ -23,6 +23,10 @@ from bot.domain.dto import (
 )
 from bot.utils.parsing import parse_required_fields, parse_help_texts, parse_json_field
 
+def _iso(v):
+    """DTOs keep dates/timestamps as ISO text; DATE/TIMESTAMPTZ columns load as date/datetime."""
+    return v.isoformat() if hasattr(v, "isoformat") else v
+
 def user_to_dto(u: UserModel) -> UserDTO:
     return UserDTO(
         id=u.id, 
@@ -42,8 +46,8 @@ def event_to_dto(ev: EventModel) -> EventDTO:
         event_name=ev.event_name,
         event_type=ev.event_type,
         event_description=ev.event_description,
-        start_date=ev.start_date,
-        end_date=ev.end_date,
+        start_date=_iso(ev.start_date),
+        end_date=_iso(ev.end_date),
         coordinator_discord_id=ev.coordinator_discord_id,
         priority=ev.priority or 0,
         tags=ev.tags,
@@ -138,5 +142,5 @@ def to_user_event_trigger_log_dto(uetl: UserEventTriggerLogModel) -> UserEventTr
         id=uetl.id,
         user_id=uetl.user_id,
         event_trigger_id=uetl.event_trigger_id,
-        granted_at=uetl.granted_at,
+        granted_at=_iso(uetl.granted_at),
     )
\ No newline at end of file
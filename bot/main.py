@@ -7,6 +7,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from bot.utils.command_tree import InstrumentedCommandTree
+
 # ---------------- Single-instance guard (robust) ----------------
 import fcntl
 
@@ -21,16 +23,15 @@ except BlockingIOError:
     sys.exit(1)
 
 # ---------------- Optional: quick preflight to avoid 429 loops ----------------
-import aiohttp
+from bot.utils.http_client import get_http_client, start_http_client, close_http_client
 
 async def discord_preflight() -> bool:
     try:
-        async with aiohttp.ClientSession() as s:
-            async with s.get("https://discord.com/api/v10") as r:
-                if r.status == 429:
-                    ra = r.headers.get("retry-after")
-                    logging.error(f"Cloudflare rate-limited host IP (429). retry-after={ra}")
-                    return False
+        async with get_http_client().get("https://discord.com/api/v10") as r:
+            if r.status == 429:
+                ra = r.headers.get("retry-after")
+                logging.error(f"Cloudflare rate-limited host IP (429). retry-after={ra}")
+                return False
     except Exception as e:
         logging.warning(f"Preflight check failed: {e}")
     return True
@@ -38,6 +39,31 @@ async def discord_preflight() -> bool:
 # ---------------- Bot definition ----------------
 class MyBot(commands.Bot):
     async def setup_hook(self):
+        # Shared keep-alive HTTP client (avatars, emojis)
+        await start_http_client()
+
+        # Interaction latency metrics, loop-lag probe, /metrics when METRICS_PORT is set
+        try:
+            from bot.utils.metrics import start_metrics_server, METRICS_HOST, METRICS_PORT
+            if await start_metrics_server():
+                print(f"✅ Metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except Exception as e:
+            print(f"❌ Failed to start metrics server: {e}")
+
+        # asyncio debug-mode slow-callback capture (/admin_slow_callbacks), when configured
+        from bot.utils.profiler import ASYNCIO_SLOW_CALLBACK_MS, set_slow_callback_detection
+        if ASYNCIO_SLOW_CALLBACK_MS > 0:
+            set_slow_callback_detection(asyncio.get_running_loop(), ASYNCIO_SLOW_CALLBACK_MS)
+            print(f"✅ Slow loop callbacks over {ASYNCIO_SLOW_CALLBACK_MS:.0f} ms are recorded")
+
+        # Decode profile card fonts/background/icons once, off the loop
+        try:
+            from bot.ui.renderers.profile_card import preload_profile_card_assets
+            await preload_profile_card_assets()
+            print("✅ Loaded profile card assets")
+        except Exception as e:
+            print(f"❌ Failed to preload profile card assets: {e}")
+
         # Load all cogs first
         admin_cogs = [
             "bot.commands.admin.events_admin",
@@ -50,6 +76,7 @@ class MyBot(commands.Bot):
             "bot.cogs.admin.prompts_cog",
             "bot.cogs.admin.event_triggers_cog",
             "bot.cogs.admin.reporting_cog",
+            "bot.cogs.admin.diagnostics_cog",
         ]
         for cog in admin_cogs:
             try:
@@ -63,6 +90,7 @@ class MyBot(commands.Bot):
             "bot.cogs.user.profile_cog",
             "bot.cogs.user.event_cog",
             "bot.commands.user.use",
+            "bot.cogs.user.identity_sync_cog",
         ]
         for cog in user_cogs:
             try:
@@ -77,7 +105,7 @@ intents.members = True
 intents.guilds = True
 intents.message_content = True  # if truly needed
 
-bot = MyBot(command_prefix="!", intents=intents)
+bot = MyBot(command_prefix="!", intents=intents, tree_cls=InstrumentedCommandTree)
 
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
@@ -114,6 +142,7 @@ async def main():
 
     # Optional preflight to avoid hammering when IP is blocked
     if not await discord_preflight():
+        await close_http_client()
         return
 
     try:
@@ -124,6 +153,25 @@ async def main():
             await bot.close()
         except Exception:
             pass
+        try:
+            await close_http_client()
+        except Exception:
+            pass
+        try:
+            from bot.utils.metrics import stop_metrics_server
+            await stop_metrics_server()
+        except Exception:
+            pass
+        try:
+            from db.database import db_executor
+            db_executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
+        try:
+            from bot.ui.renderers.profile_card import render_executor
+            render_executor.shutdown(wait=False, cancel_futures=True)
+        except Exception:
+            pass
         try:
             fcntl.flock(_lock_fd, fcntl.LOCK_UN)
             os.close(_lock_fd)
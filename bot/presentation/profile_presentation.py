@@ -1,15 +1,21 @@
 # bot/presentation/profile_presentation.py
+import asyncio
+import io
+import os
 from dataclasses import dataclass
 from typing import Optional
-import aiohttp
 from discord import File
 
+from bot.utils.cache import LRUCache, digest, disk_cache_from_env
 from bot.utils.discord_helpers import resolve_display_name
+from bot.utils.emoji import is_custom_emoji
+from bot.utils.http_client import get_http_client
 from db.database import db_session
 
 # UI
+from bot.ui.renderers.avatar_loader import load_avatar_tile
 from bot.ui.renderers.badge_loader import extract_badge_icons
-from bot.ui.renderers.profile_card import generate_profile_card
+from bot.ui.renderers.profile_card import RENDERER_VERSION, generate_profile_card, run_render
 
 # SERVICES
 from bot.services.users_service import get_or_create_user_dto
@@ -30,6 +36,12 @@ class ProfileVM:
 
 # --- Formatters --------------------------------------------------------------
 
+AVATAR_FETCH_SIZE = 128  # CDN power of two just above the 120px circle on the card
+
+def profile_avatar_url(member) -> str:
+    """Small static PNG of the member's avatar instead of the full-resolution (possibly animated) one."""
+    return member.display_avatar.replace(size=AVATAR_FETCH_SIZE, static_format="png").url
+
 def fetch_profile_vm(target_member) -> ProfileVM:
     """Fetch a ProfileVM for a given member — DTO-only, no ORM rows returned."""
     with db_session() as dbs:
@@ -41,22 +53,76 @@ def fetch_profile_vm(target_member) -> ProfileVM:
             total_earned=user.total_earned,
             title_text=get_equipped_title_name(dbs, user.id),
             badge_emojis=get_equipped_badge_emojis(dbs, user.id),
-            avatar_url=target_member.display_avatar.url,
+            avatar_url=profile_avatar_url(target_member),
         )
 
-async def build_profile_file_and_name(vm: ProfileVM) -> tuple[File, str]:
-    """Generate a profile card image and return it as a File, along with the display name."""
-    async with aiohttp.ClientSession() as http:
-        badge_icons = await extract_badge_icons(vm.badge_emojis, session=http)
-        async with http.get(vm.avatar_url) as resp:
-            avatar_bytes = await resp.read()
+# --- Rendered card cache -----------------------------------------------------
+# Cards are a pure function of the VM fields below (+ renderer version), so an
+# unchanged profile is served without downloading or drawing anything.
 
-    buf = generate_profile_card(
-        avatar_bytes,
+_card_cache = LRUCache(maxsize=int(os.getenv("PROFILE_CARD_CACHE_SIZE", "256")), name="profile_cards")
+# keys change with every points change, so the disk tier is bounded (files / age)
+_card_disk = disk_cache_from_env(
+    "PROFILE_CARD_CACHE_DIR",
+    suffix=".png",
+    max_files=int(os.getenv("PROFILE_CARD_DISK_MAX_FILES", "5000")),
+    max_age=float(os.getenv("PROFILE_CARD_DISK_MAX_AGE_DAYS", "30")) * 86400,
+)
+
+def profile_card_key(vm: ProfileVM) -> str:
+    return digest(
+        RENDERER_VERSION,
+        vm.avatar_url,
         vm.display_name,
         vm.points,
         vm.total_earned,
         vm.title_text,
-        badge_icons,
+        tuple(vm.badge_emojis),
     )
-    return File(fp=buf, filename="profile.png"), vm.display_name
\ No newline at end of file
+
+def _render_and_persist(key: Optional[str], *args) -> bytes:
+    data = generate_profile_card(*args).getvalue()
+    if _card_disk and key is not None:
+        _card_disk.set(key, data)
+    return data
+
+def _has_badge_fallback(vm: ProfileVM, badge_icons: list) -> bool:
+    """A custom emoji badge came back as text (CDN failure): the card is degraded, don't cache it."""
+    return any(isinstance(icon, str) and is_custom_emoji(emoji) for emoji, icon in zip(vm.badge_emojis, badge_icons))
+
+async def render_profile_card(vm: ProfileVM) -> io.BytesIO:
+    """Card PNG for vm: memory cache, then disk cache, then fetch icons + draw on the render executor."""
+    key = profile_card_key(vm)
+    data = _card_cache.get(key)
+    if data is None and _card_disk:
+        data = await run_render(_card_disk.get, key)
+
+    cacheable = True
+    if data is None:
+        http = get_http_client()
+        badge_icons, avatar_tile = await asyncio.gather(
+            extract_badge_icons(vm.badge_emojis, session=http),
+            load_avatar_tile(vm.avatar_url, session=http),
+        )
+        # badge fetches are retried on the next render; keep the degraded card out of both caches
+        cacheable = not _has_badge_fallback(vm, badge_icons)
+
+        data = await run_render(
+            _render_and_persist,
+            key if cacheable else None,
+            avatar_tile,
+            vm.display_name,
+            vm.points,
+            vm.total_earned,
+            vm.title_text,
+            badge_icons,
+        )
+
+    if cacheable:
+        _card_cache.set(key, data)
+    return io.BytesIO(data)
+
+async def build_profile_file_and_name(vm: ProfileVM) -> tuple[File, str]:
+    """Generate a profile card image and return it as a File, along with the display name."""
+    buf = await render_profile_card(vm)
+    return File(fp=buf, filename="profile.png"), vm.display_name
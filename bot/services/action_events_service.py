@@ -10,7 +10,7 @@ from bot.domain.mapping import to_action_event_dto
 from bot.crud.action_events_crud import list_self_reportable_action_events_for_event, user_already_completed_non_repeatable, list_action_events_for_event, get_action_event_bundle
 
 from bot.services.events_service import get_event_is_open_for_action
-from bot.services.users_service import get_or_create_user_dto
+from bot.crud.users_crud import get_or_create_user_id
 
 def list_user_doable_action_events(
     session: Session,
@@ -22,7 +22,7 @@ def list_user_doable_action_events(
     CRUD enforces: Action active, is_self_reportable.
     Service enforces: event status gating + repeatability.
     """
-    user = get_or_create_user_dto(session, member)
+    user_id = get_or_create_user_id(session, member)
 
     rows = list_self_reportable_action_events_for_event(session, event_id)
     out: list[ActionEventDTO] = []
@@ -33,7 +33,7 @@ def list_user_doable_action_events(
                 ev, allowed_during_visible=ae.is_allowed_during_visible):
             continue
         if not dto.is_repeatable:
-            if user_already_completed_non_repeatable(session, user.id, dto.id):
+            if user_already_completed_non_repeatable(session, user_id, dto.id):
                 continue
         out.append(dto)
 
@@ -3,11 +3,9 @@ from __future__ import annotations
 
 import json
 from typing import Iterable, Optional, Tuple, Dict, Any, Set, List, Callable 
-from sqlalchemy import func
 
 from sqlalchemy.orm import Session
 from collections import defaultdict
-from datetime import datetime, date, timedelta
 from db.database import db_session
 from bot.crud.event_triggers_crud import (
     create_event_trigger,
@@ -19,6 +17,7 @@ from bot.crud.event_triggers_crud import (
     delete_event_trigger,
     log_event_trigger_grant,
     has_user_event_trigger_log,
+    get_granted_trigger_ids,
 )
 from bot.crud.events_crud import get_event_by_id
 from bot.crud.users_crud import get_or_create_user
@@ -28,16 +27,23 @@ from bot.domain.mapping import (
 )
 from db.schema import (
     Event, EventTrigger, RewardEvent, Reward, Inventory, UserAction,
-    UserEventData, User, EventPrompt, UserActionPrompt  # add EventPrompt, UserActionPrompt
+    UserEventData, User,
 )
 from bot.services.users_service import get_or_create_user_dto
 from bot.services.events_service import get_event_dto_by_id
 
 from bot.utils.formatting import now_iso
-from bot.utils.discord_helpers import format_trigger_label
+from bot.services.trigger_rules_cache import TriggerConfig, get_compiled_triggers, invalidate_trigger_rules
 from bot.config import CURRENCY
-from bot.crud.users_crud import add_points_to_user
-from bot.crud.user_event_data_crud import add_points_to_user_event_data
+from bot.crud.points_ledger_crud import record_points
+from bot.crud.user_event_data_crud import get_or_create_user_event_data
+from bot.crud.prompts_crud import get_prompt_ids_for_user_action, get_prompt_index_for_event
+from bot.crud.user_actions_crud import count_user_actions
+from bot.crud.user_event_progress_crud import (
+    get_or_rebuild_user_event_progress,
+    progress_action_counts,
+    progress_prompt_counts,
+)
 
 def apply_triggers_after_action_id(
     user_action_id: int,
@@ -74,16 +80,29 @@ def create_event_trigger_service(create_data: dict):
         if existing:
             raise ValueError("⚠️ A trigger with the same type and config already exists for this event.")
         trigger = create_event_trigger(session, create_data)
-        return to_event_trigger_dto(trigger)
+        dto = to_event_trigger_dto(trigger)
+    invalidate_trigger_rules(dto.event_id)
+    return dto
 
 def update_event_trigger_service(trigger_id: int, update_data: dict):
     with db_session() as session:
+        before = get_event_trigger_by_id(session, trigger_id)
+        old_event_id = before.event_id if before else None
         trigger = update_event_trigger(session, trigger_id, update_data)
-        return to_event_trigger_dto(trigger) if trigger else None
+        dto = to_event_trigger_dto(trigger) if trigger else None
+    invalidate_trigger_rules(old_event_id)
+    if dto and dto.event_id != old_event_id:
+        invalidate_trigger_rules(dto.event_id)
+    return dto
 
 def delete_event_trigger_service(trigger_id: int) -> bool:
     with db_session() as session:
-        return delete_event_trigger(session, trigger_id)
+        trigger = get_event_trigger_by_id(session, trigger_id)
+        event_id = trigger.event_id if trigger else None
+        deleted = delete_event_trigger(session, trigger_id)
+    if deleted:
+        invalidate_trigger_rules(event_id)
+    return deleted
 
 def get_event_triggers_service(event_id: int) -> list:
     with db_session() as session:
@@ -252,7 +271,8 @@ def link_grant_to_trigger(
             "points": grant_points,              # int | None
             "warnings": warnings,
         }
-        return summary
+    invalidate_trigger_rules(event_id)
+    return summary
     
 def _derive_trigger_label(trigger_obj) -> str:
     """
@@ -296,33 +316,30 @@ def check_and_apply_triggers_for_action(
     Returns a list of fully formatted lines, e.g.:
       ["🎉 Do Y prompt X times: 🏅 badge - Name", "🎉 Submit X prompts in one report: ⭐ 50 vlachki"]
     """
-    triggers = get_event_triggers_for_event(session, event.id)
+    # Parsed rules + labels come from the per-event cache (invalidated on trigger/prompt edits)
+    triggers = get_compiled_triggers(session, event.id)
+    if not triggers:
+        return []
+
+    # Skip triggers already granted to this user (one lookup for all of them)
+    granted_ids = get_granted_trigger_ids(session, user.id, [t.id for t in triggers])
+    triggers = [t for t in triggers if t.id not in granted_ids]
     if not triggers:
         return []
+    pending_types = {t.trigger_type for t in triggers}
 
     # ---- Precompute / context shared by all evaluators
-    all_actions: List[UserAction] = (
-        session.query(UserAction)
-        .filter(UserAction.user_id == user.id, UserAction.event_id == event.id)
-        .all()
-    )
-    if current_action not in all_actions:
-        all_actions.append(current_action)
+    # Historical counters come from user_event_progress (kept up to date on
+    # report / prompt selection) instead of rescanning the user's history.
+    progress = get_or_rebuild_user_event_progress(session, user.id, event.id)
+    per_prompt_counts = progress_prompt_counts(progress)
 
     # Current submission prompts
     if current_prompts is None:
-        current_prompt_set = _get_prompts_for_action(session, current_action.id)
+        current_prompt_set = get_prompt_ids_for_user_action(session, current_action.id)
     else:
         current_prompt_set = {int(p) for p in current_prompts}
 
-    # Historical prompt stats
-    distinct_prompt_ids, per_prompt_counts = _aggregate_user_prompts(
-        session, [ua.id for ua in all_actions]
-    )
-
-    # Participation days set (for streak, participation_days)
-    participation_days = _collect_participation_days(all_actions)
-
     # Event points earned so far (before this trigger pass)
     ued = (
         session.query(UserEventData)
@@ -332,17 +349,30 @@ def check_and_apply_triggers_for_action(
     points_earned_in_event = ued.points_earned if ued else 0
 
     ctx: Dict[str, Any] = {
-        "all_actions": all_actions,
-        "current_prompts": current_prompt_set,         # set[int] of EventPrompt IDs
-        "distinct_prompts": distinct_prompt_ids,       # set[int]
-        "per_prompt_counts": per_prompt_counts,        # {prompt_id: count}
-        "participation_days": participation_days,      # set[date]
-        "event_points_earned": points_earned_in_event, # int
+        "report_count": int(progress.report_count or 0),          # int
+        "action_counts": progress_action_counts(progress),        # {action_event_id: count}
+        "current_prompts": current_prompt_set,                    # set[int] of EventPrompt IDs
+        "distinct_prompts": set(per_prompt_counts),               # set[int]
+        "per_prompt_counts": per_prompt_counts,                   # {prompt_id: count}
+        "participation_day_count": int(progress.participation_day_count or 0),
+        "current_streak": int(progress.current_streak or 0),      # days in a row ending at last participation day
+        "event_points_earned": points_earned_in_event,            # int
         "global_points_earned": int(getattr(user, "total_earned", 0)),
+        "prompt_ids_by_code": {},                                 # {code: prompt_id}
+        "prompt_group_by_id": {},                                 # {prompt_id: lowercased group}
+        "global_report_count": 0,                                 # int, all events
     }
 
+    # Lookups needed by some evaluators, loaded once per pass (not once per trigger)
+    if pending_types & {"prompt_repeat", "prompt_unique"}:
+        for pid, code, group in get_prompt_index_for_event(session, event.id):
+            ctx["prompt_ids_by_code"][code] = pid
+            ctx["prompt_group_by_id"][pid] = (group or "").lower()
+    if "global_count" in pending_types:
+        ctx["global_report_count"] = count_user_actions(session, user.id)
+
     # Evaluators registry
-    evaluators: Dict[str, Callable[[Session, User, Event, Dict[str, Any], Dict[str, Any]], Tuple[bool, str]]] = {
+    evaluators: Dict[str, Callable[[Session, User, Event, Dict[str, Any], TriggerConfig], Tuple[bool, str]]] = {
         "prompt_count": _eval_prompt_count,
         "prompt_unique": _eval_prompt_unique,
         "prompt_repeat": _eval_prompt_repeat,
@@ -358,25 +388,19 @@ def check_and_apply_triggers_for_action(
     grant_lines: List[str] = []
 
     for trig in triggers:
-        # Skip if already granted to this user
-        if has_user_event_trigger_log(session, user.id, trig.id):
-            continue
-
-        ttype = (getattr(trig, "trigger_type", "") or "").strip()
-        cfg = _loads_json(getattr(trig, "config_json", None))
-
+        ttype = trig.trigger_type
         evaluator = evaluators.get(ttype)
         if not evaluator:
             continue  # unknown/disabled trigger type
 
-        achieved, _detail = evaluator(session, user, event, ctx, cfg)
+        achieved, _detail = evaluator(session, user, event, ctx, trig.config)
         if not achieved:
             continue
 
         grant = _apply_trigger_grant(session, user, event, trig)
         if grant:
             # Human label for the *trigger* (e.g., "Do Y prompt X times", "Submit X prompts in one report", …)
-            label = format_trigger_label(ttype, cfg, getattr(event, "id", None))
+            label = trig.label
 
             if grant.get("kind") == "points":
                 line = f"🎉 {label}: ⭐ **{int(grant['points'])}** {CURRENCY}"
@@ -411,27 +435,13 @@ def check_and_apply_triggers_for_action(
 # Each returns (achieved: bool, detail: str)
 # ---------------------------------------------------------------------------
 
-def _eval_prompt_count(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_count = _as_int(cfg.get("min_count"), default=0)
+def _eval_prompt_count(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_count = cfg.min_count
     cur = len(ctx["current_prompts"])
     ok = cur >= min_count
     return ok, f"({cur}/{min_count} prompts in one report)" if ok else ""
 
-def _normalize_group_str(cfg: Dict[str, Any]) -> Optional[str]:
-    """
-    Returns a normalized group string, or None when config means 'all groups'.
-    Accepts: None, "", "all", "*" -> None
-             otherwise: trimmed string (case preserved for messaging)
-    """
-    v = cfg.get("group", None)
-    if v is None:
-        return None
-    s = str(v).strip()
-    if s == "" or s.lower() in ("all", "*"):
-        return None
-    return s
-
-def _eval_prompt_unique(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
+def _eval_prompt_unique(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
     """
     Achieved if the user has completed at least `min_count` different prompts.
     If `group` is provided (string), only count unique prompts within that group.
@@ -440,7 +450,7 @@ def _eval_prompt_unique(session: Session, user: User, event: Event, ctx: Dict[st
     Uses ctx["distinct_prompts"] which is the set of EventPrompt IDs
     across the user's actions for this event.
     """
-    min_count = _as_int(cfg.get("min_count"), default=0)
+    min_count = cfg.min_count
     if min_count <= 0:
         return False, ""
 
@@ -448,7 +458,7 @@ def _eval_prompt_unique(session: Session, user: User, event: Event, ctx: Dict[st
     if not distinct_ids:
         return False, ""
 
-    group_str = _normalize_group_str(cfg)
+    group_str = cfg.group
 
     # All groups
     if group_str is None:
@@ -457,80 +467,69 @@ def _eval_prompt_unique(session: Session, user: User, event: Event, ctx: Dict[st
         return ok, f"({uniq}/{min_count} unique prompts)"
 
     # Group-aware: EventPrompt.group is a STRING; match case-insensitively
-    rows = (
-        session.query(EventPrompt.id)
-        .filter(
-            EventPrompt.event_id == event.id,
-            EventPrompt.id.in_(list(distinct_ids)),
-            func.lower(EventPrompt.group) == group_str.lower(),
-        )
-        .all()
-    )
-    uniq = len(rows)
+    group_by_id: Dict[int, str] = ctx["prompt_group_by_id"]
+    wanted = group_str.lower()
+    uniq = sum(1 for pid in distinct_ids if group_by_id.get(pid) == wanted)
     ok = uniq >= min_count
     return ok, f"({uniq}/{min_count} unique prompts in group {group_str})"
 
-def _eval_prompt_repeat(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    prompt_code = str(cfg.get("prompt_code") or "").strip()
-    min_count = _as_int(cfg.get("min_count"), default=0)
+def _eval_prompt_repeat(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    prompt_code = cfg.prompt_code
+    min_count = cfg.min_count
     if not prompt_code or min_count <= 0:
         return False, ""
 
-    ep = (
-        session.query(EventPrompt)
-        .filter_by(event_id=event.id, code=prompt_code)
-        .first()
-    )
-    if not ep:
+    prompt_id = ctx["prompt_ids_by_code"].get(prompt_code)
+    if prompt_id is None:
         return False, ""
 
-    count_for_prompt = ctx["per_prompt_counts"].get(ep.id, 0)
+    count_for_prompt = ctx["per_prompt_counts"].get(prompt_id, 0)
     ok = count_for_prompt >= min_count
     return ok, f"(prompt {prompt_code} {count_for_prompt}/{min_count} times)" if ok else ""
 
-def _eval_streak(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_days = _as_int(cfg.get("min_days"), default=0)
-    if min_days <= 0 or not ctx["participation_days"]:
+def _eval_streak(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_days = cfg.min_days
+    if min_days <= 0 or not ctx["participation_day_count"]:
         return False, ""
-    streak_len = _ending_streak_length(ctx["participation_days"])
+    streak_len = ctx["current_streak"]
     ok = streak_len >= min_days
     return ok, f"({streak_len}/{min_days} days in a row)" if ok else ""
 
-def _eval_event_count(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_reports = _as_int(cfg.get("min_reports"), default=0)
-    total = len(ctx["all_actions"])
+def _eval_event_count(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_reports = cfg.min_reports
+    total = ctx["report_count"]
     ok = total >= min_reports
     return ok, f"({total}/{min_reports} reports)" if ok else ""
 
-def _eval_action_repeat(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    ae_id = _as_int(cfg.get("action_event_id"), default=0)
-    min_count = _as_int(cfg.get("min_count"), default=0)
+def _eval_action_repeat(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    ae_id = cfg.action_event_id
+    min_count = cfg.min_count
     if ae_id <= 0 or min_count <= 0:
         return False, ""
-    count = sum(1 for ua in ctx["all_actions"] if int(getattr(ua, "action_event_id", 0)) == ae_id)
+    count = ctx["action_counts"].get(ae_id, 0)
     ok = count >= min_count
     return ok, f"(action {ae_id} {count}/{min_count} times)" if ok else ""
 
-def _eval_points_won(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_points = _as_int(cfg.get("min_points"), default=0)
+def _eval_points_won(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_points = cfg.min_points
     earned = int(ctx["event_points_earned"])
     ok = earned >= min_points
     return ok, f"({earned}/{min_points} points)" if ok else ""
 
-def _eval_participation_days(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_days = _as_int(cfg.get("min_days"), default=0)
-    days = len(ctx["participation_days"])
+def _eval_participation_days(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_days = cfg.min_days
+    days = ctx["participation_day_count"]
     ok = days >= min_days
     return ok, f"({days}/{min_days} days)" if ok else ""
 
-def _eval_global_count(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_reports = _as_int(cfg.get("min_reports"), default=0)
-    total = session.query(UserAction).filter(UserAction.user_id == user.id).count()
+def _eval_global_count(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_reports = cfg.min_reports
+    total = ctx["global_report_count"]
     ok = total >= min_reports
     return ok, f"({total}/{min_reports} reports global)" if ok else ""
 
-def _eval_global_points_won(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: Dict[str, Any]) -> Tuple[bool, str]:
-    min_points = _as_int(cfg.get("min_points"), default=0)
+def _eval_global_points_won(session: Session, user: User, event: Event, ctx: Dict[str, Any], cfg: TriggerConfig) -> Tuple[bool, str]:
+    min_points = cfg.min_points
     total_points = int(ctx["global_points_earned"])
     ok = total_points >= min_points
     return ok, f"({total_points}/{min_points} global points)" if ok else ""
@@ -553,24 +552,21 @@ def _apply_trigger_grant(session: Session, user: User, event: Event, trig) -> Op
 
     # Points path
     if isinstance(points, int) and points > 0:
-        user.points += points
-        user.total_earned += points
-
-        ued = (
-            session.query(UserEventData)
-            .filter(UserEventData.user_id == user.id, UserEventData.event_id == event.id)
-            .first()
+        get_or_create_user_event_data(
+            session,
+            user_id=user.id,
+            event_id=event.id,
+            joined_at_if_create=now_iso(),
+            created_by_if_create=str(user.user_discord_id) if hasattr(user, "user_discord_id") else "system",
+        )
+        record_points(
+            session,
+            user_id=user.id,
+            delta=points,
+            source="trigger",
+            event_id=event.id,
+            source_ref=trig.id,
         )
-        if not ued:
-            ued = UserEventData(
-                user_id=user.id,
-                event_id=event.id,
-                points_earned=0,
-                joined_at=now_iso(),
-                created_by=str(user.user_discord_id) if hasattr(user, "user_discord_id") else "system",
-            )
-            session.add(ued)
-        ued.points_earned += points
         return {"kind": "points", "points": int(points)}
 
     # Reward path
@@ -600,99 +596,6 @@ def _apply_trigger_grant(session: Session, user: User, event: Event, trig) -> Op
     return None
 
 
-# ---------------------------------------------------------------------------
-# Prompt aggregation helpers (DB-backed)
-# ---------------------------------------------------------------------------
-
-def _get_prompts_for_action(session: Session, user_action_id: int) -> Set[int]:
-    rows = (
-        session.query(UserActionPrompt.event_prompt_id)
-        .filter(UserActionPrompt.user_action_id == user_action_id)
-        .all()
-    )
-    return {int(r[0]) for r in rows}
-
-def _aggregate_user_prompts(session: Session, user_action_ids: List[int]) -> Tuple[Set[int], Dict[int, int]]:
-    distinct: Set[int] = set()
-    counts: Dict[int, int] = {}
-    if not user_action_ids:
-        return distinct, counts
-
-    rows = (
-        session.query(UserActionPrompt.event_prompt_id)
-        .filter(UserActionPrompt.user_action_id.in_(user_action_ids))
-        .all()
-    )
-    for (pid,) in rows:
-        pid = int(pid)
-        distinct.add(pid)
-        counts[pid] = counts.get(pid, 0) + 1
-    return distinct, counts
-
-
-# ---------------------------------------------------------------------------
-# Date / streak helpers
-# ---------------------------------------------------------------------------
-
-def _parse_iso_date(s: str) -> Optional[date]:
-    try:
-        # Accept "YYYY-MM-DD" or full ISO "YYYY-MM-DDTHH:MM:SS[±HH:MM]"
-        if len(s) == 10 and s[4] == "-" and s[7] == "-":
-            return date.fromisoformat(s)
-        return datetime.fromisoformat(s).date()
-    except Exception:
-        return None
-
-def _collect_participation_days(actions: Iterable[UserAction]) -> Set[date]:
-    """
-    Streaks are based ONLY on civil days derived from `created_at`.
-    We *do not* look at `date_value` here.
-    """
-    days: Set[date] = set()
-    for ua in actions:
-        ca = getattr(ua, "created_at", None)
-        if not ca:
-            continue
-        d = _parse_iso_date(str(ca))
-        if d:
-            days.add(d)
-    return days
-
-def _ending_streak_length(days: Set[date]) -> int:
-    if not days:
-        return 0
-    last = max(days)
-    length = 1
-    cur = last
-    while True:
-        prev = cur - timedelta(days=1)
-        if prev in days:
-            length += 1
-            cur = prev
-        else:
-            break
-    return length
-
-
-# ---------------------------------------------------------------------------
-# Small utils
-# ---------------------------------------------------------------------------
-
-def _loads_json(s: Optional[str]) -> Dict[str, Any]:
-    if not s:
-        return {}
-    try:
-        return json.loads(s)
-    except Exception:
-        return {}
-
-def _as_int(v: Any, default: int = 0) -> int:
-    try:
-        return int(v)
-    except Exception:
-        return default
-
-
 def grant_trigger_to_user(session: Session, *, user_id: int, trigger_id: int):
     """
     Log the trigger grant, and if it grants points, apply them both to the user
@@ -703,7 +606,11 @@ def grant_trigger_to_user(session: Session, *, user_id: int, trigger_id: int):
         return
     log_event_trigger_grant(session, user_id, trigger_id)
     if getattr(trig, "points_granted", None):
-        pts = int(trig.points_granted)
-        add_points_to_user(session, user_id, pts)
-        if trig.event_id:  # should be set for event-scoped triggers
-            add_points_to_user_event_data(session, user_id=user_id, event_id=trig.event_id, delta_points=pts)
\ No newline at end of file
+        record_points(
+            session,
+            user_id=user_id,
+            delta=int(trig.points_granted),
+            source="trigger",
+            event_id=trig.event_id,  # should be set for event-scoped triggers
+            source_ref=trigger_id,
+        )
\ No newline at end of file
@@ -7,11 +7,14 @@ from bot.crud.prompts_crud import (
     update_prompt as crud_update_prompt,
     delete_prompt_safe as crud_delete_prompt_safe,
     replace_user_action_prompts as crud_replace_user_action_prompts,
+    get_prompt_ids_for_user_action as crud_get_prompt_ids_for_user_action,
     get_prompts_for_action_event_picker as crud_get_prompts_for_action_event_picker,
     count_prompt_popularity_for_event as crud_count_prompt_popularity_for_event,
     count_user_prompt_stats_for_event as crud_count_user_prompt_stats_for_event,
     get_prompt_by_code_and_event
 )
+from bot.crud.user_event_progress_crud import record_prompt_selection_in_progress
+from bot.services.trigger_rules_cache import invalidate_trigger_rules
 from bot.domain.dto import (
     EventPromptDTO,
     UserActionPromptDTO,
@@ -59,7 +62,9 @@ def upsert_event_prompts_bulk(
             created_by=created_by,
             created_at=created_at,
         )
-        return [event_prompt_to_dto(r) for r in rows]
+        dtos = [event_prompt_to_dto(r) for r in rows]
+    invalidate_trigger_rules(event_id)  # prompt labels are baked into trigger labels
+    return dtos
 
 def edit_event_prompt(
     prompt_id: int,
@@ -82,11 +87,17 @@ def edit_event_prompt(
             modified_by=modified_by,
             modified_at=modified_at,
         )
-        return event_prompt_to_dto(row) if row else None
+        dto = event_prompt_to_dto(row) if row else None
+    if dto:
+        invalidate_trigger_rules(dto.event_id)
+    return dto
 
 def delete_event_prompt_if_unused(prompt_id: int) -> bool:
     with db_session() as session:
-        return crud_delete_prompt_safe(session, prompt_id)
+        deleted = crud_delete_prompt_safe(session, prompt_id)
+    if deleted:
+        invalidate_trigger_rules()
+    return deleted
 
 # -------- User action <-> prompts --------
 
@@ -95,12 +106,20 @@ def set_user_action_prompts(
     user_action_id: int,
     event_prompt_ids: Iterable[int],
 ) -> list[UserActionPromptDTO]:
+    event_prompt_ids = list(event_prompt_ids)
     with db_session() as session:
+        old_ids = crud_get_prompt_ids_for_user_action(session, user_action_id)
         rows = crud_replace_user_action_prompts(
             session,
             user_action_id=user_action_id,
             event_prompt_ids=event_prompt_ids,
         )
+        record_prompt_selection_in_progress(
+            session,
+            user_action_id=user_action_id,
+            old_prompt_ids=old_ids,
+            new_prompt_ids=event_prompt_ids,
+        )
         return [user_action_prompt_to_dto(r) for r in rows]
 
 def picker_prompts_for_action_event(action_event_id: int) -> list[EventPromptDTO]:
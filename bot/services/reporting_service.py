@@ -1,8 +1,6 @@
 # bot/services/reporting_service.py
 from __future__ import annotations
 
-import csv
-import io
 from dataclasses import dataclass
 from typing import List, Optional, Sequence, Tuple, Dict, Any
 
@@ -15,7 +13,11 @@ from bot.crud.reporting_crud import (
     leaderboard_prompts_by_event,
     leaderboard_actions_by_action_events,
     list_actions_for_action_events,
+    page_actions_for_action_events,
+    iter_actions_for_action_events,
+    action_value_columns_used,
 )
+from bot.utils.csv_export import CsvPart, write_csv_parts
 
 # ---------- DTOs / VMs ----------
 
@@ -37,6 +39,8 @@ class PointsRow:
     user_discord_id: str
     display_name: str
     points: int
+    rank: int = 0
+    total: int = 0      # participants on the whole board
 
 @dataclass
 class PromptsRow:
@@ -44,12 +48,16 @@ class PromptsRow:
     display_name: str
     total_prompts: int
     unique_prompts: int
+    rank: int = 0
+    total: int = 0
 
 @dataclass
 class ActionsCountRow:
     user_discord_id: str
     display_name: str
     count: int
+    rank: int = 0
+    total: int = 0
 
 @dataclass
 class ActionDetailRow:
@@ -89,44 +97,92 @@ def build_action_event_options(session: Session, event_id: int) -> List[ActionEv
 
 
 # ---------- Leaderboards ----------
+# limit/offset page the ranked board; user_discord_id returns only that
+# member's row (empty when they are not on the board) for "my rank".
 
-def get_points_leaderboard(session: Session, event_id: int) -> List[PointsRow]:
-    rows = leaderboard_points_by_event(session, event_id)
+def get_points_leaderboard(
+    session: Session,
+    event_id: int,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_discord_id: Optional[str] = None,
+) -> List[PointsRow]:
+    rows = leaderboard_points_by_event(
+        session, event_id, limit=limit, offset=offset, user_discord_id=user_discord_id
+    )
     return [
         PointsRow(
             user_discord_id=r["user_discord_id"],
             display_name=r["display_name"],
             points=int(r["points"]),
+            rank=int(r["rank"]),
+            total=int(r["total"]),
         )
         for r in rows
     ]
 
 
-def get_prompts_leaderboard(session: Session, event_id: int) -> List[PromptsRow]:
-    rows = leaderboard_prompts_by_event(session, event_id)
+def get_prompts_leaderboard(
+    session: Session,
+    event_id: int,
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_discord_id: Optional[str] = None,
+) -> List[PromptsRow]:
+    rows = leaderboard_prompts_by_event(
+        session, event_id, limit=limit, offset=offset, user_discord_id=user_discord_id
+    )
     return [
         PromptsRow(
             user_discord_id=r["user_discord_id"],
             display_name=r["display_name"],
             total_prompts=int(r["total_prompts"]),
             unique_prompts=int(r["unique_prompts"]),
+            rank=int(r["rank"]),
+            total=int(r["total"]),
         )
         for r in rows
     ]
 
 
-def get_actions_count_leaderboard(session: Session, event_id: int, ae_ids: Sequence[int]) -> List[ActionsCountRow]:
-    rows = leaderboard_actions_by_action_events(session, event_id, ae_ids)
+def get_actions_count_leaderboard(
+    session: Session,
+    event_id: int,
+    ae_ids: Sequence[int],
+    *,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    user_discord_id: Optional[str] = None,
+) -> List[ActionsCountRow]:
+    rows = leaderboard_actions_by_action_events(
+        session, event_id, ae_ids, limit=limit, offset=offset, user_discord_id=user_discord_id
+    )
     return [
         ActionsCountRow(
             user_discord_id=r["user_discord_id"],
             display_name=r["display_name"],
             count=int(r["count"]),
+            rank=int(r["rank"]),
+            total=int(r["total"]),
         )
         for r in rows
     ]
 
 
+def get_leaderboard_with_my_rank(session: Session, fetch, *args, limit: int, user_discord_id: str):
+    """
+    Top `limit` rows plus the member's own row when it is not among them
+    (None when they are not on the board), in one unit of work.
+    """
+    top = fetch(session, *args, limit=limit)
+    if any(r.user_discord_id == str(user_discord_id) for r in top):
+        return top, None
+    mine = fetch(session, *args, user_discord_id=user_discord_id)
+    return top, (mine[0] if mine else None)
+
+
 # ---------- Actions List ----------
 
 def get_action_details(
@@ -138,76 +194,101 @@ def get_action_details(
     ascending: bool,
 ) -> List[ActionDetailRow]:
     rows = list_actions_for_action_events(session, event_id, ae_ids, date_iso, order_field, ascending)
-    return [
-        ActionDetailRow(
-            display_name=r["display_name"],
-            user_discord_id=r["user_discord_id"],
-            created_at=r["created_at"],
-            url_value=r["url_value"],
-            numeric_value=r["numeric_value"],
-            text_value=r["text_value"],
-            boolean_value=r["boolean_value"],
-            date_value=r["date_value"],
-            prompts_count=int(r.get("prompts_count", 0)),
-        )
-        for r in rows
-    ]
+    return [_to_action_detail_row(r) for r in rows]
 
 
-# ---------- CSV Helpers ----------
-
-def to_csv_bytes_from_points(rows: List[PointsRow]) -> bytes:
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["display_name", "user_discord_id", "points"])
-    for r in rows:
-        w.writerow([r.display_name, r.user_discord_id, r.points])
-    return buf.getvalue().encode("utf-8")
-
-
-def to_csv_bytes_from_prompts(rows: List[PromptsRow]) -> bytes:
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["display_name", "user_discord_id", "total_prompts", "unique_prompts"])
-    for r in rows:
-        w.writerow([r.display_name, r.user_discord_id, r.total_prompts, r.unique_prompts])
-    return buf.getvalue().encode("utf-8")
-
-
-def to_csv_bytes_from_action_counts(rows: List[ActionsCountRow]) -> bytes:
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["display_name", "user_discord_id", "count"])
-    for r in rows:
-        w.writerow([r.display_name, r.user_discord_id, r.count])
-    return buf.getvalue().encode("utf-8")
-
-
-def to_csv_bytes_from_action_details(rows: List[ActionDetailRow]) -> bytes:
-    # Dynamic columns: include only used value columns
-    used = {
-        "url_value": any(r.url_value for r in rows),
-        "numeric_value": any(r.numeric_value is not None for r in rows),
-        "text_value": any(r.text_value for r in rows),
-        "boolean_value": any(r.boolean_value is not None for r in rows),
-        "date_value": any(r.date_value for r in rows),
-        "prompts_count": any(r.prompts_count for r in rows),
-    }
-    headers = ["created_at", "display_name", "user_discord_id"]
-    for k in ["url_value", "numeric_value", "text_value", "boolean_value", "date_value", "prompts_count"]:
-        if used[k]:
-            headers.append(k)
-
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(headers)
-    for r in rows:
-        row = [r.created_at, r.display_name, r.user_discord_id]
-        if used["url_value"]: row.append(r.url_value or "")
-        if used["numeric_value"]: row.append("" if r.numeric_value is None else r.numeric_value)
-        if used["text_value"]: row.append(r.text_value or "")
-        if used["boolean_value"]: row.append("" if r.boolean_value is None else ("true" if r.boolean_value else "false"))
-        if used["date_value"]: row.append(r.date_value or "")
-        if used["prompts_count"]: row.append(r.prompts_count)
-        w.writerow(row)
-    return buf.getvalue().encode("utf-8")
+def get_action_details_page(
+    session: Session,
+    event_id: int,
+    ae_ids: Sequence[int],
+    date_iso: Optional[str],
+    order_field: str,
+    ascending: bool,
+    *,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 25,
+) -> Tuple[List[ActionDetailRow], Optional[Tuple[Any, int]]]:
+    """One keyset page of action details and the cursor of the next one (None when last)."""
+    rows, next_cursor = page_actions_for_action_events(
+        session, event_id, ae_ids, date_iso, order_field, ascending, after=after, limit=limit
+    )
+    return [_to_action_detail_row(r) for r in rows], next_cursor
+
+
+def _to_action_detail_row(r: Dict[str, Any]) -> ActionDetailRow:
+    return ActionDetailRow(
+        display_name=r["display_name"],
+        user_discord_id=r["user_discord_id"],
+        created_at=r["created_at"],
+        url_value=r["url_value"],
+        numeric_value=r["numeric_value"],
+        text_value=r["text_value"],
+        boolean_value=r["boolean_value"],
+        date_value=r["date_value"],
+        prompts_count=int(r.get("prompts_count", 0)),
+    )
+
+
+# ---------- CSV Exports ----------
+# Rows stream from server-side cursors straight into write_csv_parts, so an
+# export never holds the report in memory. Run inside a session (run_in_session);
+# the returned parts are detached temp files.
+
+def export_points_leaderboard(session: Session, event_id: int, *, compress: Optional[bool] = None) -> List[CsvPart]:
+    rows = leaderboard_points_by_event(session, event_id, stream=True)
+    return write_csv_parts(
+        ((r["rank"], r["display_name"], r["user_discord_id"], r["points"]) for r in rows),
+        ["rank", "display_name", "user_discord_id", "points"],
+        filename="leaderboard_points.csv", compress=compress,
+    )
+
+
+def export_prompts_leaderboard(session: Session, event_id: int, *, compress: Optional[bool] = None) -> List[CsvPart]:
+    rows = leaderboard_prompts_by_event(session, event_id, stream=True)
+    return write_csv_parts(
+        ((r["rank"], r["display_name"], r["user_discord_id"], r["total_prompts"], r["unique_prompts"]) for r in rows),
+        ["rank", "display_name", "user_discord_id", "total_prompts", "unique_prompts"],
+        filename="leaderboard_prompts.csv", compress=compress,
+    )
+
+
+def export_actions_count_leaderboard(
+    session: Session, event_id: int, ae_ids: Sequence[int], *, compress: Optional[bool] = None
+) -> List[CsvPart]:
+    rows = leaderboard_actions_by_action_events(session, event_id, ae_ids, stream=True)
+    return write_csv_parts(
+        ((r["rank"], r["display_name"], r["user_discord_id"], r["count"]) for r in rows),
+        ["rank", "display_name", "user_discord_id", "count"],
+        filename="leaderboard_actions.csv", compress=compress,
+    )
+
+
+def export_action_details(
+    session: Session,
+    event_id: int,
+    ae_ids: Sequence[int],
+    date_iso: Optional[str],
+    order_field: str,
+    ascending: bool,
+    *,
+    compress: Optional[bool] = None,
+) -> List[CsvPart]:
+    # Dynamic columns: include only used value columns (decided by one aggregate up front)
+    used = action_value_columns_used(session, ae_ids, date_iso)
+    optional = [k for k in ["url_value", "numeric_value", "text_value", "boolean_value", "date_value", "prompts_count"] if used[k]]
+    headers = ["created_at", "display_name", "user_discord_id", *optional]
+
+    def lines():
+        for r in iter_actions_for_action_events(session, event_id, ae_ids, date_iso, order_field, ascending):
+            row = [r["created_at"].isoformat() if r["created_at"] else "", r["display_name"], r["user_discord_id"]]
+            for k in optional:
+                v = r[k]
+                if k == "boolean_value":
+                    row.append("" if v is None else ("true" if v else "false"))
+                elif k in ("numeric_value", "prompts_count"):
+                    row.append("" if v is None else v)
+                else:
+                    row.append(v or "")
+            yield row
+
+    return write_csv_parts(lines(), headers, filename="actions_report.csv", compress=compress)
@@ -0,0 +1,174 @@
+# bot/services/trigger_rules_cache.py
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from bot.crud.event_triggers_crud import get_event_triggers_for_event
+from bot.crud.prompts_crud import get_prompt_labels_by_code
+from bot.crud.action_events_crud import get_action_descriptions_by_action_event_ids
+
+# Trigger types the engine knows how to evaluate (see event_triggers_service evaluators)
+EVALUATED_TRIGGER_TYPES = frozenset({
+    "prompt_count", "prompt_unique", "prompt_repeat", "streak", "event_count",
+    "action_repeat", "points_won", "participation_days", "global_count", "global_points_won",
+})
+
+# ---------------------------------------------------------------------------
+# Compiled rules
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class TriggerConfig:
+    """config_json parsed and normalized once; thresholds default to 0 (= never achieved)."""
+    min_count: int = 0
+    min_days: int = 0
+    min_reports: int = 0
+    min_points: int = 0
+    prompt_code: str = ""
+    action_event_id: int = 0
+    group: Optional[str] = None          # None = all groups
+    raw: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+
+@dataclass(frozen=True)
+class CompiledTrigger:
+    id: int
+    event_id: Optional[int]
+    trigger_type: str
+    config: TriggerConfig
+    points_granted: Optional[int]
+    reward_event_id: Optional[int]
+    label: str                           # human label for grant lines
+
+def _as_int(v: Any, default: int = 0) -> int:
+    try:
+        return int(v)
+    except Exception:
+        return default
+
+def _normalize_group(v: Any) -> Optional[str]:
+    """None, "", "all", "*" -> None; otherwise the trimmed string."""
+    if v is None:
+        return None
+    s = str(v).strip()
+    if s == "" or s.lower() in ("all", "*"):
+        return None
+    return s
+
+def parse_trigger_config(config_json: Optional[str]) -> TriggerConfig:
+    try:
+        raw = json.loads(config_json) if config_json else {}
+    except Exception:
+        raw = {}
+    if not isinstance(raw, dict):
+        raw = {}
+    return TriggerConfig(
+        min_count=_as_int(raw.get("min_count")),
+        min_days=_as_int(raw.get("min_days")),
+        min_reports=_as_int(raw.get("min_reports")),
+        min_points=_as_int(raw.get("min_points")),
+        prompt_code=str(raw.get("prompt_code") or "").strip(),
+        action_event_id=_as_int(raw.get("action_event_id")),
+        group=_normalize_group(raw.get("group")),
+        raw=MappingProxyType(dict(raw)),
+    )
+
+def compile_event_triggers(session: Session, event_id: int) -> Tuple[CompiledTrigger, ...]:
+    """
+    Load + parse the event's triggers. Unknown trigger types are dropped here, not per report.
+    Labels are rendered from lookups loaded with this session (no extra sessions/connections).
+    """
+    # local import: discord_helpers -> prompts_service -> this module
+    from bot.utils.discord_helpers import format_trigger_label
+
+    parsed = []
+    for trig in get_event_triggers_for_event(session, event_id):
+        ttype = (getattr(trig, "trigger_type", "") or "").strip()
+        if ttype not in EVALUATED_TRIGGER_TYPES:
+            continue
+        parsed.append((trig, ttype, parse_trigger_config(getattr(trig, "config_json", None))))
+
+    prompt_labels: Dict[str, str] = {}
+    if any(ttype == "prompt_repeat" for _, ttype, _ in parsed):
+        prompt_labels = get_prompt_labels_by_code(session, event_id)
+    action_event_labels = get_action_descriptions_by_action_event_ids(
+        session, [cfg.action_event_id for _, ttype, cfg in parsed if ttype == "action_repeat" and cfg.action_event_id]
+    )
+
+    return tuple(
+        CompiledTrigger(
+            id=trig.id,
+            event_id=trig.event_id,
+            trigger_type=ttype,
+            config=cfg,
+            points_granted=trig.points_granted,
+            reward_event_id=trig.reward_event_id,
+            label=format_trigger_label(
+                ttype, dict(cfg.raw), event_id,
+                prompt_labels=prompt_labels,
+                action_event_labels=action_event_labels,
+            ),
+        )
+        for trig, ttype, cfg in parsed
+    )
+
+# ---------------------------------------------------------------------------
+# Per-event cache
+# ---------------------------------------------------------------------------
+# Process-local; DB calls run on the executor threads, hence the lock.
+# The generation counter stops a loader that read the DB before an
+# invalidation from storing its (stale) result afterwards.
+
+_lock = threading.Lock()
+_rules_by_event: Dict[int, Tuple[CompiledTrigger, ...]] = {}
+_generation: Dict[int, int] = {}
+_epoch = 0          # bumped by a full invalidation
+
+def _gen(event_id: int) -> Tuple[int, int]:
+    return _epoch, _generation.get(event_id, 0)
+
+def get_compiled_triggers(session: Session, event_id: int) -> Tuple[CompiledTrigger, ...]:
+    with _lock:
+        cached = _rules_by_event.get(event_id)
+        gen = _gen(event_id)
+    if cached is not None:
+        return cached
+
+    rules = compile_event_triggers(session, event_id)
+    with _lock:
+        if _gen(event_id) == gen:
+            _rules_by_event[event_id] = rules
+    return rules
+
+def invalidate_trigger_rules(event_id: Optional[int] = None) -> None:
+    """Drop the compiled rules for one event (or all events). Call after the edit is committed."""
+    global _epoch
+    with _lock:
+        if event_id is None:
+            _epoch += 1
+            _rules_by_event.clear()
+            return
+        _generation[event_id] = _generation.get(event_id, 0) + 1
+        _rules_by_event.pop(event_id, None)
+
+def _invalidate_after_commit(session) -> None:
+    for event_id in session.info.pop("_trigger_rules_invalidate", ()):
+        invalidate_trigger_rules(event_id)
+
+def invalidate_trigger_rules_on_commit(session: Session, event_id: Optional[int] = None) -> None:
+    """
+    For write paths that run inside a caller's session (admin cogs): drop the
+    rules now and again once the transaction commits, so a compile that read
+    the pre-commit rows in between is not served. event_id None = all events.
+    """
+    invalidate_trigger_rules(event_id)
+    pending = session.info.setdefault("_trigger_rules_invalidate", set())
+    if not pending:
+        sa_event.listen(session, "after_commit", _invalidate_after_commit, once=True)
+    pending.add(event_id)
@@ -9,8 +9,9 @@ from bot.domain.mapping import to_action_event_dto
 from bot.crud.action_events_crud import user_already_completed_non_repeatable, get_action_event_bundle
 from bot.crud.inventory_crud import add_or_increment_inventory
 from bot.crud.user_actions_crud import insert_user_action
-from bot.crud.user_event_data_crud import get_or_create_user_event_data, add_points_to_user_event_data
-from bot.crud.users_crud import add_points_to_user
+from bot.crud.user_event_data_crud import get_or_create_user_event_data
+from bot.crud.user_event_progress_crud import record_action_in_progress
+from bot.crud.points_ledger_crud import record_points
 
 from bot.services.action_events_service import get_event_is_open_for_action
 from bot.services.events_service import get_status_name
@@ -110,12 +111,28 @@ def submit_user_action(
         boolean_value=payload.boolean_value,
         date_value=payload.date_value,
     )
+
+    # trigger counters (report count, per-action count, participation days / streak)
+    if ev is not None:
+        record_action_in_progress(
+            session,
+            user_id=user.id,
+            event_id=ev.id,
+            action_event_id=ae.id,
+            created_at=ts,
+        )
     
     # points
     if points_awarded:
-        add_points_to_user(session, user.id, points_awarded)
-        if ev is not None:
-            add_points_to_user_event_data(session, user_id=user.id, event_id=ev.id, delta_points=points_awarded)
+        record_points(
+            session,
+            user_id=user.id,
+            delta=points_awarded,
+            source="action",
+            event_id=ev.id if ev is not None else None,
+            source_ref=inserted.id,
+            created_by=str(payload.user_discord_id),
+        )
             
     # direct reward
     reward_name: str | None = None
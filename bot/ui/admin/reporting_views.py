@@ -1,30 +1,87 @@
 # bot/ui/admin/reporting_views.py
 from __future__ import annotations
 
-import io
 from typing import List, Optional, Sequence, Literal, Any
 
 import discord
 from discord import ui
 
-from db.database import db_session  # your context manager
+from db.database import run_db, run_in_session
 from bot.services.reporting_service import (
-    build_event_options,
     build_action_event_options,
     get_points_leaderboard,
     get_prompts_leaderboard,
     get_actions_count_leaderboard,
-    get_action_details,
-    to_csv_bytes_from_points,
-    to_csv_bytes_from_prompts,
-    to_csv_bytes_from_action_counts,
-    to_csv_bytes_from_action_details,
+    get_leaderboard_with_my_rank,
+    get_action_details_page,
+    export_points_leaderboard,
+    export_prompts_leaderboard,
+    export_actions_count_leaderboard,
+    export_action_details,
 )
+from bot.ui.common.paginator import LazyPage, LazyPaginator
+from bot.utils.csv_export import send_csv_parts
+from bot.utils.metrics import timed_callback
 from bot.services.events_service import get_event_dto_by_id
 from bot.config import CURRENCY
 
 # ------------- Helpers -------------
 
+ACTION_PREVIEW_ROWS = 20   # rows in the Run preview (one keyset page)
+ACTION_PRINT_ROWS = 12     # rows per printed page (full URLs)
+LEADERBOARD_TOP = 25  # rows shown in the panel; Print / Export fetch the whole board
+
+def _action_lines(rows: list, *, preview: bool) -> list[str]:
+    """Header + one line per action row; only the value columns used on this page are shown."""
+    used = {
+        "prompts_count": any(r.prompts_count for r in rows),
+        "url_value": any(r.url_value for r in rows),
+        "numeric_value": any(r.numeric_value is not None for r in rows),
+        "text_value": any(r.text_value for r in rows),
+        "boolean_value": any(r.boolean_value is not None for r in rows),
+        "date_value": any(r.date_value for r in rows),
+    }
+    headers = ["date", "name"]
+    for k, title in [
+        ("prompts_count", "#p" if preview else "# prompts"),
+        ("url_value", "url"),
+        ("numeric_value", "num"),
+        ("text_value", "text"),
+        ("boolean_value", "bool"),
+        ("date_value", "dval"),
+    ]:
+        if used[k]:
+            headers.append(title)
+
+    wrap = (lambda x: "`" + x + "`") if preview else (lambda x: x)
+    lines = [wrap(" | ".join(headers))]
+    for r in rows:
+        vals = [_fmt_date(r.created_at), _truncate(r.display_name, 28) if preview else "<@" + r.user_discord_id + ">"]
+        if used["prompts_count"]: vals.append(str(r.prompts_count))
+        if used["url_value"]:     vals.append((_truncate(r.url_value, 32) if preview else r.url_value) if r.url_value else "")
+        if used["numeric_value"]: vals.append("" if r.numeric_value is None else str(r.numeric_value))
+        if used["text_value"]:    vals.append(_truncate(r.text_value, 32 if preview else 64) if r.text_value else "")
+        if used["boolean_value"]: vals.append("" if r.boolean_value is None else ("true" if r.boolean_value else "false"))
+        if used["date_value"]:    vals.append(_fmt_date(r.date_value))
+        lines.append(wrap(" | ".join(vals)))
+    return lines
+
+def _leaderboard_line(kind: str, r) -> str:
+    if kind == "points":
+        return f"{r.rank:>2}. <@{r.user_discord_id}> — {r.points} {CURRENCY}"
+    if kind == "prompts":
+        return f"{r.rank:>2}. <@{r.user_discord_id}> — unique {r.unique_prompts} / total {r.total_prompts}"
+    return f"{r.rank:>2}. <@{r.user_discord_id}> — {r.count}"
+
+def _leaderboard_footer(kind: str, rows: list, mine) -> list[str]:
+    """'Top N of M' when the board is longer than the panel, plus the viewer's own rank."""
+    out = []
+    if rows and rows[0].total > len(rows):
+        out.append(f"_Top {len(rows)} of {rows[0].total}. Use **Print in channel** or **Export CSV** for everyone._")
+    if mine is not None:
+        out.append(f"**Your rank:** {_leaderboard_line(kind, mine).strip()}")
+    return out
+
 def _render_with_limit(lines: list[str], hard_limit: int = 1900) -> str:
     """
     Join lines into a message that safely fits below Discord's 2000-char limit.
@@ -60,25 +117,6 @@ def _fmt_date(v) -> str:
         return s[:10]
 
 
-def _paginate_lines(lines: list[str], hard_limit: int = 1900) -> list[str]:
-    """
-    Break lines into pages under ~2000 chars, add page footer.
-    """
-    pages, cur, cur_len = [], [], 0
-    for ln in lines:
-        add = ln + "\n"
-        if cur and cur_len + len(add) > hard_limit:
-            pages.append("\n".join(cur))
-            cur, cur_len = [ln], len(add)
-        else:
-            cur.append(ln)
-            cur_len += len(add)
-    if cur:
-        pages.append("\n".join(cur))
-    if len(pages) > 1:
-        pages = [p + f"\n_Page {i+1}/{len(pages)}_" for i, p in enumerate(pages)]
-    return pages
-
 def _join_and_truncate(items: list[str], sep: str = " , ", max_chars: int = 180) -> str:
     """Join items with a separator, capping total length, and add a (+N more) suffix if needed."""
     out, used = [], 0
@@ -112,14 +150,14 @@ def _chunk_lines(lines: List[str], max_chars: int = 1800) -> List[str]:
 # ------------- Main Entry View -------------
 
 class AdminReportsHomeView(ui.View):
-    def __init__(self, *, author_id: int, timeout: float = 300):
+    def __init__(self, *, author_id: int, event_options: Sequence[Any], timeout: float = 300):
         super().__init__(timeout=timeout)
         self.author_id = author_id
         self.event_id: Optional[int] = None
         self.event_label: Optional[str] = None  # <- store pretty name
         self.report_type: Optional[Literal["leaderboards", "actions"]] = None
 
-        self.event_select = EventSelect()
+        self.event_select = EventSelect(event_options)
         self.add_item(self.event_select)
         self.add_item(ReportTypeSelect())
 
@@ -127,10 +165,7 @@ class AdminReportsHomeView(ui.View):
         return interaction.user.id == self.author_id
 
 class EventSelect(ui.Select):
-    def __init__(self):
-        with db_session() as session:
-            ev_opts = build_event_options(session)
-
+    def __init__(self, ev_opts: Sequence[Any]):
         if not ev_opts:
             super().__init__(
                 placeholder="No events available",
@@ -176,27 +211,29 @@ class ReportTypeSelect(ui.Select):
         if not home.event_id:
             await interaction.response.send_message("Please select an event first.", ephemeral=True)
             return
+        ev = await run_db(get_event_dto_by_id, home.event_id)
+        event_name = ev.event_name if ev else f"(Event {home.event_id})"
         if home.report_type == "leaderboards":
-            await interaction.response.edit_message(view=LeaderboardsView(author_id=home.author_id, event_id=home.event_id))  # type: ignore[arg-type]
+            await interaction.response.edit_message(view=LeaderboardsView(author_id=home.author_id, event_id=home.event_id, event_name=event_name))  # type: ignore[arg-type]
 
         else:
-            await interaction.response.edit_message(view=ActionListView(author_id=home.author_id, event_id=home.event_id))  # type: ignore[arg-type]
+            ae_opts = await run_in_session(build_action_event_options, home.event_id)
+            await interaction.response.edit_message(view=ActionListView(author_id=home.author_id, event_id=home.event_id, event_name=event_name, action_event_options=ae_opts))  # type: ignore[arg-type]
 
 
 # ------------- Leaderboards -------------
 
 class LeaderboardsView(ui.View):
-    def __init__(self, *, author_id: int, event_id: int, timeout: float = 360):
+    def __init__(self, *, author_id: int, event_id: int, event_name: str, timeout: float = 360):
         super().__init__(timeout=timeout)
         self.author_id = author_id
         self.event_id = event_id
-        ev = get_event_dto_by_id(event_id)
-        self.event_name = ev.event_name if ev else f"(Event {event_id})"
+        self.event_name = event_name
         self.kind_select = LeaderboardKindSelect()
         self.add_item(self.kind_select)
         self.action_event_select: Optional[ActionEventMultiSelect] = None
 
-        self._last_payload: Optional[Any] = None  # cache rows for print/export
+        self._last_payload: Optional[Any] = None  # (fetch fn, args) of the last board, re-run in full for print/export
         self._last_kind: Optional[str] = None
         self._last_action_labels: list[str] = []
 
@@ -208,13 +245,11 @@ class LeaderboardsView(ui.View):
         self._last_kind = kind
 
         if kind == "points":
-            with db_session() as session:
-                rows = get_points_leaderboard(session, self.event_id)
-            self._last_payload = rows
+            rows, mine = await self.fetch_top(interaction, get_points_leaderboard, self.event_id)
 
             lines = [f"**Leaderboard – {CURRENCY.capitalize()} - {self.event_name}**"]
-            for i, r in enumerate(rows, 1):
-                lines.append(f"{i:>2}. <@{r.user_discord_id}> — {r.points} {CURRENCY}")
+            lines += [_leaderboard_line(kind, r) for r in rows]
+            lines += _leaderboard_footer(kind, rows, mine)
             content = "\n".join(lines) if lines else "No data."
 
             # action-event select not needed
@@ -226,13 +261,11 @@ class LeaderboardsView(ui.View):
             await interaction.response.edit_message(content=content, view=self)
 
         elif kind == "prompts":
-            with db_session() as session:
-                rows = get_prompts_leaderboard(session, self.event_id)
-            self._last_payload = rows
+            rows, mine = await self.fetch_top(interaction, get_prompts_leaderboard, self.event_id)
 
             lines = [f"**Leaderboard – Prompts - {self.event_name}**"]
-            for i, r in enumerate(rows, 1):
-                lines.append(f"{i:>2}. <@{r.user_discord_id}> — unique {r.unique_prompts} / total {r.total_prompts}")
+            lines += [_leaderboard_line(kind, r) for r in rows]
+            lines += _leaderboard_footer(kind, rows, mine)
             content = "\n".join(lines) if lines else "No data."
 
             if self.action_event_select:
@@ -245,7 +278,8 @@ class LeaderboardsView(ui.View):
         else:  # kind == 'actions_count'
             # Need action_event multi-select
             if not self.action_event_select:
-                self.action_event_select = ActionEventMultiSelect(self.event_id, placeholder="Pick one or more ActionEvents…")
+                opts = await run_in_session(build_action_event_options, self.event_id)
+                self.action_event_select = ActionEventMultiSelect(opts, placeholder="Pick one or more ActionEvents…")
                 self.add_item(self.action_event_select)
     
             # ✅ make sure Run / Print / Export are present the first time too
@@ -256,6 +290,18 @@ class LeaderboardsView(ui.View):
                 view=self
             )
 
+    async def fetch_top(self, interaction: discord.Interaction, fetch, *args):
+        """Top LEADERBOARD_TOP rows + the viewer's rank; remembers the query for print/export."""
+        self._last_payload = (fetch, args)
+        return await run_in_session(
+            get_leaderboard_with_my_rank, fetch, *args,
+            limit=LEADERBOARD_TOP, user_discord_id=str(interaction.user.id),
+        )
+
+    async def fetch_all(self) -> list:
+        fetch, args = self._last_payload
+        return await run_in_session(fetch, *args)
+
     def _refresh_export_buttons(self):
         # reset buttons
         for child in list(self.children):
@@ -279,9 +325,7 @@ class LeaderboardKindSelect(ui.Select):
         await view.run_and_render(interaction)
 
 class ActionEventMultiSelect(ui.Select):
-    def __init__(self, event_id: int, placeholder: str = "Select ActionEvents…"):
-        with db_session() as session:
-            opts = build_action_event_options(session, event_id)
+    def __init__(self, opts: Sequence[Any], placeholder: str = "Select ActionEvents…"):
         options = [discord.SelectOption(label=_truncate(o.label, 90), value=str(o.id)) for o in opts][:25]
         super().__init__(placeholder=placeholder, min_values=1, max_values=min(25, len(options)) or 1, options=options)
 
@@ -308,9 +352,7 @@ class RunButton(ui.Button):
             pv._last_action_labels = labels
 
             ae_ids = [int(v) for v in sel.values]
-            with db_session() as session:
-                rows = get_actions_count_leaderboard(session, pv.event_id, ae_ids)
-            pv._last_payload = rows
+            rows, mine = await pv.fetch_top(interaction, get_actions_count_leaderboard, pv.event_id, ae_ids)
 
             title = getattr(pv, "event_label", None) or f"Event {pv.event_id}"
             lines = [f"**Leaderboard – # of Actions - {pv.event_name}**"]
@@ -318,8 +360,8 @@ class RunButton(ui.Button):
             if labels:
                 lines.append(f"*Actions:* {_join_and_truncate(labels)}")
 
-            for i, r in enumerate(rows, 1):
-                lines.append(f"{i:>2}. <@{r.user_discord_id}> — {r.count}")
+            lines += [_leaderboard_line("actions_count", r) for r in rows]
+            lines += _leaderboard_footer("actions_count", rows, mine)
 
             content = _render_with_limit(lines) if lines else "No data."
             pv._refresh_export_buttons()
@@ -333,34 +375,27 @@ class PrintChannelButton(ui.Button):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
-        payload = self.parent_view._last_payload
-        if payload is None:
+        if self.parent_view._last_payload is None:
             await interaction.response.send_message("Run a report first.", ephemeral=True)
             return
 
-        title = getattr(self.parent_view, "event_label", None) or f"Event {self.parent_view.event_id}"
+        await interaction.response.defer()
+        kind = self.parent_view._last_kind
+        payload = await self.parent_view.fetch_all()
         lines: list[str] = []
 
-        if self.parent_view._last_kind == "points":
+        if kind == "points":
             lines.append(f"**Leaderboard – {CURRENCY.capitalize()} - {self.parent_view.event_name}**")
-            for i, r in enumerate(payload, 1):
-                lines.append(f"{i:>2}. <@{r.user_discord_id}> — {r.points} {CURRENCY}")
-
-        elif self.parent_view._last_kind == "prompts":
+        elif kind == "prompts":
             lines.append(f"**Leaderboard – Prompts - {self.parent_view.event_name}**")
-            for i, r in enumerate(payload, 1):
-                lines.append(f"{i:>2}. <@{r.user_discord_id}> — unique {r.unique_prompts} / total {r.total_prompts}")
-
         else:  # actions_count
             lines.append(f"**Leaderboard – # of Actions - {self.parent_view.event_name}**")
             labels = getattr(self.parent_view, "_last_action_labels", []) or []
             if labels:
                 lines.append(f"*Actions:* {_join_and_truncate(labels)}")
-            for i, r in enumerate(payload, 1):
-                lines.append(f"{i:>2}. <@{r.user_discord_id}> — {r.count}")
+        lines += [_leaderboard_line(kind, r) for r in payload]
 
         chunks = _chunk_lines(lines)
-        await interaction.response.defer()
         for chunk in chunks:
             msg = await interaction.channel.send(chunk, allowed_mentions=discord.AllowedMentions.none())
             await msg.edit(suppress=True)
@@ -371,39 +406,32 @@ class ExportCsvButton(ui.Button):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
-        payload = self.parent_view._last_payload
-        if payload is None:
+        if self.parent_view._last_payload is None:
             await interaction.response.send_message("Run a report first.", ephemeral=True)
             return
 
-        if self.parent_view._last_kind == "points":
-            data = to_csv_bytes_from_points(payload)
-            name = "leaderboard_points.csv"
-        elif self.parent_view._last_kind == "prompts":
-            data = to_csv_bytes_from_prompts(payload)
-            name = "leaderboard_prompts.csv"
-        else:
-            data = to_csv_bytes_from_action_counts(payload)
-            name = "leaderboard_actions.csv"
-
-        fp = io.BytesIO(data)
-        fp.seek(0)
-        await interaction.response.send_message(file=discord.File(fp, filename=name), ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        exporter = {
+            "points": export_points_leaderboard,
+            "prompts": export_prompts_leaderboard,
+        }.get(self.parent_view._last_kind, export_actions_count_leaderboard)
+        _fetch, args = self.parent_view._last_payload
+        parts = await run_in_session(exporter, *args)
+        await send_csv_parts(interaction.followup.send, parts, content="Leaderboard export", ephemeral=True)
 
 
 # ------------- Action List -------------
 
 class ActionListView(ui.View):
-    def __init__(self, *, author_id: int, event_id: int, timeout: float = 360):
+    def __init__(self, *, author_id: int, event_id: int, event_name: str, action_event_options: Sequence[Any], timeout: float = 360):
         super().__init__(timeout=timeout)
         self.author_id = author_id
         self.event_id = event_id
-        ev = get_event_dto_by_id(event_id)
-        self.event_label = ev.event_name if ev else f"(Event {event_id})"
+        self.event_label = event_name
 
         self._sort_value: str = "created_at:desc"
 
-        self.action_select = ActionEventMultiSelect(event_id, placeholder="Pick one or more ActionEvents…")
+        self.action_select = ActionEventMultiSelect(action_event_options, placeholder="Pick one or more ActionEvents…")
         self.add_item(self.action_select)
 
         self.sort_select = SortSelect()
@@ -412,7 +440,7 @@ class ActionListView(ui.View):
         self.add_item(DateInputButton())
 
         self._date_iso: Optional[str] = None
-        self._rows_cache = None
+        self._last_query: Optional[tuple] = None   # args of the last Run, re-queried by Print / Export
 
         self.add_item(ActionRunButton(self))
         self.add_item(ActionPrintButton(self))
@@ -482,6 +510,7 @@ class ActionRunButton(ui.Button):
         super().__init__(label="Run", style=discord.ButtonStyle.primary)
         self.parent_view = parent_view
 
+    @timed_callback("reports:actions_run")
     async def callback(self, interaction: discord.Interaction):
         sel = self.parent_view.action_select
         if not sel.values:
@@ -494,44 +523,14 @@ class ActionRunButton(ui.Button):
         field, direction = sortv.split(":")
         asc = (direction == "asc")
 
-        with db_session() as session:
-            rows = get_action_details(
-                session, self.parent_view.event_id, ae_ids,
-                self.parent_view._date_iso, field, asc
-            )
-        self.parent_view._rows_cache = rows
-
-        used = {
-            "prompts_count": any(r.prompts_count for r in rows),
-            "url_value": any(r.url_value for r in rows),
-            "numeric_value": any(r.numeric_value is not None for r in rows),
-            "text_value": any(r.text_value for r in rows),
-            "boolean_value": any(r.boolean_value is not None for r in rows),
-            "date_value": any(r.date_value for r in rows),
-        }
-
-        headers = ["date","name"]
-        for k, title in [
-            ("prompts_count", "#p"),
-            ("url_value", "url"),
-            ("numeric_value", "num"),
-            ("text_value", "text"),
-            ("boolean_value", "bool"),
-            ("date_value", "dval"),
-        ]:
-            if used[k]:
-                headers.append(title)
-
-        lines = ["**Action List Report**", "`" + " | ".join(headers) + "`"]
-        for r in rows:
-            vals = [_fmt_date(r.created_at),_truncate(r.display_name, 28)]
-            if used["prompts_count"]: vals.append(str(r.prompts_count))
-            if used["url_value"]:     vals.append(_truncate(r.url_value, 32) if r.url_value else "")
-            if used["numeric_value"]: vals.append("" if r.numeric_value is None else str(r.numeric_value))
-            if used["text_value"]:    vals.append(_truncate(r.text_value, 32) if r.text_value else "")
-            if used["boolean_value"]: vals.append("" if r.boolean_value is None else ("true" if r.boolean_value else "false"))
-            if used["date_value"]:    vals.append(_fmt_date(r.date_value))
-            lines.append("`" + " | ".join(vals) + "`")
+        query = (self.parent_view.event_id, ae_ids, self.parent_view._date_iso, field, asc)
+        self.parent_view._last_query = query
+        # preview = first keyset page only; Print pages through the rest on demand
+        rows, next_cursor = await run_in_session(get_action_details_page, *query, limit=ACTION_PREVIEW_ROWS)
+
+        lines = ["**Action List Report**", *_action_lines(rows, preview=True)]
+        if next_cursor is not None:
+            lines.append(f"_First {len(rows)} rows. Use **Print in channel** to page through all, or **Export CSV**._")
 
         # Keep preview under 2k, with a hint
         content = _render_with_limit(lines)
@@ -542,51 +541,26 @@ class ActionPrintButton(ui.Button):
         super().__init__(label="Print in channel", style=discord.ButtonStyle.secondary)
         self.parent_view = parent_view
 
+    @timed_callback("reports:actions_print")
     async def callback(self, interaction: discord.Interaction):
-        rows = self.parent_view._rows_cache
-        if not rows:
+        query = self.parent_view._last_query
+        if not query:
             await interaction.response.send_message("Run a report first.", ephemeral=True)
             return
 
-        used = {
-            "prompts_count": any(r.prompts_count for r in rows),
-            "url_value": any(r.url_value for r in rows),
-            "numeric_value": any(r.numeric_value is not None for r in rows),
-            "text_value": any(r.text_value for r in rows),
-            "boolean_value": any(r.boolean_value is not None for r in rows),
-            "date_value": any(r.date_value for r in rows),
-        }
-        headers = ["date","name"]
-        for k, title in [
-            ("prompts_count", "# prompts"),
-            ("url_value", "url"),
-            ("numeric_value", "num"),
-            ("text_value", "text"),
-            ("boolean_value", "bool"),
-            ("date_value", "dval"),
-        ]:
-            if used[k]:
-                headers.append(title)
-
-        lines = [" | ".join(headers) ]
-        for r in rows:
-            vals = [_fmt_date(r.created_at),"<@"+r.user_discord_id+">"]
-            if used["prompts_count"]: vals.append(str(r.prompts_count))
-            if used["url_value"]:     vals.append(r.url_value if r.url_value else "")
-            if used["numeric_value"]: vals.append("" if r.numeric_value is None else str(r.numeric_value))
-            if used["text_value"]:    vals.append(_truncate(r.text_value, 64) if r.text_value else "")
-            if used["boolean_value"]: vals.append("" if r.boolean_value is None else ("true" if r.boolean_value else "false"))
-            if used["date_value"]:    vals.append(_fmt_date(r.date_value))
-            lines.append(" | ".join(vals))
-
-        pages = _paginate_lines(lines)
         title = self.parent_view.event_label or f"Event {self.parent_view.event_id}"
-        pages[0] = f"**Action List Report — {title}**\n" + pages[0]
+
+        async def provider(cursor):
+            rows, next_cursor = await run_in_session(
+                get_action_details_page, *query, after=cursor, limit=ACTION_PRINT_ROWS
+            )
+            body = _render_with_limit(_action_lines(rows, preview=False), hard_limit=1800)
+            return LazyPage(content=f"**Action List Report — {title}**\n{body}", next_cursor=next_cursor)
 
         await interaction.response.defer()
+        paginator = LazyPaginator(provider, author_id=interaction.user.id, timeout=600, suppress_embeds=True)
         msg = await interaction.channel.send(
-            pages[0],
-            view=PaginatedMessageView(pages=pages, author_id=interaction.user.id),
+            **await paginator.start(),
             allowed_mentions=discord.AllowedMentions.none(),
         )  # type: ignore
         await msg.edit(suppress=True)
@@ -597,64 +571,11 @@ class ActionExportButton(ui.Button):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
-        rows = self.parent_view._rows_cache
-        if not rows:
+        query = self.parent_view._last_query
+        if not query:
             await interaction.response.send_message("Run a report first.", ephemeral=True)
             return
-        data = to_csv_bytes_from_action_details(rows)
-        fp = io.BytesIO(data); fp.seek(0)
-        await interaction.response.send_message(file=discord.File(fp, filename="actions_report.csv"), ephemeral=True)
-
-class PaginatedMessageView(ui.View):
-    def __init__(self, *, pages: list[str], author_id: int, timeout: float = 600):
-        super().__init__(timeout=timeout)
-        self.author_id = author_id
-        self.pages = pages
-        self.index = 0
-        self.add_item(PagerPrevButton(self))
-        self.add_item(PagerNextButton(self))
-        self.add_item(PagerCloseButton(self))
-        self._sync()
-
-    async def interaction_check(self, interaction: discord.Interaction) -> bool:
-        return interaction.user.id == self.author_id
-
-    def _sync(self):
-        for c in self.children:
-            if isinstance(c, PagerPrevButton):
-                c.disabled = (self.index <= 0)
-            if isinstance(c, PagerNextButton):
-                c.disabled = (self.index >= len(self.pages) - 1)
-
-class PagerPrevButton(ui.Button):
-    def __init__(self, owner: PaginatedMessageView):
-        super().__init__(label="Prev", style=discord.ButtonStyle.secondary)
-        self.owner = owner
-    async def callback(self, interaction: discord.Interaction):
-        self.owner.index = max(0, self.owner.index - 1)
-        self.owner._sync()
-        await interaction.response.edit_message(content=self.owner.pages[self.owner.index], view=self.owner, allowed_mentions=discord.AllowedMentions.none())
-        # Immediately suppress any new embed previews
-        await interaction.message.edit(suppress=True)
-
-class PagerNextButton(ui.Button):
-    def __init__(self, owner: PaginatedMessageView):
-        super().__init__(label="Next", style=discord.ButtonStyle.secondary)
-        self.owner = owner
-    async def callback(self, interaction: discord.Interaction):
-        self.owner.index = min(len(self.owner.pages) - 1, self.owner.index + 1)
-        self.owner._sync()
-        await interaction.response.edit_message(content=self.owner.pages[self.owner.index], view=self.owner, allowed_mentions=discord.AllowedMentions.none())
-        # Immediately suppress any new embed previews
-        await interaction.message.edit(suppress=True)
-
-class PagerCloseButton(ui.Button):
-    def __init__(self, owner: PaginatedMessageView):
-        super().__init__(label="Close", style=discord.ButtonStyle.danger)
-        self.owner = owner
-    async def callback(self, interaction: discord.Interaction):
-        for c in self.owner.children:
-            if isinstance(c, ui.Button):
-                c.disabled = True
-        await interaction.response.edit_message(view=self.owner)
-        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        # re-run the report as a stream instead of serializing the cached preview rows
+        parts = await run_in_session(export_action_details, *query)
+        await send_csv_parts(interaction.followup.send, parts, content="Action list export", ephemeral=True)
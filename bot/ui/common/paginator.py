@@ -1,3 +1,7 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
 import discord
 from discord.ui import View, Button
 
@@ -85,4 +89,131 @@ async def paginate_embeds(interaction: discord.Interaction, embeds: list[discord
         paginator.first_button.disabled = True
         paginator.prev_button.disabled = True
 
-    await interaction.followup.send(embed=embeds[0], view=paginator, ephemeral=ephemeral)
\ No newline at end of file
+    await interaction.followup.send(embed=embeds[0], view=paginator, ephemeral=ephemeral)
+
+# ---------------------------------------------------------------------------
+# Lazy paginator
+# ---------------------------------------------------------------------------
+# For keyset-paginated queries: a page provider maps a cursor (None for the
+# first page) to a LazyPage carrying the cursor of the following page. Only
+# pages the user actually opens are fetched; visited pages are kept for Prev
+# and the next one is prefetched in the background (look-ahead of one page).
+# There is no "last" button since the page count is not known up front.
+# Clicks are handled one at a time (per-view lock), so two quick Nexts can't
+# both miss the look-ahead and append the same page twice.
+
+@dataclass
+class LazyPage:
+    embed: Optional[discord.Embed] = None
+    content: Optional[str] = None
+    next_cursor: Any = None     # None: this is the last page
+
+PageProvider = Callable[[Any], Awaitable[LazyPage]]
+
+class LazyPaginator(View):
+    def __init__(
+        self,
+        provider: PageProvider,
+        *,
+        author_id: Optional[int] = None,
+        timeout: float = 300,
+        suppress_embeds: bool = False,
+    ):
+        super().__init__(timeout=timeout)
+        self.provider = provider
+        self.author_id = author_id
+        self.suppress_embeds = suppress_embeds
+        self.pages: list[LazyPage] = []
+        self.index = 0
+        self._lookahead: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+        self.prev_button  = Button(emoji="◀️", style=discord.ButtonStyle.secondary)
+        self.next_button  = Button(emoji="▶️", style=discord.ButtonStyle.secondary)
+        self.close_button = Button(label="Close", style=discord.ButtonStyle.danger)
+        self.prev_button.callback  = self.prev_page
+        self.next_button.callback  = self.next_page
+        self.close_button.callback = self.close
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+        self.add_item(self.close_button)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return self.author_id is None or interaction.user.id == self.author_id
+
+    async def start(self) -> dict:
+        """Fetch the first page; returns the message kwargs to send it with."""
+        self.pages = [await self.provider(None)]
+        self.index = 0
+        self._prefetch()
+        return self.render()
+
+    def render(self) -> dict:
+        page = self.pages[self.index]
+        is_last = page.next_cursor is None and self.index == len(self.pages) - 1
+        self.prev_button.disabled = self.index == 0
+        self.next_button.disabled = is_last
+        marker = f"Page {self.index + 1}" + ("" if is_last else " ›")
+        if page.embed is not None:
+            page.embed.set_footer(text=marker)
+            return {"embed": page.embed, "view": self}
+        content = page.content or "—"
+        if not (self.index == 0 and is_last):
+            content += f"\n_{marker}_"
+        return {"content": content, "view": self}
+
+    def _prefetch(self) -> None:
+        frontier = self.pages[-1]
+        if self._lookahead is None and frontier.next_cursor is not None and self.index == len(self.pages) - 1:
+            self._lookahead = asyncio.create_task(self.provider(frontier.next_cursor))
+
+    async def _show(self, interaction: discord.Interaction) -> None:
+        await interaction.response.edit_message(**self.render(), allowed_mentions=discord.AllowedMentions.none())
+        if self.suppress_embeds:
+            await interaction.message.edit(suppress=True)
+
+    async def prev_page(self, interaction: discord.Interaction):
+        async with self._lock:
+            if self.index > 0:
+                self.index -= 1
+            await self._show(interaction)
+
+    async def next_page(self, interaction: discord.Interaction):
+        async with self._lock:
+            if self.index == len(self.pages) - 1:
+                cursor = self.pages[-1].next_cursor
+                if cursor is None:
+                    return await self._show(interaction)
+                task, self._lookahead = self._lookahead, None
+                try:
+                    page = await (task if task is not None else self.provider(cursor))
+                except Exception as e:
+                    print(f"❌ Failed to load page {len(self.pages) + 1}: {e}")
+                    await interaction.response.send_message("❌ Couldn't load the next page.", ephemeral=True)
+                    return
+                self.pages.append(page)
+            self.index += 1
+            self._prefetch()
+            await self._show(interaction)
+
+    async def close(self, interaction: discord.Interaction):
+        async with self._lock:
+            self._cancel_lookahead()
+            for child in self.children:
+                child.disabled = True
+            await interaction.response.edit_message(view=self)
+            self.stop()
+
+    def _cancel_lookahead(self) -> None:
+        task, self._lookahead = self._lookahead, None
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled() and task.exception() is not None:
+            # a failed prefetch nobody clicked through to: retrieve it so asyncio doesn't warn
+            print(f"⚠️ Dropped failed page prefetch: {task.exception()}")
+
+    async def on_timeout(self):
+        async with self._lock:
+            self._cancel_lookahead()
@@ -0,0 +1,51 @@
+# bot/ui/renderers/avatar_loader.py
+import aiohttp
+import io
+import os
+from PIL import Image, ImageDraw
+from bot.utils.cache import LRUCache, digest, disk_cache_from_env
+from bot.ui.renderers.profile_card import run_render
+
+AVATAR_TILE_SIZE = (120, 120)
+
+# Avatar URLs embed the avatar hash, so a URL always maps to the same image:
+# entries never need revalidation, a changed avatar simply gets a new key.
+_avatar_cache = LRUCache(maxsize=int(os.getenv("AVATAR_CACHE_SIZE", "256")), name="avatar_tiles")
+_avatar_disk = disk_cache_from_env("AVATAR_CACHE_DIR", suffix=".png")
+
+_mask = Image.new("L", AVATAR_TILE_SIZE, 0)
+ImageDraw.Draw(_mask).ellipse((0, 0, *AVATAR_TILE_SIZE), fill=255)
+
+def make_avatar_tile(data: bytes) -> Image.Image:
+    """Decode, resize and circle-mask an avatar for the card. Blocking."""
+    avatar = Image.open(io.BytesIO(data)).resize(AVATAR_TILE_SIZE).convert("RGBA")
+    avatar.putalpha(_mask)
+    return avatar
+
+def _load_from_disk(url: str) -> Image.Image | None:
+    data = _avatar_disk.get(digest(url)) if _avatar_disk else None
+    if not data:
+        return None
+    tile = Image.open(io.BytesIO(data))
+    tile.load()
+    return tile
+
+def _tile_and_persist(url: str, data: bytes) -> Image.Image:
+    tile = make_avatar_tile(data)
+    if _avatar_disk:
+        buf = io.BytesIO()
+        tile.save(buf, format="PNG")
+        _avatar_disk.set(digest(url), buf.getvalue())
+    return tile
+
+async def load_avatar_tile(url: str, session: aiohttp.ClientSession) -> Image.Image:
+    """Masked 120x120 RGBA avatar: memory, then disk, then download. Cached tiles are read-only."""
+    tile = _avatar_cache.get(url)
+    if tile is None:
+        tile = await run_render(_load_from_disk, url)
+    if tile is None:
+        async with session.get(url) as resp:
+            data = await resp.read()
+        tile = await run_render(_tile_and_persist, url, data)
+    _avatar_cache.set(url, tile)
+    return tile
@@ -1,45 +1,108 @@
 # bot/ui/renderers/badge_loader.py
 import aiohttp
+import asyncio
 import io
+import os
 from PIL import Image
-from typing import List, Union
+from typing import Dict, List, Optional, Union
+from bot.utils.cache import LRUCache, disk_cache_from_env
 from bot.utils.emoji import is_custom_emoji, emoji_to_codepoint
+from bot.ui.renderers.profile_card import run_render
+
+BADGE_SIZE = (40, 40)
+
+# Tier 1: decoded, pre-resized RGBA images (read-only once cached)
+_badge_cache = LRUCache(maxsize=int(os.getenv("BADGE_CACHE_SIZE", "512")), name="badge_icons")
+# Tier 2: resized PNGs on disk, keyed by emoji id / Twemoji codepoint (optional)
+_badge_disk = disk_cache_from_env("BADGE_CACHE_DIR", suffix=".png")
+# Bound on concurrent CDN downloads for one or many renders
+_fetch_semaphore = asyncio.Semaphore(int(os.getenv("BADGE_FETCH_CONCURRENCY", "4")))
+
+_counters = {"disk_hits": 0, "fetches": 0, "fetch_failures": 0}
+
+def badge_cache_stats() -> Dict[str, float]:
+    return {**_badge_cache.stats(), **_counters}
+
+def _badge_key(emoji: str) -> str:
+    if is_custom_emoji(emoji):
+        return "custom_" + emoji.rsplit(":", 1)[1][:-1]
+    return "tw_" + emoji_to_codepoint(emoji)
+
+def _to_badge(img: Image.Image) -> Image.Image:
+    img = img.convert("RGBA")
+    return img if img.size == BADGE_SIZE else img.resize(BADGE_SIZE)
+
+def _persist(key: str, img: Image.Image) -> None:
+    if _badge_disk:
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        _badge_disk.set(key, buf.getvalue())
+
+def _load_local(key: str, emoji: str) -> Optional[Image.Image]:
+    """Disk tier, then the bundled Twemoji PNG for unicode emojis. Blocking."""
+    if _badge_disk:
+        data = _badge_disk.get(key)
+        if data:
+            _counters["disk_hits"] += 1
+            return _to_badge(Image.open(io.BytesIO(data)))
+    if is_custom_emoji(emoji):
+        return None
+    code = emoji_to_codepoint(emoji)
+    try:
+        img = _to_badge(Image.open(f"assets/twemoji/{code}.png"))
+    except FileNotFoundError:
+        print(f"⚠️ No Twemoji PNG found for {emoji} ({code})")
+        return None
+    _persist(key, img)
+    return img
+
+def _decode_and_persist(key: str, data: bytes) -> Image.Image:
+    img = _to_badge(Image.open(io.BytesIO(data)))
+    _persist(key, img)
+    return img
+
+async def _fetch_custom(emoji: str, session: aiohttp.ClientSession) -> Optional[bytes]:
+    # Extract ID from <:name:id> or <a:name:id>
+    emoji_id = emoji.rsplit(":", 1)[1][:-1]
+    ext = "gif" if emoji.startswith("<a:") else "png"
+    url = f"https://cdn.discordapp.com/emojis/{emoji_id}.{ext}"
+    async with _fetch_semaphore:
+        _counters["fetches"] += 1
+        try:
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    return await resp.read()
+                status = f"HTTP {resp.status}"
+        except aiohttp.ClientError as e:
+            status = str(e)
+    _counters["fetch_failures"] += 1
+    print(f"⚠️ Failed to fetch custom emoji {emoji_id}: {status}")
+    return None
+
+async def _resolve_badge(emoji: str, session: aiohttp.ClientSession) -> Union[Image.Image, str]:
+    try:
+        key = _badge_key(emoji)
+        img = _badge_cache.get(key)
+        if img is not None:
+            return img
+
+        img = await run_render(_load_local, key, emoji)
+        if img is None and is_custom_emoji(emoji):
+            data = await _fetch_custom(emoji, session)
+            if data:
+                img = await run_render(_decode_and_persist, key, data)
+        if img is None:
+            return emoji  # text fallback, retried next render
+        _badge_cache.set(key, img)
+        return img
+    except Exception as e:
+        print(f"❌ Error processing {emoji}: {e}")
+        return emoji or "❔"
 
 async def extract_badge_icons(emojis: List[str], session: aiohttp.ClientSession) -> List[Union[Image.Image, str]]:
     """
     Given a list of emoji strings (custom or unicode),
-    return a list of Pillow Image objects or emoji strings as fallback.
+    return a list of 40x40 Pillow Image objects or emoji strings as fallback.
+    Cache misses are fetched concurrently; order is preserved.
     """
-    icons: List[Union[Image.Image, str]] = []
-
-    for emoji in emojis:
-        try:
-            if is_custom_emoji(emoji):
-                # Extract ID from <:name:id> or <a:name:id>
-                emoji_id = emoji.rsplit(":", 1)[1][:-1]
-                ext = "gif" if emoji.startswith("<a:") else "png"
-                url = f"https://cdn.discordapp.com/emojis/{emoji_id}.{ext}"
-                async with session.get(url) as resp:
-                    if resp.status == 200:
-                        img_bytes = await resp.read()
-                        icons.append(Image.open(io.BytesIO(img_bytes)).convert("RGBA"))
-                        continue  # move to next emoji
-                    else:
-                        print(f"⚠️ Failed to fetch custom emoji {emoji_id}: HTTP {resp.status}")
-                        icons.append(emoji)
-                        continue
-
-            # Unicode emoji → Twemoji PNG
-            code = emoji_to_codepoint(emoji)
-            path = f"assets/twemoji/{code}.png"
-            try:
-                icons.append(Image.open(path).convert("RGBA"))
-            except FileNotFoundError:
-                print(f"⚠️ No Twemoji PNG found for {emoji} ({code})")
-                icons.append(emoji)
-
-        except Exception as e:
-            print(f"❌ Error processing {emoji}: {e}")
-            icons.append(emoji or "❔")
-
-    return icons
\ No newline at end of file
+    return list(await asyncio.gather(*(_resolve_badge(e, session) for e in emojis)))
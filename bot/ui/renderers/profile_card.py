@@ -1,57 +1,126 @@
 # bot/ui/renderers/profile_card.py
 from PIL import Image, ImageDraw, ImageFont, ImageOps
+import asyncio
+import functools
 import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from bot.config.constants import CURRENCY
-from typing import List, Union
+from typing import List, Optional, Union
+
+# Bump whenever the layout, assets or fonts change: part of the rendered-card cache key
+RENDERER_VERSION = 1
+
+BACKGROUND_PATH = "assets/backgrounds/default_bg.png"
+FONT_PATH = "assets/fonts/Finlandica-Medium.ttf"  # update to your font
+FONT_NAME_PATH = "assets/fonts/SofiaSansCondensed-Bold.ttf"
+FONT_TITLE_PATH = "assets/fonts/SofiaSansCondensed-Italic.ttf"
+COIN_PATH = "assets/twemoji/1fa99.png"  # 🪙 coin
+BILL_PATH = "assets/twemoji/1f4b4.png"  # 💴 yen bill
+
+# --- Preloaded assets ---------------------------------------------------------
+
+@dataclass(frozen=True)
+class ProfileCardAssets:
+    """Everything a card needs from disk, decoded once. Treat the images as read-only."""
+    background: Image.Image
+    coin: Image.Image
+    bill: Image.Image
+    font_name: ImageFont.ImageFont
+    font_title: ImageFont.ImageFont
+    font_big: ImageFont.ImageFont
+    font_small: ImageFont.ImageFont
+    font_emoji: ImageFont.ImageFont
+
+def load_profile_card_assets() -> ProfileCardAssets:
+    background = Image.open(BACKGROUND_PATH).convert("RGBA")
+    background.load()
+    try:
+        font_name = ImageFont.truetype(FONT_NAME_PATH, 32)
+        font_title = ImageFont.truetype(FONT_TITLE_PATH, 26)
+        font_big = ImageFont.truetype(FONT_PATH, 24)
+        font_small = ImageFont.truetype(FONT_PATH, 20)
+        font_emoji = ImageFont.truetype(FONT_PATH, 40)
+    except IOError:
+        print("⚠️ Profile card fonts not found, using the default font.")
+        font_title = font_name = font_big = font_small = font_emoji = ImageFont.load_default()
+    return ProfileCardAssets(
+        background=background,
+        coin=Image.open(COIN_PATH).resize((20, 20)).convert("RGBA"),
+        bill=Image.open(BILL_PATH).resize((20, 20)).convert("RGBA"),
+        font_name=font_name,
+        font_title=font_title,
+        font_big=font_big,
+        font_small=font_small,
+        font_emoji=font_emoji,
+    )
+
+_assets: Optional[ProfileCardAssets] = None
+_assets_lock = threading.Lock()
+
+def get_profile_card_assets() -> ProfileCardAssets:
+    """Assets loaded on first use (normally at startup via preload_profile_card_assets)."""
+    global _assets
+    if _assets is None:
+        with _assets_lock:
+            if _assets is None:
+                _assets = load_profile_card_assets()
+    return _assets
+
+# --- Render executor ----------------------------------------------------------
+# One worker: FreeType font objects are shared and not safe to draw with from
+# several threads at once. Pillow releases the GIL while encoding, so the loop
+# stays responsive either way.
+render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+
+async def run_render(fn, /, *args, **kwargs):
+    """Run a blocking Pillow callable on the render executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(render_executor, functools.partial(fn, *args, **kwargs))
+
+async def preload_profile_card_assets() -> ProfileCardAssets:
+    return await run_render(get_profile_card_assets)
+
+# --- Rendering ----------------------------------------------------------------
 
 def generate_profile_card(
-    user_avatar_bytes: bytes,
+    avatar: Union[bytes, Image.Image],
     display_name: str,
     points: int,
     total_earned: int,
     title: str | None,
-    badges: List[Union[Image.Image, str]]
+    badges: List[Union[Image.Image, str]],
+    assets: ProfileCardAssets | None = None,
 ) -> io.BytesIO:
-    """Generate a profile card image from real data with emoji or image badges."""
-    base = Image.open("assets/backgrounds/default_bg.png").convert("RGBA")
+    """
+    Generate a profile card image from real data with emoji or image badges. Blocking: use run_render.
+    avatar is either raw image bytes or an already masked 120x120 tile (avatar_loader).
+    """
+    assets = assets or get_profile_card_assets()
+    base = assets.background.copy()
     draw = ImageDraw.Draw(base)
 
-    try:
-        font_path = "assets/fonts/Finlandica-Medium.ttf"  # update to your font
-        font_name = ImageFont.truetype("assets/fonts/SofiaSansCondensed-Bold.ttf", 32)
-        font_title = ImageFont.truetype("assets/fonts/SofiaSansCondensed-Italic.ttf", 26)
-        font_big = ImageFont.truetype(font_path, 24)
-        font_small = ImageFont.truetype(font_path, 20)
-        font_emoji = ImageFont.truetype(font_path, 40)
-    except IOError:
-        font_title = font_name = font_big = font_small = font_emoji = ImageFont.load_default()
-
     # Avatar
-    avatar = Image.open(io.BytesIO(user_avatar_bytes)).resize((120, 120)).convert("RGBA")
-    mask = Image.new("L", (120, 120), 0)
-    ImageDraw.Draw(mask).ellipse((0, 0, 120, 120), fill=255)
-    avatar.putalpha(mask)
+    if not isinstance(avatar, Image.Image):
+        from bot.ui.renderers.avatar_loader import make_avatar_tile  # avatar_loader imports this module
+        avatar = make_avatar_tile(avatar)
     base.paste(avatar, (30, 30), avatar)
 
     # Display name + title
-    draw.text((30, 170), display_name, font=font_name, fill="gold")
+    draw.text((30, 170), display_name, font=assets.font_name, fill="gold")
     if title:
-        draw.text((30, 200), title, font=font_title, fill="gold")
+        draw.text((30, 200), title, font=assets.font_title, fill="gold")
 
-    coin_path = "assets/twemoji/1fa99.png"  # 🪙 coin
-    coin_img = Image.open(coin_path).resize((20, 20)).convert("RGBA")
-    bill_path = "assets/twemoji/1f4b4.png"  # 💴 yen bill
-    bill_img = Image.open(bill_path).resize((20, 20)).convert("RGBA")
-    
     # Points
-    draw.text((370, 40), f"{CURRENCY.capitalize()}", font=font_big, fill="gold", anchor="ra")
-    draw.text((345, 80), f"{points} in wallet", font=font_small, fill="gold", anchor="ra")
-    base.paste(coin_img, (350 , 80), coin_img)
-    draw.text((345, 105), f"{total_earned} earned total", font=font_small, fill="gold", anchor="ra")
-    base.paste(bill_img, (350 , 105), bill_img)
+    draw.text((370, 40), f"{CURRENCY.capitalize()}", font=assets.font_big, fill="gold", anchor="ra")
+    draw.text((345, 80), f"{points} in wallet", font=assets.font_small, fill="gold", anchor="ra")
+    base.paste(assets.coin, (350 , 80), assets.coin)
+    draw.text((345, 105), f"{total_earned} earned total", font=assets.font_small, fill="gold", anchor="ra")
+    base.paste(assets.bill, (350 , 105), assets.bill)
 
     # Badges
-    draw.text((30, 240), "Badges", font=font_big, fill="gold")
+    draw.text((30, 240), "Badges", font=assets.font_big, fill="gold")
     start_x, start_y = 30, 280
     spacing = 60
     for idx, badge in enumerate(badges[:12]):
@@ -59,13 +128,13 @@ def generate_profile_card(
         y = start_y + (idx // 6) * spacing
 
         if isinstance(badge, Image.Image):
-            badge_resized = badge.resize((40, 40))
+            badge_resized = badge if badge.size == (40, 40) else badge.resize((40, 40))
             base.paste(badge_resized, (x, y), badge_resized)
         else:
-            draw.text((x + 10, y), badge, font=font_emoji, fill="gold")
+            draw.text((x + 10, y), badge, font=assets.font_emoji, fill="gold")
 
     # Output
     buffer = io.BytesIO()
     base.save(buffer, format="PNG")
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
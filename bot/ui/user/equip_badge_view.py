@@ -4,7 +4,7 @@ from discord import Interaction, SelectOption
 from discord.ui import View, Select, Button
 from typing import Optional, Callable, Awaitable, List
 
-from db.database import db_session
+from db.database import run_in_session
 from bot.crud.inventory_crud import set_badges_equipped
 from bot.config.constants import MAX_BADGES
 
@@ -61,8 +61,7 @@ class EquipBadgeSelect(Select):
 
         # 1) DB
         try:
-            with db_session() as session:
-                set_badges_equipped(session, self.user_db_id, selected_keys)
+            await run_in_session(set_badges_equipped, self.user_db_id, selected_keys)
         except Exception as e:
             print("❌ equip badges error:", e)
             await interaction.response.edit_message(content="❌ Failed to update badges.", view=None)
@@ -104,8 +103,7 @@ class UnequipAll(Button):
 
         # 1) DB
         try:
-            with db_session() as session:
-                set_badges_equipped(session, self.user_db_id, [])
+            await run_in_session(set_badges_equipped, self.user_db_id, [])
         except Exception as e:
             print("❌ unequip badges error:", e)
             await interaction.response.edit_message(content="❌ Failed to unequip badges.", view=None)
@@ -4,7 +4,7 @@ from discord import Interaction, SelectOption
 from discord.ui import View, Select, Button
 from typing import Optional, Callable, Awaitable, List
 
-from db.database import db_session
+from db.database import run_in_session
 from bot.crud.inventory_crud import set_titles_equipped
 
 # on_refresh_profile: a no-arg coroutine you pass from the cog that edits the public profile message.
@@ -60,8 +60,7 @@ class EquipTitleSelect(Select):
 
         # 1) update DB (quick; no defer)
         try:
-            with db_session() as session:
-                set_titles_equipped(session, self.user_db_id, selected_key)
+            await run_in_session(set_titles_equipped, self.user_db_id, selected_key)
         except Exception as e:
             print("❌ equip title error:", e)
             await interaction.response.edit_message(content="❌ Failed to update title.", view=None)
@@ -105,8 +104,7 @@ class UnequipTitle(Button):
 
         # 1) DB
         try:
-            with db_session() as session:
-                set_titles_equipped(session, self.user_db_id, None)
+            await run_in_session(set_titles_equipped, self.user_db_id, None)
         except Exception as e:
             print("❌ unequip title error:", e)
             await interaction.response.edit_message(content="❌ Failed to unequip title.", view=None)
@@ -2,6 +2,8 @@
 import discord
 from typing import Awaitable, Callable
 
+from bot.utils.metrics import timed_callback
+
 class ProfileView(discord.ui.View):
     def __init__(
         self,
@@ -26,10 +28,12 @@ class ProfileView(discord.ui.View):
         return True
 
     @discord.ui.button(label="Open Inventory", style=discord.ButtonStyle.primary, custom_id="profile:open_inventory")
+    @timed_callback("profile:open_inventory")
     async def open_inventory(self, interaction: discord.Interaction, _: discord.ui.Button):
         await self._on_open_inventory(interaction)
 
     @discord.ui.button(label="Equip Title", style=discord.ButtonStyle.secondary, custom_id="profile:equip_title")
+    @timed_callback("profile:equip_title")
     async def equip_title(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self.enable_equip:
             await interaction.response.send_message("You can’t change someone else’s title.", ephemeral=True)
@@ -37,6 +41,7 @@ class ProfileView(discord.ui.View):
         await self._on_equip_title(interaction)
 
     @discord.ui.button(label="Equip Badges", style=discord.ButtonStyle.secondary, custom_id="profile:equip_badges")
+    @timed_callback("profile:equip_badges")
     async def equip_badges(self, interaction: discord.Interaction, button: discord.ui.Button):
         if not self.enable_equip:
             await interaction.response.send_message("You can’t change someone else’s badges.", ephemeral=True)
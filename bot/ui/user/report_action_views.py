@@ -8,15 +8,17 @@ from bot.ui.common.selects import GenericSelectView, build_select_options_from_v
 from bot.presentation.user_actions_presentation import ActionOptionVM, get_event_pick_vms, get_event_and_action_vms, submit_report_action_presentation, build_action_report_success_message
 from bot.services.prompts_service import set_user_action_prompts
 from bot.services.event_triggers_service import apply_triggers_after_action_id
+from db.database import run_db
+from bot.utils.metrics import timed_callback
 
 # ----------------------- Event picker (reusable builder) -----------------------
 
-def make_event_select_view(owner_id: int) -> discord.ui.View | None:
+async def make_event_select_view(owner_id: int) -> discord.ui.View | None:
     """
     Build the event select view using our common GenericSelectView.
     Returns None if there are zero options (avoid empty Select -> 400).
     """
-    event_vms = get_event_pick_vms(limit=25)
+    event_vms = await run_db(get_event_pick_vms, limit=25)
     options = build_select_options_from_vms(
         event_vms,
         get_value=lambda vm: vm.value,
@@ -31,14 +33,14 @@ def make_event_select_view(owner_id: int) -> discord.ui.View | None:
             await inter.response.send_message("⛔ You can’t use this menu.", ephemeral=True)
             return
 
-        ev_vm, action_vms = get_event_and_action_vms(inter.user, event_key)
+        ev_vm, action_vms = await run_db(get_event_and_action_vms, inter.user, event_key)
 
         if ev_vm is None:
             await inter.response.edit_message(content="❌ Event not found.", view=None)
             return
 
         if not action_vms:
-            new_view = make_event_select_view(owner_id)
+            new_view = await make_event_select_view(owner_id)
             if new_view is None:
                 await inter.response.edit_message(
                     content=f"⚠️ No actions available for **{ev_vm.name}**.\nTry again later.",
@@ -93,7 +95,8 @@ def make_action_select_view(owner_id: int, event_id: int, actions: list[ActionOp
         # --- Auto-submit path (no input fields) ---
         if not vm.input_fields:
             try:
-                result = submit_report_action_presentation(
+                result = await run_db(
+                    submit_report_action_presentation,
                     inter.user,
                     action_event_id=action_event_id,
                     url_value=None, numeric_value=None, text_value=None,
@@ -116,7 +119,7 @@ def make_action_select_view(owner_id: int, event_id: int, actions: list[ActionOp
     
             try:
                 from bot.services.event_triggers_service import apply_triggers_after_action_id
-                grant_lines = apply_triggers_after_action_id(result.user_action_id)
+                grant_lines = await run_db(apply_triggers_after_action_id, result.user_action_id)
             except Exception as e:
                 print(f"[ActionSelect] trigger check error: {e}")
                 grant_lines = []
@@ -174,6 +177,7 @@ class ReportActionModal(ui.Modal, title="Report an action"):
             self.add_item(comp)
             self.inputs[f] = comp
 
+    @timed_callback("report_action:submit")
     async def on_submit(self, interaction: Interaction):
         try:
             url = num = txt = boo = dat = None
@@ -217,7 +221,8 @@ class ReportActionModal(ui.Modal, title="Report an action"):
                     return
                 dat = raw
     
-            result = submit_report_action_presentation(
+            result = await run_db(
+                submit_report_action_presentation,
                 interaction.user,
                 action_event_id=self.action_event_id,
                 url_value=url, numeric_value=num, text_value=txt,
@@ -235,7 +240,7 @@ class ReportActionModal(ui.Modal, title="Report an action"):
             # 🧩 Handle prompt case if required
             if self.vm.prompts_required:
                 from bot.services.prompts_service import picker_prompts_for_action_event
-                prompts = picker_prompts_for_action_event(self.action_event_id)
+                prompts = await run_db(picker_prompts_for_action_event, self.action_event_id)
     
                 if prompts:
                     from bot.ui.user.report_action_views import PromptPaginatedView
@@ -251,7 +256,7 @@ class ReportActionModal(ui.Modal, title="Report an action"):
     
             try:
                 from bot.services.event_triggers_service import apply_triggers_after_action_id
-                grant_lines = apply_triggers_after_action_id(result.user_action_id)
+                grant_lines = await run_db(apply_triggers_after_action_id, result.user_action_id)
             except Exception as e:
                 print(f"[Modal] trigger check error: {e}")
                 grant_lines = []
@@ -410,6 +415,7 @@ class SubmitButton(discord.ui.Button):
         super().__init__(label="✅ Submit Selection", style=discord.ButtonStyle.success, row=3)
         self.view_ref = view
 
+    @timed_callback("report_action:prompts_submit")
     async def callback(self, interaction: discord.Interaction):
         view = self.view_ref
 
@@ -419,7 +425,8 @@ class SubmitButton(discord.ui.Button):
 
         try:
             from bot.services.prompts_service import set_user_action_prompts
-            set_user_action_prompts(
+            await run_db(
+                set_user_action_prompts,
                 user_action_id=view.user_action_id,
                 event_prompt_ids=list(view.selected_ids)
             )
@@ -431,7 +438,8 @@ class SubmitButton(discord.ui.Button):
             # Trigger grants (prompt-dependent triggers fire here)
             try:
                 from bot.services.event_triggers_service import apply_triggers_after_action_id
-                grant_lines = apply_triggers_after_action_id(
+                grant_lines = await run_db(
+                    apply_triggers_after_action_id,
                     view.user_action_id,
                     current_prompt_ids=view.selected_ids
                 )
@@ -1,11 +1,12 @@
 from discord import app_commands, Interaction, SelectOption, Embed, ButtonStyle, ui, File
 from discord.ext import commands
 from discord.ui import View, Button, Select
-from db.database import db_session
+from db.database import run_in_session
 from bot.config.constants import CURRENCY
 from bot.crud import users_crud
 from bot.crud.shop_crud import get_inshop_catalog_grouped
-from bot.crud.purchase_crud import fetch_reward_event, apply_purchase, PurchaseError
+from bot.crud.purchase_crud import purchase_reward, PurchaseError
+from bot.utils.metrics import timed_callback
 from collections import defaultdict
 
 TYPE_LABELS = {
@@ -43,34 +44,38 @@ def _items_for_type_tab(self):
                 out.append({**it, "_event_name": ev_name})
     return out
 
+def _purchase(session, member, reward_event_key: str):
+    """
+    Runs on the DB executor. Returns the PurchaseResult on success,
+    or the PurchaseError (rejections are not DB failures, nothing was written).
+    """
+    user_id = users_crud.get_or_create_user_id(session, member)
+    try:
+        return purchase_reward(session, user_id, reward_event_key)
+    except PurchaseError as e:
+        return e
+
 class ShopSelect(Select):
     def __init__(self, options):
         super().__init__(placeholder="Choose a reward to buy…", min_values=1, max_values=1, options=options)
 
+    @timed_callback("shop:purchase")
     async def callback(self, interaction: Interaction):
         value = self.values[0]  # reward_event_key
         async with interaction.channel.typing():
-            with db_session() as session:
-                user = users_crud.get_or_create_user(session, interaction.user)
-                print("before the try block")
-                try:
-                    
-                    re, rw, ev = fetch_reward_event(session, value)
-                    inv, price = apply_purchase(session, user, re, rw)
-                    reward_name=rw.reward_name
-                    event_name=ev.event_name
-                    session.flush()
-                    
-                except PurchaseError as e:
-                    await interaction.response.send_message(f"❌ {e}", ephemeral=True)
-                    return
-                except Exception as e:
-                    session.rollback()
-                    await interaction.response.send_message("❌ Purchase failed. Try again.", ephemeral=True)
-                    return
+            try:
+                result = await run_in_session(_purchase, interaction.user, value)
+            except Exception as e:
+                print(f"❌ Purchase failed: {e}")
+                await interaction.response.send_message("❌ Purchase failed. Try again.", ephemeral=True)
+                return
+
+        if isinstance(result, PurchaseError):
+            await interaction.response.send_message(f"❌ {result}", ephemeral=True)
+            return
 
         await interaction.response.send_message(
-            f"✅ Purchased **{reward_name}** for **{price}** {CURRENCY} from **{event_name}**!",
+            f"✅ Purchased **{result.reward_name}** for **{result.price}** {CURRENCY} from **{result.event_name}**!",
             ephemeral=True
         )
 
@@ -0,0 +1,208 @@
+# bot/utils/cache.py
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+# ---------------------------------------------------------------------------
+# In-memory LRU
+# ---------------------------------------------------------------------------
+# Thread-safe: caches are read from the event loop and filled from the
+# DB / render executors.
+
+_registry: List["LRUCache"] = []
+
+class LRUCache:
+    """Size-bounded mapping that evicts the least recently used entry, with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 256, name: Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.name = name
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if name:
+            _registry.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+def all_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every named cache, for diagnostics."""
+    return {c.name: c.stats() for c in _registry}
+
+# ---------------------------------------------------------------------------
+# On-disk bytes store
+# ---------------------------------------------------------------------------
+
+def digest(*parts: Any) -> str:
+    """Stable hex key for a tuple of primitives (repr-based; keep parts simple)."""
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+class DiskCache:
+    """
+    Flat directory of <key><suffix> files. Blocking I/O: call it from an executor.
+    Writes are atomic (temp file + rename), so concurrent readers never see partial files.
+
+    Optionally bounded: every `prune_every` writes, files older than
+    `max_age` seconds are removed, then the least recently used ones (reads
+    refresh the mtime) beyond `max_files`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        suffix: str = ".bin",
+        *,
+        max_files: Optional[int] = None,
+        max_age: Optional[float] = None,
+        prune_every: int = 100,
+    ):
+        self.directory = directory
+        self.suffix = suffix
+        self.max_files = max_files
+        self.max_age = max_age
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_files is not None or self.max_age is not None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"⚠️ Disk cache read failed for {key}: {e}")
+            return None
+        if self.bounded:
+            try:
+                os.utime(path)      # LRU order for prune()
+            except OSError:
+                pass
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        tmp = None
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+            tmp = None
+        except OSError as e:
+            print(f"⚠️ Disk cache write failed for {key}: {e}")
+        finally:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        if self.bounded:
+            with self._lock:
+                self._writes += 1
+                due = self._writes % self.prune_every == 0
+            if due:
+                self.prune()
+
+    def prune(self) -> int:
+        """Apply max_age / max_files now. Returns the number of files removed."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.suffix) and entry.is_file():
+                        try:
+                            entries.append((entry.stat().st_mtime, entry.path))
+                        except FileNotFoundError:
+                            pass
+        except OSError as e:
+            print(f"⚠️ Disk cache prune failed for {self.directory}: {e}")
+            return 0
+
+        entries.sort()      # oldest first
+        doomed = []
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            doomed = [path for mtime, path in entries if mtime < cutoff]
+            entries = entries[len(doomed):]
+        if self.max_files is not None and len(entries) > self.max_files:
+            doomed += [path for _, path in entries[: len(entries) - self.max_files]]
+
+        removed = 0
+        for path in doomed:
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"⚠️ Disk cache prune failed for {path}: {e}")
+        return removed
+
+def disk_cache_from_env(
+    var: str, suffix: str = ".bin", *, max_files: Optional[int] = None, max_age: Optional[float] = None,
+) -> Optional[DiskCache]:
+    """DiskCache rooted at $var, or None when persistence is not configured."""
+    directory = os.getenv(var)
+    return DiskCache(directory, suffix=suffix, max_files=max_files, max_age=max_age) if directory else None
@@ -0,0 +1,34 @@
+# bot/utils/command_tree.py
+import discord
+from discord import app_commands
+
+from db.instrumentation import SLOW_QUERY_MS, trace_command
+from bot.utils.metrics import track_interaction
+
+def command_name(interaction: discord.Interaction) -> str:
+    """Qualified slash command name from the raw payload (group subcommand ...)."""
+    data = interaction.data or {}
+    parts = [data.get("name") or "unknown"]
+    options = data.get("options") or []
+    # subcommand groups (2) and subcommands (1) nest their own options
+    while options and options[0].get("type") in (1, 2):
+        parts.append(options[0]["name"])
+        options = options[0].get("options") or []
+    name = " ".join(parts)
+    if interaction.type == discord.InteractionType.autocomplete:
+        name += " (autocomplete)"
+    return name
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """
+    CommandTree that traces the SQL issued by each slash command (see
+    db/instrumentation.py) and times its responses (see bot/utils/metrics.py).
+    """
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        name = command_name(interaction)
+        with trace_command(name) as trace, track_interaction(interaction, "command", name):
+            await super()._call(interaction)
+        if trace.db_time * 1000 >= SLOW_QUERY_MS:
+            top = "; ".join(f"{t * 1000:.0f} ms {sql[:120]}" for t, sql in trace.slowest)
+            print(f"🐢 /{trace.command}: {trace.queries} queries, {trace.db_time * 1000:.0f} ms DB — {top}")
@@ -1,6 +1,13 @@
 # utils/csv_export.py
-from io import StringIO
 import csv
+import gzip
+import os
+import tempfile
+from dataclasses import dataclass
+from io import StringIO
+from typing import IO, Any, Iterable, List, Optional, Sequence
+
+import discord
 
 def tablevm_to_csv_bytes(title: str, columns: list[str], rows: list[list[str]]) -> bytes:
     buf = StringIO()
@@ -11,3 +18,106 @@ def tablevm_to_csv_bytes(title: str, columns: list[str], rows: list[list[str]])
     for r in rows:
         writer.writerow(r)
     return buf.getvalue().encode("utf-8")
+
+# ---------------------------------------------------------------------------
+# Streaming export
+# ---------------------------------------------------------------------------
+# Rows are encoded one at a time into a spooled temp file (memory up to
+# CSV_SPOOL_BYTES, then disk), optionally gzipped, and a new part is started
+# whenever the next row would push the current one past the attachment cap.
+# Each part repeats the preamble and header so it opens on its own.
+# Memory stays flat: feed it a generator (e.g. a yield_per query).
+
+DISCORD_ATTACHMENT_LIMIT = int(os.getenv("DISCORD_ATTACHMENT_LIMIT", str(8 * 1024 * 1024)))   # bytes per file
+CSV_SPOOL_BYTES = int(os.getenv("CSV_SPOOL_BYTES", str(1024 * 1024)))
+CSV_EXPORT_GZIP = os.getenv("CSV_EXPORT_GZIP", "false").lower() == "true"      # default for exports
+CSV_GZIP_SLACK = 64 * 1024      # compressed bytes zlib may still hold in its buffers
+
+@dataclass(frozen=True)
+class CsvPart:
+    filename: str
+    file: IO[bytes]     # positioned at 0, caller closes (discord.File does)
+    size: int
+    rows: int
+
+class _PartWriter:
+    def __init__(self, compress: bool):
+        self.raw = tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_BYTES, mode="w+b")
+        self.out = gzip.GzipFile(fileobj=self.raw, mode="wb") if compress else self.raw
+        self.compress = compress
+        self.rows = 0
+
+    def size(self) -> int:
+        return self.raw.tell() + (CSV_GZIP_SLACK if self.compress else 0)
+
+    def write(self, data: bytes) -> None:
+        self.out.write(data)
+
+    def close(self) -> tuple[IO[bytes], int]:
+        if self.compress:
+            self.out.close()    # flushes the gzip trailer, leaves raw open
+        size = self.raw.tell()
+        self.raw.seek(0)
+        return self.raw, size
+
+def write_csv_parts(
+    rows: Iterable[Sequence[Any]],
+    header: Sequence[str],
+    *,
+    filename: str,
+    preamble: Sequence[Sequence[Any]] = (),
+    compress: Optional[bool] = None,
+    max_bytes: Optional[int] = None,
+) -> List[CsvPart]:
+    """
+    Stream rows to one or more CSV files of at most max_bytes (default: the
+    Discord attachment cap). Single output keeps `filename`; otherwise parts are
+    named name.part1.csv, name.part2.csv, ... (+ .gz when compressed;
+    compress=None follows CSV_EXPORT_GZIP).
+    """
+    limit = max_bytes or DISCORD_ATTACHMENT_LIMIT
+    compress = CSV_EXPORT_GZIP if compress is None else compress
+    line = StringIO()
+    writer = csv.writer(line)
+
+    def encode(row) -> bytes:
+        line.seek(0)
+        line.truncate()
+        writer.writerow(row)
+        return line.getvalue().encode("utf-8")
+
+    head = b"".join(encode(r) for r in (*preamble, header))
+    done: list[tuple[IO[bytes], int, int]] = []
+    part = _PartWriter(compress)
+    part.write(head)
+
+    for row in rows:
+        data = encode(row)
+        # compressed parts are checked on their output size, plain ones on what was written
+        projected = part.size() + (len(data) if not compress else 0)
+        if part.rows and projected > limit:
+            done.append((*part.close(), part.rows))
+            part = _PartWriter(compress)
+            part.write(head)
+        part.write(data)
+        part.rows += 1
+    done.append((*part.close(), part.rows))
+
+    stem, ext = os.path.splitext(filename)
+    ext = (ext or ".csv") + (".gz" if compress else "")
+    if len(done) == 1:
+        f, size, n = done[0]
+        return [CsvPart(filename=f"{stem}{ext}", file=f, size=size, rows=n)]
+    return [
+        CsvPart(filename=f"{stem}.part{i}{ext}", file=f, size=size, rows=n)
+        for i, (f, size, n) in enumerate(done, 1)
+    ]
+
+async def send_csv_parts(send, parts: List[CsvPart], *, content: str, **kwargs) -> None:
+    """
+    Upload parts with `send` (interaction.followup.send, channel.send...), one
+    file per message so every upload stays under the per-request cap.
+    """
+    for i, part in enumerate(parts, 1):
+        label = content if len(parts) == 1 else f"{content} (part {i}/{len(parts)}, {part.rows} rows)"
+        await send(content=label, file=discord.File(part.file, filename=part.filename), **kwargs)
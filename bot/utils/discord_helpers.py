@@ -1,7 +1,7 @@
 # bot/utils/discord_helpers.py
 import discord
 from discord import Message
-from typing import Optional
+from typing import Mapping, Optional
 from bot.config.constants import TRIGGER_TYPES
 from bot.services.prompts_service import get_prompt_dto_by_code_and_event
 from bot.services.action_events_service import get_action_event_dto_by_id
@@ -42,7 +42,20 @@ def get_trigger_label(trigger_type: str) -> Optional[str]:
             return label
     return trigger_type
 
-def format_trigger_label(trigger_type: str, config: dict, event_id: int) -> str:
+def format_trigger_label(
+    trigger_type: str,
+    config: dict,
+    event_id: int,
+    *,
+    prompt_labels: Optional[Mapping[str, str]] = None,
+    action_event_labels: Optional[Mapping[int, str]] = None,
+) -> str:
+    """
+    Human label for a trigger. Pass pre-resolved lookups to render without any DB access:
+      prompt_labels:       {prompt_code: prompt label} for the event
+      action_event_labels: {action_event_id: action description}
+    Without them, labels are resolved through the services (one session each).
+    """
     desc_template = next(
         (desc for key, _, _, desc in TRIGGER_TYPES if key == trigger_type), 
         "Trigger"
@@ -54,19 +67,33 @@ def format_trigger_label(trigger_type: str, config: dict, event_id: int) -> str:
     if trigger_type == "prompt_repeat":
         code = config.get("prompt_code")
         if code:
-            prompt = get_prompt_dto_by_code_and_event(code, event_id)
-            if prompt:
-                y = f'"{prompt.label}" ({prompt.code})'
+            if prompt_labels is not None:
+                label = prompt_labels.get(code)
+            else:
+                prompt = get_prompt_dto_by_code_and_event(code, event_id)
+                label = prompt.label if prompt else None
+            if label:
+                y = f'"{label}" ({code})'
             else:
                 y = f'({code})'
     elif trigger_type == "action_repeat":
         ae_id = config.get("action_event_id")
         if ae_id:
-            ae = get_action_event_dto_by_id(ae_id)
-            if ae:
-                y = f'"{ae.action_description}"'
+            if action_event_labels is not None:
+                description = action_event_labels.get(_as_int_or_none(ae_id))
+            else:
+                ae = get_action_event_dto_by_id(ae_id)
+                description = ae.action_description if ae else None
+            if description:
+                y = f'"{description}"'
             else:
                 y = f'#{ae_id}'
 
     result = desc_template.replace("X", str(x)).replace("Y", y)
-    return result
\ No newline at end of file
+    return result
+
+def _as_int_or_none(v) -> Optional[int]:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,43 @@
+# bot/utils/http_client.py
+import os
+from typing import Optional
+
+import aiohttp
+
+# One keep-alive client for CDN/API downloads (avatars, emojis, preflight).
+# Created in setup_hook, closed on shutdown; get_http_client() also creates it
+# lazily so code running before setup_hook (preflight) or in scripts still works.
+
+HTTP_LIMIT = int(os.getenv("HTTP_LIMIT", "50"))                    # total pooled connections
+HTTP_LIMIT_PER_HOST = int(os.getenv("HTTP_LIMIT_PER_HOST", "10"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))              # seconds, whole request
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_DNS_TTL = int(os.getenv("HTTP_DNS_TTL", "300"))               # seconds
+
+_session: Optional[aiohttp.ClientSession] = None
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_LIMIT,
+        limit_per_host=HTTP_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_TTL,
+        keepalive_timeout=60,
+    )
+    timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+def get_http_client() -> aiohttp.ClientSession:
+    """The shared client. Do not close it (and do not use it as `async with`)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = _build_session()
+    return _session
+
+async def start_http_client() -> aiohttp.ClientSession:
+    return get_http_client()
+
+async def close_http_client() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,311 @@
+# bot/utils/metrics.py
+import asyncio
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import discord
+from aiohttp import web
+
+# ---------------------------------------------------------------------------
+# Interaction latency metrics + Prometheus text endpoint
+# ---------------------------------------------------------------------------
+# Every slash command (InstrumentedCommandTree) and every @timed_callback view
+# callback is wrapped in track_interaction(); the first InteractionResponse
+# call (defer, send_message, edit_message, send_modal...) stamps the time to
+# first response. Discord drops interactions not acknowledged within 3 s of
+# their creation, so dispatch delay + time to first response is what counts.
+#
+# METRICS_PORT enables a local HTTP server exposing /metrics (off by default).
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))                  # 0 = disabled
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))     # seconds between probes
+INTERACTION_DEADLINE = 3.0
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 2.5, 3.0, 5.0, 10.0, 30.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(pairs: Iterable[Tuple[str, str]], extra: str = "") -> str:
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    if extra:
+        body = f"{body},{extra}" if body else extra
+    return "{" + body + "}" if body else ""
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values. Thread-safe."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}    # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *labelvalues: str) -> int:
+        with self._lock:
+            series = self._series.get(labelvalues)
+            return series[-1] if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for values, series in items:
+            pairs = list(zip(self.labelnames, values))
+            bounds = [*(str(b) for b in self.buckets), "+Inf"]
+            for bound, n in zip(bounds, [*series[:-2], series[-1]]):
+                le = 'le="' + bound + '"'
+                lines.append(f"{self.name}_bucket{_labels(pairs, le)} {n}")
+            lines.append(f"{self.name}_sum{_labels(pairs)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(pairs)} {series[-1]}")
+        return lines
+
+class Counter:
+    """Monotonic counter keyed by label values. Thread-safe."""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for values, n in items:
+            lines.append(f"{self.name}{_labels(zip(self.labelnames, values))} {n}")
+        return lines
+
+dispatch_delay = Histogram(
+    "dw_interaction_dispatch_delay_seconds", "Interaction age when its handler started.", ("kind",))
+first_response = Histogram(
+    "dw_interaction_first_response_seconds", "Handler start to first interaction response.", ("kind", "name"))
+time_to_defer = Histogram(
+    "dw_interaction_defer_seconds", "Handler start to defer, when the first response was a defer.", ("kind", "name"))
+handler_time = Histogram(
+    "dw_interaction_handler_seconds", "Total handler time.", ("kind", "name"))
+late_responses = Counter(
+    "dw_interaction_late_total", "Interactions first answered after the 3 s deadline.", ("kind", "name"))
+unanswered = Counter(
+    "dw_interaction_unanswered_total", "Handlers that returned without responding.", ("kind", "name"))
+loop_lag = Histogram(
+    "dw_event_loop_lag_seconds", "Extra delay of a periodic event-loop wakeup.", (), LAG_BUCKETS)
+
+METRICS: List = [dispatch_delay, first_response, time_to_defer, handler_time, late_responses, unanswered, loop_lag]
+
+# --- interaction tracking ---
+
+class InteractionTiming:
+    def __init__(self, kind: str, name: str, age: float):
+        self.kind = kind
+        self.name = name
+        self.age = age                      # seconds since Discord created the interaction
+        self.started = time.perf_counter()
+        self.responded: Optional[float] = None
+        self.response_type: Optional[str] = None
+
+    def mark_response(self, response_type: str) -> None:
+        if self.responded is None:
+            self.responded = time.perf_counter() - self.started
+            self.response_type = response_type
+
+current_timing: ContextVar[Optional[InteractionTiming]] = ContextVar("current_timing", default=None)
+
+def _interaction_age(interaction) -> float:
+    created = getattr(interaction, "created_at", None)
+    if created is None:
+        return 0.0
+    return max(0.0, (datetime.now(timezone.utc) - created).total_seconds())
+
+@contextmanager
+def track_interaction(interaction, kind: str, name: str):
+    """Time one handler; responses made inside it (or its tasks) stamp the timing."""
+    timing = InteractionTiming(kind, name, _interaction_age(interaction))
+    token = current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        current_timing.reset(token)
+        dispatch_delay.observe(timing.age, kind)
+        handler_time.observe(time.perf_counter() - timing.started, kind, name)
+        if timing.responded is None:
+            unanswered.inc(kind, name)
+        else:
+            first_response.observe(timing.responded, kind, name)
+            if timing.response_type == "defer":
+                time_to_defer.observe(timing.responded, kind, name)
+            if timing.age + timing.responded > INTERACTION_DEADLINE:
+                late_responses.inc(kind, name)
+
+def timed_callback(name: Optional[str] = None):
+    """
+    Decorator for view/modal callbacks, labelled `name` or the callback's
+    qualified name (auto-generated custom_ids are random per view, so they
+    would make one series per message).
+    """
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            interaction = next((a for a in args if isinstance(a, discord.Interaction)), None)
+            with track_interaction(interaction, "component", label):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+_RESPONSE_METHODS = ("defer", "send_message", "edit_message", "send_modal", "autocomplete", "pong")
+_hooks_installed = False
+
+def install_response_hooks() -> None:
+    """Wrap InteractionResponse's initial-response methods to stamp the current timing (idempotent)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    for method in _RESPONSE_METHODS:
+        original = getattr(discord.InteractionResponse, method, None)
+        if original is None:
+            continue
+
+        def make(method=method, original=original):
+            @functools.wraps(original)
+            async def wrapper(self, *args, **kwargs):
+                result = await original(self, *args, **kwargs)
+                timing = current_timing.get()
+                if timing is not None:
+                    timing.mark_response(method)
+                return result
+            return wrapper
+        setattr(discord.InteractionResponse, method, make())
+    _hooks_installed = True
+
+# --- event loop lag ---
+
+_lag_state = {"last": 0.0, "max": 0.0}
+
+async def monitor_loop_lag(interval: float = LOOP_LAG_INTERVAL) -> None:
+    """Sleep `interval` forever; any extra delay before waking up is loop lag."""
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - t0 - interval)
+        loop_lag.observe(lag)
+        _lag_state["last"] = lag
+        _lag_state["max"] = max(_lag_state["max"], lag)
+
+# --- exposition ---
+
+def _gauges(name: str, help: str, samples: Iterable[Tuple[dict, float]], kind: str = "gauge") -> List[str]:
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels.items())} {value}")
+    return lines
+
+def _pool_lines() -> List[str]:
+    from db.database import get_pool_stats
+    lines = []
+    for key, value in get_pool_stats().items():
+        lines += _gauges(f"dw_db_pool_{key}", f"Connection pool {key.replace('_', ' ')}.", [({}, value)])
+    return lines
+
+def _cache_lines() -> List[str]:
+    from bot.utils.cache import all_cache_stats
+    stats = all_cache_stats()
+    lines = []
+    for key, kind in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("size", "gauge"), ("hit_rate", "gauge")):
+        lines += _gauges(
+            f"dw_cache_{key}" + ("_total" if kind == "counter" else ""),
+            f"In-process cache {key.replace('_', ' ')}.",
+            [({"cache": name}, s[key]) for name, s in sorted(stats.items())],
+            kind,
+        )
+    return lines
+
+def _badge_lines() -> List[str]:
+    from bot.ui.renderers.badge_loader import badge_cache_stats
+    stats = badge_cache_stats()
+    lines = []
+    for key in ("disk_hits", "fetches", "fetch_failures"):
+        lines += _gauges(f"dw_badge_{key}_total", f"Badge loader {key.replace('_', ' ')}.", [({}, stats[key])], "counter")
+    return lines
+
+def _loop_lines() -> List[str]:
+    return (
+        _gauges("dw_event_loop_lag_last_seconds", "Most recent event-loop lag probe.", [({}, _lag_state["last"])])
+        + _gauges("dw_event_loop_lag_max_seconds", "Largest event-loop lag seen.", [({}, _lag_state["max"])])
+    )
+
+COLLECTORS: List[Callable[[], List[str]]] = [_loop_lines, _pool_lines, _cache_lines, _badge_lines]
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines += metric.render()
+    for collect in COLLECTORS:
+        try:
+            lines += collect()
+        except Exception as e:
+            lines.append(f"# collector {collect.__name__} failed: {_escape(e)}")
+    return "\n".join(lines) + "\n"
+
+async def _metrics_handler(request: web.Request) -> web.Response:
+    # pool/cache stats take locks only; cheap enough to build on the loop
+    return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8")
+
+_runner: Optional[web.AppRunner] = None
+_lag_task: Optional[asyncio.Task] = None
+
+async def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> bool:
+    """Start the loop-lag probe and, when port is set, serve GET /metrics."""
+    global _runner, _lag_task
+    install_response_hooks()
+    if _lag_task is None or _lag_task.done():
+        _lag_task = asyncio.create_task(monitor_loop_lag())
+    if not port or _runner is not None:
+        return False
+    app = web.Application()
+    app.router.add_get("/metrics", _metrics_handler)
+    _runner = web.AppRunner(app, access_log=None)
+    await _runner.setup()
+    await web.TCPSite(_runner, host, port).start()
+    return True
+
+async def stop_metrics_server() -> None:
+    global _runner, _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
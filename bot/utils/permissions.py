@@ -19,4 +19,22 @@ async def is_admin_or_mod(interaction: Interaction) -> bool:
 
 def admin_or_mod_check():
     """Decorator for app commands that require admin or mod."""
-    return app_commands.check(is_admin_or_mod)
\ No newline at end of file
+    return app_commands.check(is_admin_or_mod)
+
+async def is_admin(interaction: Interaction) -> bool:
+    """True if invoker has the Administrator permission (mod roles are not enough)."""
+    try:
+        if interaction.guild is None:
+            return False
+        member = await interaction.guild.fetch_member(interaction.user.id)
+    except discord.NotFound:
+        return False
+
+    return member.guild_permissions.administrator
+
+def admin_only_check():
+    """Decorator for app commands that require Administrator; also hides them from non-admins in the client."""
+    def decorator(func):
+        func = app_commands.default_permissions(administrator=True)(func)
+        return app_commands.check(is_admin)(func)
+    return decorator
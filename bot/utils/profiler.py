@@ -0,0 +1,170 @@
+# bot/utils/profiler.py
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+# ---------------------------------------------------------------------------
+# On-demand profiling of the running bot (/admin_profile, /admin_slow_callbacks)
+# ---------------------------------------------------------------------------
+# Two modes, one at a time:
+# - sample: a background thread reads sys._current_frames() every
+#   PROFILE_SAMPLE_MS and counts whole stacks (collapsed format, one
+#   "frame;frame;frame count" line per stack, for flamegraph.pl / speedscope).
+#   Cheap enough to run in production.
+# - cprofile: deterministic cProfile for the duration, pstats output. Every
+#   call is hooked, so the bot runs noticeably slower while it is on.
+#
+# Slow callbacks: asyncio debug mode times every callback/task step on the
+# loop and logs the ones over slow_callback_duration; a handler on the
+# "asyncio" logger keeps them for /admin_slow_callbacks. Debug mode has its
+# own overhead, so it is off unless ASYNCIO_SLOW_CALLBACK_MS is set or an
+# admin turns it on.
+
+PROFILE_MAX_SECONDS = int(os.getenv("PROFILE_MAX_SECONDS", "120"))
+PROFILE_SAMPLE_MS = float(os.getenv("PROFILE_SAMPLE_MS", "5"))
+ASYNCIO_SLOW_CALLBACK_MS = float(os.getenv("ASYNCIO_SLOW_CALLBACK_MS", "0"))    # 0 = off
+SLOW_CALLBACK_LOG_SIZE = 100
+PSTATS_TOP = 60
+
+_profile_lock = threading.Lock()
+
+def _is_idle(leaf: str) -> bool:
+    """The loop waiting for I/O (BaseSelector.select and friends)."""
+    return leaf.startswith("selectors.py:") and leaf.endswith("select")
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+def _collapse(frame, root: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(root)
+    return ";".join(reversed(labels))
+
+def sample_stacks(seconds: float, interval: float = PROFILE_SAMPLE_MS / 1000) -> Tuple[Counter, int]:
+    """Sample every thread but this one for `seconds`; returns (collapsed stack -> count, rounds)."""
+    me = threading.get_ident()
+    stacks: Counter = Counter()
+    rounds = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != me:
+                stacks[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+        rounds += 1
+        time.sleep(interval)
+    return stacks, rounds
+
+def collapsed_text(stacks: Counter) -> str:
+    return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common()) + "\n"
+
+def hot_frames(stacks: Counter, thread: str, limit: int = 8) -> Tuple[List[Tuple[str, int]], int, int]:
+    """
+    Leaf frames of `thread` by sample count, idle (loop waiting in select)
+    excluded; returns (top frames, busy samples, total samples).
+    """
+    leaves: Counter = Counter()
+    total = 0
+    for stack, count in stacks.items():
+        root, _, rest = stack.partition(";")
+        if root != thread:
+            continue
+        total += count
+        leaf = rest.rsplit(";", 1)[-1]
+        if not _is_idle(leaf):
+            leaves[leaf] += count
+    return leaves.most_common(limit), sum(leaves.values()), total
+
+def _check_seconds(seconds: float) -> None:
+    if not 1 <= seconds <= PROFILE_MAX_SECONDS:
+        raise ValueError(f"Duration must be between 1 and {PROFILE_MAX_SECONDS} seconds.")
+
+async def run_sampler(seconds: float) -> dict:
+    """Stack-sample the process for `seconds` (off the loop); one profile at a time."""
+    _check_seconds(seconds)
+    if not _profile_lock.acquire(blocking=False):
+        raise ValueError("A profile is already running.")
+    try:
+        loop_thread = threading.current_thread().name
+        stacks, rounds = await asyncio.to_thread(sample_stacks, seconds)
+    finally:
+        _profile_lock.release()
+    top, busy, total = hot_frames(stacks, loop_thread)
+    return {
+        "rounds": rounds,
+        "loop_busy_pct": round(100 * busy / total, 1) if total else 0.0,
+        "loop_top": [(frame, round(100 * count / total, 1)) for frame, count in top],
+        "collapsed": collapsed_text(stacks).encode(),
+    }
+
+async def run_cprofile(seconds: float) -> dict:
+    """cProfile everything the loop runs for `seconds`; pstats text + binary dump."""
+    _check_seconds(seconds)
+    if not _profile_lock.acquire(blocking=False):
+        raise ValueError("A profile is already running.")
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+    finally:
+        _profile_lock.release()
+
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PSTATS_TOP)
+    profiler.create_stats()
+    return {
+        "calls": stats.total_calls,
+        "text": text.getvalue().encode(),
+        "pstats": marshal.dumps(profiler.stats),    # same bytes as Stats.dump_stats(); load with pstats.Stats(path)
+    }
+
+# --- asyncio slow callbacks ---
+
+slow_callbacks: deque = deque(maxlen=SLOW_CALLBACK_LOG_SIZE)     # dicts, newest last
+_SLOW_CALLBACK_MSG = "Executing %s took %.3f seconds"
+
+class SlowCallbackHandler(logging.Handler):
+    """Keeps asyncio's 'Executing <handle> took N seconds' debug warnings."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.msg != _SLOW_CALLBACK_MSG or not record.args or len(record.args) != 2:
+            return
+        callback, seconds = record.args
+        slow_callbacks.append({"at": record.created, "ms": round(seconds * 1000, 1), "callback": str(callback)})
+
+_handler: Optional[SlowCallbackHandler] = None
+
+def set_slow_callback_detection(loop: asyncio.AbstractEventLoop, threshold_ms: float) -> None:
+    """Turn asyncio debug-mode slow-callback reporting on (threshold_ms > 0) or off."""
+    global _handler
+    if threshold_ms > 0:
+        if _handler is None:
+            _handler = SlowCallbackHandler(level=logging.WARNING)
+            logging.getLogger("asyncio").addHandler(_handler)
+        loop.slow_callback_duration = threshold_ms / 1000
+        loop.set_debug(True)
+    else:
+        loop.set_debug(False)
+
+def slow_callback_status(loop: asyncio.AbstractEventLoop) -> Dict[str, float]:
+    return {"enabled": loop.get_debug(), "threshold_ms": round(loop.slow_callback_duration * 1000, 1)}
+
+def recent_slow_callbacks(limit: int = 10) -> List[dict]:
+    return list(slow_callbacks)[-limit:][::-1]
@@ -1,7 +1,18 @@
 import os
-from contextlib import contextmanager
+import time
+import asyncio
+import contextvars
+import functools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, asynccontextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from db.instrumentation import install_query_hooks
 
 mode = os.getenv("DB_MODE", "dev").lower()
 
@@ -13,7 +24,7 @@ elif mode in ("prod", "production"):
     DATABASE_URL = os.getenv("DATABASE_URL")
 else:
     DATABASE_URL = os.getenv("DATABASE_URL_DEV")
-    
+
 print(mode)
 
 if not DATABASE_URL:
@@ -21,10 +32,146 @@ if not DATABASE_URL:
         "❌ No DATABASE_URL found. Set DB_MODE to 'test', 'dev', or 'prod' and define the corresponding environment variable."
     )
 
+# --- Engine tuning ---
+# One profile per DB_MODE; any value can be overridden with its DB_* env var.
+# pool_recycle stays below the hosted Postgres idle cutoff, pre_ping catches the rest.
+ENGINE_PROFILES = {
+    "test": {"pool_size": 2,  "max_overflow": 2,  "pool_timeout": 10, "pool_recycle": 300,  "pool_pre_ping": False, "statement_timeout_ms": 30000},
+    "dev":  {"pool_size": 5,  "max_overflow": 5,  "pool_timeout": 30, "pool_recycle": 1800, "pool_pre_ping": True,  "statement_timeout_ms": 0},
+    "qa":   {"pool_size": 5,  "max_overflow": 10, "pool_timeout": 20, "pool_recycle": 1800, "pool_pre_ping": True,  "statement_timeout_ms": 20000},
+    "prod": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 15, "pool_recycle": 1800, "pool_pre_ping": True,  "statement_timeout_ms": 15000},
+}
+
+ENGINE_ENV_OVERRIDES = {
+    "pool_size": ("DB_POOL_SIZE", int),
+    "max_overflow": ("DB_MAX_OVERFLOW", int),
+    "pool_timeout": ("DB_POOL_TIMEOUT", float),
+    "pool_recycle": ("DB_POOL_RECYCLE", int),
+    "pool_pre_ping": ("DB_POOL_PRE_PING", lambda v: v.strip().lower() in ("1", "true", "yes", "on")),
+    "statement_timeout_ms": ("DB_STATEMENT_TIMEOUT_MS", int),
+}
+
+def _profile_name(db_mode: str) -> str:
+    if db_mode in ("prod", "production"):
+        return "prod"
+    if db_mode in ("qa", "staging"):
+        return "qa"
+    if db_mode == "test":
+        return "test"
+    return "dev"
+
+def resolve_engine_settings(db_mode: str, env=None) -> dict:
+    """Profile for db_mode with DB_* environment overrides applied."""
+    env = os.environ if env is None else env
+    settings = dict(ENGINE_PROFILES[_profile_name(db_mode)])
+    for key, (var, cast) in ENGINE_ENV_OVERRIDES.items():
+        raw = env.get(var)
+        if raw is None or raw == "":
+            continue
+        try:
+            settings[key] = cast(raw)
+        except ValueError:
+            raise RuntimeError(f"❌ Invalid value for {var}: {raw!r}")
+    return settings
+
+def build_engine_kwargs(url: str, settings: dict, env=None) -> dict:
+    """Translate resolved settings into create_engine() keyword arguments."""
+    env = os.environ if env is None else env
+    kwargs = {
+        "echo": (env.get("DB_ECHO", "").lower() in ("1", "true", "yes", "on")),
+        "poolclass": TimedQueuePool,
+        "pool_size": settings["pool_size"],
+        "max_overflow": settings["max_overflow"],
+        "pool_timeout": settings["pool_timeout"],
+        "pool_recycle": settings["pool_recycle"],
+        "pool_pre_ping": settings["pool_pre_ping"],
+    }
+    # Server-side guard against runaway queries (libpq startup option, Postgres only)
+    if settings["statement_timeout_ms"] and url.startswith(("postgres", "postgresql")):
+        kwargs["connect_args"] = {"options": f"-c statement_timeout={settings['statement_timeout_ms']}"}
+    return kwargs
+
+# --- Pool metrics ---
+class PoolMetrics:
+    """Thread-safe counters for connection checkouts (wait time, timeouts, in-use peak)."""
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)  # seconds, most recent checkouts
+        self._clear()
+
+    def _clear(self):
+        self._waits.clear()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.in_use_peak = 0
+
+    def record_checkout(self, waited: float, in_use: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self._waits.append(waited)
+            self.in_use_peak = max(self.in_use_peak, in_use)
+
+    def record_timeout(self, waited: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use_peak": self.in_use_peak,
+                "wait_avg_ms": round(1000 * self.wait_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_p95_ms": round(1000 * p95, 3),
+                "wait_max_ms": round(1000 * self.wait_max, 3),
+            }
+
+    def reset(self):
+        """Zero the counters in place; the lock stays the same so concurrent recorders stay serialized."""
+        with self._lock:
+            self._clear()
+
+pool_metrics = PoolMetrics()
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout(time.perf_counter() - t0)
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - t0, self.checkedout())
+        return conn
+
+ENGINE_SETTINGS = resolve_engine_settings(mode)
+
 # Create engine + session
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(DATABASE_URL, **build_engine_kwargs(DATABASE_URL, ENGINE_SETTINGS))
+install_query_hooks(engine)
 SessionLocal = sessionmaker(bind=engine)
 
+def get_pool_stats() -> dict:
+    """Current pool occupancy plus checkout metrics, for diagnostics / metrics export."""
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "max_overflow": ENGINE_SETTINGS["max_overflow"],
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    stats.update(pool_metrics.snapshot())
+    return stats
+
 @contextmanager
 def db_session():
     session = SessionLocal()
@@ -37,3 +184,54 @@ def db_session():
         raise
     finally:
         session.close()
+
+# --- Async access (for cogs / views running on the discord.py event loop) ---
+# psycopg2 is blocking, so DB work is shipped to a small dedicated thread pool.
+# A Session is only ever used by one thread at a time (each call is awaited).
+# Sized to the pool by default: extra workers would only queue on pool checkout.
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS") or (ENGINE_SETTINGS["pool_size"] + ENGINE_SETTINGS["max_overflow"]))
+db_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+async def run_db(fn, /, *args, **kwargs):
+    """Run a blocking callable (service, presentation helper...) on the DB executor."""
+    loop = asyncio.get_running_loop()
+    # carry contextvars (the current command trace) over to the worker thread
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(db_executor, functools.partial(ctx.run, fn, *args, **kwargs))
+
+async def run_in_session(fn, /, *args, **kwargs):
+    """
+    Run fn(session, *args, **kwargs) inside a db_session() on the DB executor.
+    One executor hop for the whole unit of work; fn must return primitives/DTOs
+    (ORM rows are detached once the session closes).
+    """
+    def _call():
+        with db_session() as session:
+            return fn(session, *args, **kwargs)
+    return await run_db(_call)
+
+class AsyncDBSession:
+    """Awaitable facade over a sync Session: every call runs on the DB executor."""
+    def __init__(self, session):
+        self.session = session
+
+    async def run(self, fn, /, *args, **kwargs):
+        return await run_db(fn, self.session, *args, **kwargs)
+
+@asynccontextmanager
+async def db_session_async():
+    """
+    Async counterpart of db_session():
+        async with db_session_async() as s:
+            pages = await s.run(get_inshop_catalog_grouped)
+    """
+    session = await run_db(SessionLocal)
+    try:
+        yield AsyncDBSession(session)
+        await run_db(session.commit)
+    except Exception as e:
+        print(f"❌ DB error: {e}")
+        await run_db(session.rollback)
+        raise
+    finally:
+        await run_db(session.close)
@@ -0,0 +1,158 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+
+# ---------------------------------------------------------------------------
+# Per-interaction SQL instrumentation
+# ---------------------------------------------------------------------------
+# The command tree opens a CommandTrace for each slash command and stores it
+# in a contextvar; run_db copies the context onto the DB executor, so the
+# cursor hooks below can attribute every statement to the command that issued
+# it. Statements slower than SLOW_QUERY_MS also go to the slow-query log
+# (normalized SQL, so the same query with other values groups together).
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "100"))
+COMMAND_STATS_WINDOW = int(os.getenv("COMMAND_STATS_WINDOW", "500"))     # recent calls kept per command
+TRACE_TOP_STATEMENTS = 3
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*\?\s*,)+\s*\?\s*\)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, bind params, IN-lists and whitespace: one shape per query."""
+    sql = _STRING_RE.sub("?", statement)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (?...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of values (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+class CommandTrace:
+    """Queries issued on behalf of one interaction (may be fed from several DB threads)."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.queries = 0
+        self.db_time = 0.0          # seconds
+        self.slowest: List[tuple] = []      # (seconds, normalized sql), longest first
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.db_time += elapsed
+            if len(self.slowest) < TRACE_TOP_STATEMENTS or elapsed > self.slowest[-1][0]:
+                self.slowest.append((elapsed, normalize_sql(statement)))
+                self.slowest.sort(key=lambda s: s[0], reverse=True)
+                del self.slowest[TRACE_TOP_STATEMENTS:]
+
+class CommandStats:
+    """Rolling per-command aggregates: calls, DB time and queries per call."""
+
+    def __init__(self, window: int = COMMAND_STATS_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._calls: Dict[str, deque] = {}      # command -> deque[(db_ms, queries, wall_ms)]
+        self._totals: Dict[str, int] = {}
+
+    def record(self, trace: CommandTrace, wall: float) -> None:
+        with self._lock:
+            calls = self._calls.setdefault(trace.command, deque(maxlen=self._window))
+            calls.append((trace.db_time * 1000, trace.queries, wall * 1000))
+            self._totals[trace.command] = self._totals.get(trace.command, 0) + 1
+
+    def snapshot(self) -> List[dict]:
+        """One row per command, busiest (total DB time in the window) first."""
+        with self._lock:
+            items = [(name, list(calls), self._totals[name]) for name, calls in self._calls.items()]
+        rows = []
+        for name, calls, total in items:
+            db_ms = [c[0] for c in calls]
+            queries = [c[1] for c in calls]
+            rows.append({
+                "command": name,
+                "calls": total,
+                "db_p50_ms": round(percentile(db_ms, 0.50), 2),
+                "db_p95_ms": round(percentile(db_ms, 0.95), 2),
+                "queries_avg": round(sum(queries) / len(queries), 1),
+                "queries_max": max(queries),
+                "wall_p95_ms": round(percentile([c[2] for c in calls], 0.95), 2),
+                "db_total_ms": round(sum(db_ms), 2),
+            })
+        rows.sort(key=lambda r: r["db_total_ms"], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._totals.clear()
+
+command_stats = CommandStats()
+slow_queries: deque = deque(maxlen=SLOW_QUERY_LOG_SIZE)     # dicts, newest last
+_slow_lock = threading.Lock()
+
+current_trace: ContextVar[Optional[CommandTrace]] = ContextVar("current_trace", default=None)
+
+@contextmanager
+def trace_command(command: str):
+    """Attribute every statement run inside the block (and its run_db calls) to `command`."""
+    trace = CommandTrace(command)
+    token = current_trace.set(trace)
+    t0 = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        current_trace.reset(token)
+        command_stats.record(trace, time.perf_counter() - t0)
+
+def record_statement(statement: str, elapsed: float) -> None:
+    """Feed one executed statement to the current trace and, if slow, to the slow-query log."""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.record(statement, elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        sql = normalize_sql(statement)
+        command = trace.command if trace is not None else None
+        with _slow_lock:
+            slow_queries.append({"at": time.time(), "ms": round(elapsed * 1000, 2), "command": command, "sql": sql})
+        print(f"🐢 Slow query ({elapsed * 1000:.0f} ms, {command or 'background'}): {sql[:300]}")
+
+def recent_slow_queries(limit: int = 10) -> List[dict]:
+    with _slow_lock:
+        return list(slow_queries)[-limit:][::-1]
+
+def install_query_hooks(engine) -> None:
+    """Time every cursor execution on engine (executemany counts once)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        record_statement(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        # failed statements never reach after_cursor_execute; still count (and unwind) them
+        starts = ctx.connection.info.get("query_start") if ctx.connection is not None else None
+        if starts:
+            record_statement(ctx.statement or "", time.perf_counter() - starts.pop())
@@ -0,0 +1,20 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import db_session
+from bot.crud.user_event_progress_crud import rebuild_all_user_event_progress
+
+mode = os.getenv("DB_MODE", "dev").lower()
+event_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+scope = f"event {event_id}" if event_id is not None else "all events"
+
+confirm = input(f"❗️You are about to rebuild trigger progress counters for {scope} in the *{mode}* database. Continue? (yes/no): ")
+if confirm.lower() != "yes":
+    print("❌ Operation cancelled.")
+    exit()
+
+with db_session() as session:
+    count = rebuild_all_user_event_progress(session, event_id)
+print(f"✅ Rebuilt {count} user/event progress rows for DB_MODE={mode}.")
@@ -0,0 +1,20 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from db.database import db_session
+from bot.crud.points_ledger_crud import reconcile_points_balances
+
+mode = os.getenv("DB_MODE", "dev").lower()
+user_id = int(sys.argv[1]) if len(sys.argv) > 1 else None
+scope = f"user {user_id}" if user_id is not None else "all users"
+
+confirm = input(f"❗️You are about to rebuild points balances from the ledger for {scope} in the *{mode}* database. Continue? (yes/no): ")
+if confirm.lower() != "yes":
+    print("❌ Operation cancelled.")
+    exit()
+
+with db_session() as session:
+    users_fixed, ued_fixed = reconcile_points_balances(session, user_id)
+print(f"✅ Fixed {users_fixed} user balances and {ued_fixed} per-event tallies for DB_MODE={mode}.")
@@ -4,7 +4,7 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))		
 
-from sqlalchemy import Boolean, Column, Enum, ForeignKey, Integer, String, Text, UniqueConstraint  
+from sqlalchemy import Boolean, Column, Date, DateTime, Enum, ForeignKey, Index, Integer, String, Text, UniqueConstraint  
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -54,8 +54,8 @@ class Event(Base):
     event_name = Column(String, nullable=False)
     event_type = Column(String, nullable=False)
     event_description = Column(Text, nullable=False)
-    start_date = Column(String, nullable=False)
-    end_date = Column(String, nullable=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
     coordinator_discord_id = Column(String, nullable=True)		# discord unique user id
     priority = Column(Integer, nullable=False, default=0)
     tags = Column(String, nullable=True)		# comma-separated for future search
@@ -128,7 +128,11 @@ class Inventory(Base):
     user = relationship("User", back_populates="inventory_items")
     reward = relationship("Reward", back_populates="owned_by")
 
-    __table_args__ = (UniqueConstraint('user_id', 'reward_id', name='uix_user_reward'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'reward_id', name='uix_user_reward'),
+        # equipped title/badges for the profile card; only a handful of rows per user
+        Index('ix_inventory_rewards_user_equipped', 'user_id', postgresql_where=is_equipped.is_(True)),
+    )
     
     def __repr__(self):
         return (
@@ -147,13 +151,13 @@ class UserEventData(Base):
     event_id = Column(Integer, ForeignKey('events.id', ondelete="RESTRICT"), nullable=False)		# id in events table
 
     points_earned = Column(Integer, default=0, nullable=False)
-    joined_at = Column(String, nullable=False)
+    joined_at = Column(DateTime(timezone=True), nullable=False)
 
     ao3_handle = Column(String, nullable=True)
     tumblr_handle = Column(String, nullable=True)
     contact_email = Column(String, nullable=True)
 
-    last_active_at = Column(String, nullable=True)
+    last_active_at = Column(DateTime(timezone=True), nullable=True)
     custom_notes = Column(Text, nullable=True)
     status = Column(String, default="active", nullable=False)
 
@@ -164,7 +168,11 @@ class UserEventData(Base):
     user = relationship("User", back_populates="event_data")
     event = relationship("Event", back_populates="event_participants")
     
-    __table_args__ = (UniqueConstraint('user_id', 'event_id', name='uix_user_event'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'event_id', name='uix_user_event'),
+        # points leaderboard: WHERE event_id = ? ORDER BY points_earned DESC
+        Index('ix_user_event_data_event_points', 'event_id', points_earned.desc()),
+    )
 
     def __repr__(self):
         return (
@@ -275,7 +283,7 @@ class UserAction(Base):
     event_id = Column(Integer, ForeignKey('events.id', ondelete="RESTRICT"), nullable=True)		# id in events table
 
     created_by= Column(String, nullable=False)		# for when actions are logged by a mod, discord unique user id 
-    created_at = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
 
     url_value = Column(String, nullable=True)
     numeric_value = Column(Integer, nullable=True)
@@ -291,6 +299,13 @@ class UserAction(Base):
     # for prompt type events
     selected_prompts = relationship("UserActionPrompt", back_populates="user_action", passive_deletes=True)
 
+    # time-range scans: per-user streaks/history, per-event reports, civic-day action lists
+    __table_args__ = (
+        Index('ix_user_actions_user_event_created', 'user_id', 'event_id', 'created_at'),
+        Index('ix_user_actions_event_created', 'event_id', 'created_at'),
+        Index('ix_user_actions_action_event_created', 'action_event_id', 'created_at'),
+    )
+
     def __repr__(self):
         return (
             f"<UserAction user={self.user.user_discord_id if self.user else self.user_id} "
@@ -406,6 +421,8 @@ class RewardEvent(Base):
 
     __table_args__ = (
         UniqueConstraint('event_id', 'reward_id', 'availability', name='uix_event_reward_availability'),
+        # shop catalog: WHERE availability = 'inshop', joined to events
+        Index('ix_reward_events_availability_event', 'availability', 'event_id'),
     )
 
     def __repr__(self):
@@ -480,6 +497,8 @@ class UserActionPrompt(Base):
 
     __table_args__ = (
         UniqueConstraint("user_action_id", "event_prompt_id", name="uix_action_prompt_unique"),
+        # prompt popularity / "is this prompt used" (the unique index leads with user_action_id)
+        Index("ix_user_action_prompts_prompt_action", "event_prompt_id", "user_action_id"),
     )
     
     def __repr__(self):
@@ -503,6 +522,8 @@ class EventTrigger(Base):
     event = relationship("Event", back_populates="triggers")
     reward_event = relationship("RewardEvent", back_populates="event_triggers")
     trigger_logs = relationship("UserEventTriggerLog", back_populates="event_trigger", passive_deletes=True)
+
+    __table_args__ = (Index("ix_event_triggers_event", "event_id"),)
     
     def __repr__(self):
         return (
@@ -515,14 +536,72 @@ class UserEventTriggerLog(Base):
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     event_trigger_id = Column(Integer, ForeignKey("event_triggers.id", ondelete="CASCADE"), nullable=False)
-    granted_at = Column(String, nullable=False)
+    granted_at = Column(DateTime(timezone=True), nullable=False)
 
     user = relationship("User", back_populates="event_trigger_logs")
     event_trigger = relationship("EventTrigger", back_populates="trigger_logs")
     
-    __table_args__ = (UniqueConstraint('user_id', 'event_trigger_id', name='uix_user_event_trigger'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'event_trigger_id', name='uix_user_event_trigger'),
+        # per-trigger grant reports and ON DELETE CASCADE from event_triggers
+        Index('ix_user_event_trigger_log_trigger', 'event_trigger_id'),
+    )
 
     def __repr__(self):
         return (
             f"<UserEventTriggerLog user={self.user_id} trigger={self.event_trigger_id} at={self.granted_at}>"
-        )
\ No newline at end of file
+        )
+# Incremental per-(user, event) counters read by the trigger engine.
+# Maintained on report / prompt selection; rebuildable from user_actions history.
+class UserEventProgress(Base):
+    __tablename__ = "user_event_progress"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)		# id in users table
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)		# id in events table
+
+    report_count = Column(Integer, default=0, nullable=False)
+    action_counts_json = Column(Text, default="{}", nullable=False)		# {action_event_id: count}
+    prompt_counts_json = Column(Text, default="{}", nullable=False)		# {event_prompt_id: count}
+    distinct_prompt_count = Column(Integer, default=0, nullable=False)
+    participation_days_json = Column(Text, default="[]", nullable=False)		# sorted ["YYYY-MM-DD", ...]
+    participation_day_count = Column(Integer, default=0, nullable=False)
+    last_participation_day = Column(String, nullable=True)		# YYYY-MM-DD
+    current_streak = Column(Integer, default=0, nullable=False)		# consecutive days ending at last_participation_day
+
+    updated_at = Column(String, nullable=False)
+
+    __table_args__ = (UniqueConstraint('user_id', 'event_id', name='uix_user_event_progress'),)
+
+    def __repr__(self):
+        return (
+            f"<UserEventProgress user={self.user_id} event={self.event_id} "
+            f"reports={self.report_count} streak={self.current_streak}>"
+        )
+
+# Append-only history of every points movement.
+# users.points/total_earned/total_spent and user_event_data.points_earned are
+# balances materialized from it; db/reconcile_points.py rebuilds them.
+class PointsLedger(Base):
+    __tablename__ = "points_ledger"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)		# id in users table
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="SET NULL"), nullable=True)		# id in events table, null for global moves
+
+    delta = Column(Integer, nullable=False)		# signed: + earned, - spent/taken
+    source = Column(String, nullable=False)		# action / trigger / purchase / mod / opening
+    source_ref = Column(String, nullable=True)		# user_action id, event_trigger id, reward_event_key, mod reason...
+
+    created_by = Column(String, nullable=True)		# discord unique user id
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # per-user history and balance rebuilds
+        Index('ix_points_ledger_user_created', 'user_id', 'created_at'),
+        # per-event reconciliation of user_event_data.points_earned
+        Index('ix_points_ledger_event_user', 'event_id', 'user_id'),
+    )
+
+    def __repr__(self):
+        return f"<PointsLedger user={self.user_id} event={self.event_id} {self.source} {self.delta:+d}>"
@@ -46,4 +46,15 @@ def test_session(engine):
     if transaction.is_active:  # <--- prevents warnings
         transaction.rollback()
 
-    connection.close()
\ No newline at end of file
+    connection.close()
+
+# --- Reset process-local caches so tests never see each other's data ---
+@pytest.fixture(autouse=True)
+def _reset_caches():
+    from bot.services.trigger_rules_cache import invalidate_trigger_rules
+    from bot.crud.shop_crud import invalidate_shop_catalog
+    from bot.crud.users_crud import invalidate_user_identity
+    invalidate_trigger_rules()
+    invalidate_shop_catalog()
+    invalidate_user_identity()
+    yield
@@ -0,0 +1,106 @@
+import importlib.util
+import pytest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+
+from db.schema import PointsLedger, UserEventData
+from bot.crud.points_ledger_crud import reconcile_points_balances, record_points, take_points
+
+
+@pytest.fixture
+def base_ued(test_session, base_user, base_event):
+    ued = UserEventData(
+        user_id=base_user.id, event_id=base_event.id, points_earned=0,
+        joined_at=datetime.now(timezone.utc), created_by="tester",
+    )
+    test_session.add(ued)
+    test_session.flush()
+    return ued
+
+
+# --- RECORD ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_record_points_appends_row_and_updates_balances(test_session, base_user, base_event, base_ued):
+    record_points(test_session, user_id=base_user.id, delta=30, source="action", event_id=base_event.id, source_ref=7)
+
+    assert (base_user.points, base_user.total_earned, base_user.total_spent) == (30, 30, 0)
+    assert base_ued.points_earned == 30
+    row = test_session.query(PointsLedger).one()
+    assert (row.delta, row.source, row.source_ref, row.event_id) == (30, "action", "7", base_event.id)
+
+
+@pytest.mark.crud
+def test_mod_grant_does_not_count_as_event_earnings(test_session, base_user, base_event, base_ued):
+    record_points(test_session, user_id=base_user.id, delta=10, source="mod", event_id=base_event.id)
+    assert (base_user.points, base_user.total_earned) == (10, 10)
+    assert base_ued.points_earned == 0
+
+
+@pytest.mark.crud
+def test_take_points_never_goes_negative(test_session, base_user):
+    record_points(test_session, user_id=base_user.id, delta=15, source="mod")
+    taken = take_points(test_session, user_id=base_user.id, amount=40, created_by="999", reason="oops")
+
+    assert taken == 15
+    assert (base_user.points, base_user.total_earned) == (0, 15)
+    assert sum(r.delta for r in test_session.query(PointsLedger)) == 0
+
+
+@pytest.mark.crud
+def test_unknown_source_is_rejected(test_session, base_user):
+    with pytest.raises(ValueError):
+        record_points(test_session, user_id=base_user.id, delta=5, source="gift")
+
+
+# --- RECONCILE ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_reconcile_rebuilds_drifted_balances(test_session, base_user, base_event, base_ued):
+    record_points(test_session, user_id=base_user.id, delta=50, source="trigger", event_id=base_event.id)
+    record_points(test_session, user_id=base_user.id, delta=-20, source="purchase", event_id=base_event.id)
+    record_points(test_session, user_id=base_user.id, delta=-5, source="mod")
+
+    base_user.points, base_user.total_earned, base_user.total_spent = 999, 0, 0
+    base_ued.points_earned = 1
+    test_session.flush()
+
+    assert reconcile_points_balances(test_session) == (1, 1)
+    assert (base_user.points, base_user.total_earned, base_user.total_spent) == (25, 50, 20)
+    assert base_ued.points_earned == 50
+    assert reconcile_points_balances(test_session) == (0, 0)
+
+
+def _ledger_migration():
+    path = Path(__file__).resolve().parents[2] / "alembic" / "versions" / "3e9a0c7b5f18_add_points_ledger.py"
+    spec = importlib.util.spec_from_file_location("points_ledger_migration", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.crud
+def test_opening_rows_reconcile_to_a_noop(test_session, base_user, base_event, base_ued):
+    # skewed legacy balances: per-event tallies above total_earned, and a mod bonus on top
+    base_user.points, base_user.total_earned, base_user.total_spent = 95, 40, 10
+    base_ued.points_earned = 60
+    test_session.flush()
+
+    migration = _ledger_migration()
+    test_session.execute(text(migration.OPENING_EVENT_ROWS_SQL))
+    test_session.execute(text(migration.OPENING_USER_ROWS_SQL))
+
+    sources = {(r.source, r.delta) for r in test_session.query(PointsLedger).filter_by(user_id=base_user.id)}
+    assert sources == {("opening", 60), ("opening", -20), ("purchase", -10), ("adjustment", 65)}
+    assert reconcile_points_balances(test_session) == (0, 0)
+    assert (base_user.points, base_user.total_earned, base_user.total_spent) == (95, 40, 10)
+    assert base_ued.points_earned == 60
+
+
+@pytest.mark.crud
+def test_adjustment_moves_points_only(test_session, base_user):
+    record_points(test_session, user_id=base_user.id, delta=12, source="adjustment")
+    assert (base_user.points, base_user.total_earned, base_user.total_spent) == (12, 0, 0)
+    assert reconcile_points_balances(test_session) == (0, 0)
@@ -0,0 +1,76 @@
+import pytest
+
+from db.schema import EventStatus, Inventory, PointsLedger
+from bot.crud.purchase_crud import PurchaseError, PurchaseResult, purchase_reward
+
+
+@pytest.fixture
+def shop_item(test_session, base_event, base_reward, base_reward_event, base_user):
+    """Active event selling base_reward for 10 points; base_user has 25."""
+    base_event.event_status = EventStatus.active
+    base_reward_event.price = 10
+    base_user.points = 25
+    test_session.flush()
+    return base_reward_event
+
+
+# --- SUCCESS ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_purchase_debits_grants_and_counts(test_session, shop_item, base_user, base_reward):
+    result = purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+
+    assert isinstance(result, PurchaseResult)
+    assert (result.price, result.balance, result.quantity) == (10, 15, 1)
+    assert (base_user.points, base_user.total_spent) == (15, 10)
+    assert base_reward.number_granted == 1
+    inv = test_session.query(Inventory).filter_by(user_id=base_user.id, reward_id=base_reward.id).one()
+    assert inv.quantity == 1
+
+
+@pytest.mark.crud
+def test_stackable_purchase_increments_quantity(test_session, shop_item, base_user, base_reward):
+    base_reward.is_stackable = True
+    test_session.flush()
+    purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+    result = purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+    assert (result.quantity, result.balance) == (2, 5)
+    assert base_reward.number_granted == 2
+
+
+# --- REFUSALS (nothing written) ---
+@pytest.mark.crud
+def test_not_enough_points_writes_nothing(test_session, shop_item, base_user, base_reward):
+    base_user.points = 5
+    test_session.flush()
+    with pytest.raises(PurchaseError, match="Not enough points"):
+        purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+
+    test_session.expire_all()
+    assert (base_user.points, base_user.total_spent) == (5, 0)
+    assert base_reward.number_granted == 0
+    assert test_session.query(Inventory).count() == 0
+
+
+@pytest.mark.crud
+def test_non_stackable_owned_is_refused_without_debit(test_session, shop_item, base_user):
+    purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+    with pytest.raises(PurchaseError, match="already own"):
+        purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+    test_session.expire_all()
+    assert base_user.points == 15
+
+
+@pytest.mark.crud
+def test_inactive_event_reports_reason(test_session, shop_item, base_event, base_user):
+    base_event.event_status = EventStatus.draft
+    test_session.flush()
+    with pytest.raises(PurchaseError, match="not active"):
+        purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+
+
+@pytest.mark.crud
+def test_purchase_writes_ledger_row(test_session, shop_item, base_user, base_event):
+    purchase_reward(test_session, base_user.id, shop_item.reward_event_key)
+    row = test_session.query(PointsLedger).filter_by(user_id=base_user.id).one()
+    assert (row.delta, row.source, row.event_id) == (-10, "purchase", base_event.id)
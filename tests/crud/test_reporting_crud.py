@@ -0,0 +1,163 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+from db.schema import EventPrompt, User, UserAction, UserActionPrompt, UserEventData
+from bot.crud.reporting_crud import (
+    action_value_columns_used,
+    civic_day_bounds,
+    iter_actions_for_action_events,
+    leaderboard_points_by_event,
+    leaderboard_prompts_by_event,
+    list_actions_for_action_events,
+    page_actions_for_action_events,
+)
+
+
+def _add_report(session, user, action_event, created_at):
+    session.add(UserAction(
+        user_id=user.id,
+        action_event_id=action_event.id,
+        event_id=action_event.event_id,
+        created_by=user.user_discord_id,
+        created_at=created_at,
+    ))
+    session.flush()
+
+
+# --- CIVIC DAY ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_civic_day_bounds_are_utc_half_open():
+    """A day maps to [00:00 UTC, next day 00:00 UTC)."""
+    since, until = civic_day_bounds("2025-08-01")
+    assert since == datetime(2025, 8, 1, tzinfo=timezone.utc)
+    assert until == datetime(2025, 8, 2, tzinfo=timezone.utc)
+
+
+@pytest.mark.crud
+def test_civic_day_filter_compares_instants(test_session, base_user, base_action_event):
+    """Offsets are honored: 00:30+02:00 on the 2nd is still the 1st in UTC; 23:59:59.5 is not dropped."""
+    _add_report(test_session, base_user, base_action_event, "2025-08-01T23:59:59.500000+00:00")
+    _add_report(test_session, base_user, base_action_event, "2025-08-02T00:30:00+02:00")
+    _add_report(test_session, base_user, base_action_event, "2025-08-02T00:00:00+00:00")
+
+    rows = list_actions_for_action_events(
+        test_session, base_action_event.event_id, [base_action_event.id], "2025-08-01", "created_at", True
+    )
+    assert len(rows) == 2
+    assert all(isinstance(r["created_at"], datetime) for r in rows)
+
+
+@pytest.mark.crud
+def test_civic_day_filter_uses_index_range_scan(test_session, base_user, base_action_event):
+    """The day window is served by the (action_event_id, created_at) index."""
+    _add_report(test_session, base_user, base_action_event, "2025-08-01T10:00:00+00:00")
+    since, until = civic_day_bounds("2025-08-01")
+
+    test_session.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(r[0] for r in test_session.execute(
+        text(
+            "EXPLAIN SELECT id FROM user_actions "
+            "WHERE action_event_id = :ae AND created_at >= :since AND created_at < :until"
+        ),
+        {"ae": base_action_event.id, "since": since, "until": until},
+    ))
+    assert "ix_user_actions_action_event_created" in plan
+
+
+# --- LEADERBOARDS ---
+def _participant(session, event, discord_id, name, points):
+    user = User(user_discord_id=discord_id, username=name, display_name=name,
+                created_at=datetime.now(timezone.utc).isoformat())
+    session.add(user)
+    session.flush()
+    session.add(UserEventData(user_id=user.id, event_id=event.id, points_earned=points,
+                              joined_at=datetime.now(timezone.utc), created_by=discord_id))
+    session.flush()
+    return user
+
+
+@pytest.mark.crud
+@pytest.mark.basic
+def test_points_leaderboard_ranks_ties_and_pages(test_session, base_event):
+    _participant(test_session, base_event, "1", "Cleo", 50)
+    _participant(test_session, base_event, "2", "Anna", 50)
+    _participant(test_session, base_event, "3", "Bob", 10)
+
+    rows = leaderboard_points_by_event(test_session, base_event.id)
+    assert [(r["display_name"], r["rank"]) for r in rows] == [("Anna", 1), ("Cleo", 1), ("Bob", 3)]
+    assert {r["total"] for r in rows} == {3}
+
+    page = leaderboard_points_by_event(test_session, base_event.id, limit=1, offset=1)
+    assert [r["display_name"] for r in page] == ["Cleo"]
+
+
+@pytest.mark.crud
+def test_points_leaderboard_my_rank(test_session, base_event):
+    _participant(test_session, base_event, "1", "Anna", 50)
+    _participant(test_session, base_event, "3", "Bob", 10)
+
+    mine = leaderboard_points_by_event(test_session, base_event.id, user_discord_id="3")
+    assert [(r["display_name"], r["rank"], r["total"]) for r in mine] == [("Bob", 2, 2)]
+    assert leaderboard_points_by_event(test_session, base_event.id, user_discord_id="404") == []
+
+
+@pytest.mark.crud
+def test_prompts_leaderboard_counts_total_and_unique(test_session, base_user, base_action_event):
+    prompts = [
+        EventPrompt(event_id=base_action_event.event_id, code=f"p{i}", label=f"Prompt {i}",
+                    created_by="tester", created_at=datetime.now(timezone.utc).isoformat())
+        for i in range(2)
+    ]
+    test_session.add_all(prompts)
+    _add_report(test_session, base_user, base_action_event, "2025-08-01T10:00:00+00:00")
+    _add_report(test_session, base_user, base_action_event, "2025-08-02T10:00:00+00:00")
+    ua1, ua2 = test_session.query(UserAction).order_by(UserAction.id).all()
+    test_session.add_all([
+        UserActionPrompt(user_action_id=ua1.id, event_prompt_id=prompts[0].id),
+        UserActionPrompt(user_action_id=ua1.id, event_prompt_id=prompts[1].id),
+        UserActionPrompt(user_action_id=ua2.id, event_prompt_id=prompts[0].id),
+    ])
+    test_session.flush()
+
+    (row,) = leaderboard_prompts_by_event(test_session, base_action_event.event_id)
+    assert (row["total_prompts"], row["unique_prompts"], row["rank"]) == (3, 2, 1)
+
+
+# --- STREAMING EXPORT ---
+@pytest.mark.crud
+def test_streamed_actions_match_list_and_used_columns(test_session, base_user, base_action_event):
+    _add_report(test_session, base_user, base_action_event, "2025-08-01T10:00:00+00:00")
+    ua = test_session.query(UserAction).one()
+    ua.url_value = "https://example.org/fic"
+    test_session.flush()
+
+    args = (base_action_event.event_id, [base_action_event.id], None, "created_at", True)
+    streamed = list(iter_actions_for_action_events(test_session, *args))
+    assert streamed == list_actions_for_action_events(test_session, *args)
+    assert streamed[0]["prompts_count"] == 0
+
+    used = action_value_columns_used(test_session, [base_action_event.id], None)
+    assert used["url_value"] and not used["numeric_value"] and not used["prompts_count"]
+
+
+# --- KEYSET PAGES ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_action_pages_walk_without_overlap(test_session, base_user, base_action_event):
+    for day in (1, 1, 2, 3, 4):     # a tie on the sort key must not drop or repeat rows
+        _add_report(test_session, base_user, base_action_event, f"2025-08-0{day}T10:00:00+00:00")
+
+    args = (base_action_event.event_id, [base_action_event.id], None, "created_at", False)
+    seen, cursor, pages = [], None, 0
+    while True:
+        rows, cursor = page_actions_for_action_events(test_session, *args, after=cursor, limit=2)
+        seen += [r["id"] for r in rows]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [r["id"] for r in list_actions_for_action_events(test_session, *args)]
+    assert len(set(seen)) == 5
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import event as sa_event
+
+from db.schema import EventStatus
+from bot.crud import events_crud, reward_events_crud
+from bot.crud.shop_crud import get_shop_catalog, get_shop_catalog_version
+
+
+@pytest.fixture
+def shop_event(test_session, base_event, base_reward_event):
+    """base_event made active, with base_reward_event in shop."""
+    base_event.event_status = EventStatus.active
+    test_session.flush()
+    return base_event
+
+
+def _count_queries(session):
+    statements = []
+    sa_event.listen(session.connection(), "before_cursor_execute",
+                    lambda *a: statements.append(a[2]))
+    return statements
+
+
+# --- Caching ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_catalog_served_from_memory(test_session, shop_event):
+    """The second /shop does not query the catalog again."""
+    first = get_shop_catalog(test_session)
+    statements = _count_queries(test_session)
+    second = get_shop_catalog(test_session)
+
+    assert second is first
+    assert statements == []
+    assert [it["reward_event_key"] for it in first[0]["items"]] == ["test_reward_event"]
+
+
+@pytest.mark.crud
+def test_catalog_pages_are_immutable(test_session, shop_event):
+    pages = get_shop_catalog(test_session)
+    with pytest.raises(TypeError):
+        pages[0]["event_name"] = "changed"
+    with pytest.raises(TypeError):
+        pages[0]["items"][0]["price"] = 1
+
+
+# --- Invalidation ---
+@pytest.mark.crud
+def test_event_status_change_invalidates_catalog(test_session, shop_event):
+    """Deactivating the event bumps the version and the next read drops its page."""
+    assert len(get_shop_catalog(test_session)) == 1
+    version = get_shop_catalog_version()
+
+    events_crud.set_event_status(
+        test_session, shop_event.event_key,
+        {"event_status": EventStatus.archived, "modified_by": "tester"},
+    )
+    test_session.flush()
+
+    assert get_shop_catalog_version() > version
+    assert get_shop_catalog(test_session) == ()
+
+
+@pytest.mark.crud
+def test_reward_link_update_invalidates_catalog(test_session, shop_event, base_reward_event):
+    get_shop_catalog(test_session)
+    reward_events_crud.update_reward_event(
+        test_session, base_reward_event.reward_event_key,
+        {"price": 42, "modified_by": "tester", "modified_at": "2025-08-01T00:00:00+00:00"},
+    )
+    test_session.flush()
+
+    assert get_shop_catalog(test_session)[0]["items"][0]["price"] == 42
@@ -0,0 +1,128 @@
+import pytest
+from db.schema import UserAction, UserActionPrompt
+from bot.crud import user_event_progress_crud as progress_crud
+
+
+def _add_report(session, user, action_event, created_at):
+    ua = UserAction(
+        user_id=user.id,
+        action_event_id=action_event.id,
+        event_id=action_event.event_id,
+        created_by=user.user_discord_id,
+        created_at=created_at,
+    )
+    session.add(ua)
+    session.flush()
+    progress_crud.record_action_in_progress(
+        session,
+        user_id=user.id,
+        event_id=action_event.event_id,
+        action_event_id=action_event.id,
+        created_at=created_at,
+    )
+    return ua
+
+
+# --- INCREMENTAL ---
+@pytest.mark.crud
+@pytest.mark.basic
+@pytest.mark.trigger
+def test_first_report_creates_progress(test_session, base_user, base_action_event):
+    """The first report creates the row from history."""
+    _add_report(test_session, base_user, base_action_event, "2025-08-01T10:00:00+00:00")
+
+    prog = progress_crud.get_user_event_progress(test_session, base_user.id, base_action_event.event_id)
+    assert prog.report_count == 1
+    assert progress_crud.progress_action_counts(prog) == {base_action_event.id: 1}
+    assert prog.participation_day_count == 1
+    assert prog.current_streak == 1
+    assert prog.last_participation_day == "2025-08-01"
+
+
+@pytest.mark.crud
+@pytest.mark.trigger
+def test_streak_and_days_are_incremental(test_session, base_user, base_action_event):
+    """Same day keeps the streak, next day extends it, a gap resets it."""
+    for ts in [
+        "2025-08-01T10:00:00+00:00",
+        "2025-08-01T18:00:00+00:00",
+        "2025-08-02T09:00:00+00:00",
+        "2025-08-03T09:00:00+00:00",
+    ]:
+        _add_report(test_session, base_user, base_action_event, ts)
+    prog = progress_crud.get_user_event_progress(test_session, base_user.id, base_action_event.event_id)
+    assert prog.report_count == 4
+    assert prog.participation_day_count == 3
+    assert prog.current_streak == 3
+
+    _add_report(test_session, base_user, base_action_event, "2025-08-06T09:00:00+00:00")
+    assert prog.participation_day_count == 4
+    assert prog.current_streak == 1
+
+
+@pytest.mark.crud
+@pytest.mark.trigger
+def test_prompt_reselection_applies_delta(test_session, base_user, base_action_event, base_prompts):
+    """Re-selecting prompts on a report moves counts instead of double-counting."""
+    ua = _add_report(test_session, base_user, base_action_event, "2025-08-01T10:00:00+00:00")
+    p1, p2, p3 = (p.id for p in base_prompts)
+
+    progress_crud.record_prompt_selection_in_progress(
+        test_session, user_action_id=ua.id, old_prompt_ids=[], new_prompt_ids=[p1, p2]
+    )
+    prog = progress_crud.record_prompt_selection_in_progress(
+        test_session, user_action_id=ua.id, old_prompt_ids=[p1, p2], new_prompt_ids=[p2, p3]
+    )
+    assert progress_crud.progress_prompt_counts(prog) == {p2: 1, p3: 1}
+    assert prog.distinct_prompt_count == 2
+
+
+# --- REBUILD ---
+@pytest.mark.crud
+@pytest.mark.trigger
+def test_rebuild_matches_incremental(test_session, base_user, base_action_event, base_prompts):
+    """Rebuilding from history yields the same counters as incremental updates."""
+    days = ["2025-08-01T10:00:00+00:00", "2025-08-02T10:00:00+00:00", "2025-08-02T11:00:00+00:00"]
+    for ts in days:
+        ua = _add_report(test_session, base_user, base_action_event, ts)
+        test_session.add(UserActionPrompt(user_action_id=ua.id, event_prompt_id=base_prompts[0].id))
+        test_session.flush()
+        progress_crud.record_prompt_selection_in_progress(
+            test_session, user_action_id=ua.id, old_prompt_ids=[], new_prompt_ids=[base_prompts[0].id]
+        )
+
+    prog = progress_crud.get_user_event_progress(test_session, base_user.id, base_action_event.event_id)
+    before = (
+        prog.report_count, prog.action_counts_json, prog.prompt_counts_json,
+        prog.distinct_prompt_count, prog.participation_day_count, prog.current_streak,
+    )
+
+    rebuilt = progress_crud.rebuild_user_event_progress(test_session, base_user.id, base_action_event.event_id)
+    after = (
+        rebuilt.report_count, rebuilt.action_counts_json, rebuilt.prompt_counts_json,
+        rebuilt.distinct_prompt_count, rebuilt.participation_day_count, rebuilt.current_streak,
+    )
+    assert before == after
+    assert after[0] == 3 and after[4] == 2 and after[5] == 2
+
+
+@pytest.mark.crud
+@pytest.mark.trigger
+def test_rebuild_tolerates_row_created_concurrently(test_session, base_user, base_action_event):
+    """A row inserted by a racing first report is reused (ON CONFLICT DO NOTHING), not re-added."""
+    from sqlalchemy import insert
+    from db.schema import UserEventProgress
+
+    test_session.add(UserAction(
+        user_id=base_user.id, action_event_id=base_action_event.id, event_id=base_action_event.event_id,
+        created_by=base_user.user_discord_id, created_at="2025-08-01T10:00:00+00:00",
+    ))
+    test_session.flush()
+    # the other transaction's insert, behind the ORM's back
+    test_session.execute(insert(UserEventProgress).values(
+        user_id=base_user.id, event_id=base_action_event.event_id, report_count=0, updated_at="x",
+    ))
+
+    prog = progress_crud.rebuild_user_event_progress(test_session, base_user.id, base_action_event.event_id)
+    assert prog.report_count == 1
+    assert test_session.query(UserEventProgress).filter_by(user_id=base_user.id).count() == 1
@@ -0,0 +1,61 @@
+import pytest
+from types import SimpleNamespace
+
+from db.schema import User
+from bot.crud import users_crud
+
+
+def _member(discord_id=555, name="newbie", display_name="Newbie", nick=None):
+    return SimpleNamespace(id=discord_id, name=name, display_name=display_name, global_name=None, nick=nick)
+
+
+# --- UPSERT ---
+@pytest.mark.crud
+@pytest.mark.basic
+def test_upsert_creates_then_only_writes_on_change(test_session):
+    member = _member()
+    user_id, written = users_crud.upsert_user_identity(test_session, member)
+    assert written
+    user = test_session.get(User, user_id)
+    assert (user.username, user.display_name, user.points) == ("newbie", "Newbie", 0)
+
+    assert users_crud.upsert_user_identity(test_session, member) == (user_id, False)
+
+    renamed = _member(nick="Nick")
+    assert users_crud.upsert_user_identity(test_session, renamed) == (user_id, True)
+    assert test_session.get(User, user_id, populate_existing=True).nickname == "Nick"
+
+
+# --- CACHE ---
+@pytest.mark.crud
+def test_cached_member_skips_the_database(test_session, monkeypatch):
+    member = _member()
+    user_id = users_crud.get_or_create_user_id(test_session, member)
+    test_session.commit()   # entries are published after commit
+
+    calls = []
+    monkeypatch.setattr(users_crud, "upsert_user_identity", lambda *a: calls.append(a))
+    assert users_crud.get_or_create_user_id(test_session, member) == user_id
+    assert calls == []
+
+
+@pytest.mark.crud
+def test_changed_fingerprint_resyncs(test_session):
+    user_id = users_crud.get_or_create_user_id(test_session, _member())
+    test_session.commit()
+
+    user = users_crud.get_or_create_user(test_session, _member(display_name="Renamed"))
+    assert user.id == user_id
+    assert user.display_name == "Renamed"
+
+
+@pytest.mark.crud
+def test_sync_user_identities_updates_known_members_only(test_session):
+    user_id = users_crud.get_or_create_user_id(test_session, _member())
+    changed = users_crud.sync_user_identities(
+        test_session, [_member(nick="Nick"), _member(discord_id=777, name="stranger")]
+    )
+
+    assert changed == 1
+    assert test_session.get(User, user_id, populate_existing=True).nickname == "Nick"
+    assert test_session.query(User).filter(User.user_discord_id == "777").first() is None
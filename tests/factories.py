@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
-from db.schema import Action, ActionEvent, Event, EventStatus, Reward, RewardEvent
+from db.schema import Action, ActionEvent, Event, EventStatus, Reward, RewardEvent, User, EventPrompt
 
 
 @pytest.fixture
@@ -128,4 +128,38 @@ def base_reward_event(test_session, base_event, base_reward):
     )
     test_session.add(reward_event)
     test_session.flush()
-    return reward_event
\ No newline at end of file
+    return reward_event
+
+
+@pytest.fixture
+def base_user(test_session):
+    """Create a base User for FK testing."""
+    user = User(
+        user_discord_id="1234",
+        username="tester",
+        display_name="Tester",
+        created_at=datetime.now(timezone.utc).isoformat()
+    )
+    test_session.add(user)
+    test_session.flush()
+    return user
+
+
+@pytest.fixture
+def base_prompts(test_session, base_event):
+    """Create three EventPrompts (two 'sfw', one 'nsfw') on base_event."""
+    prompts = []
+    for i, group in enumerate(["sfw", "sfw", "nsfw"], 1):
+        p = EventPrompt(
+            event_id=base_event.id,
+            group=group,
+            day_index=i,
+            code=f"p{i}",
+            label=f"Prompt {i}",
+            created_by="tester",
+            created_at=datetime.now(timezone.utc).isoformat()
+        )
+        test_session.add(p)
+        prompts.append(p)
+    test_session.flush()
+    return prompts
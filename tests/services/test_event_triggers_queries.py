@@ -0,0 +1,82 @@
+import json
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from sqlalchemy import event as sa_event
+
+from db.schema import EventTrigger, UserAction
+from bot.services.event_triggers_service import check_and_apply_triggers_for_action
+from bot.services.trigger_rules_cache import invalidate_trigger_rules
+
+
+@contextmanager
+def count_queries(session):
+    """Count SQL statements sent on the session's connection."""
+    statements = []
+    conn = session.connection()
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa_event.listen(conn, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        sa_event.remove(conn, "before_cursor_execute", _before)
+
+
+def _add_unreachable_triggers(session, event_id, n):
+    """n triggers of the types that used to cost one query each; none can be achieved."""
+    kinds = [
+        ("prompt_repeat", {"prompt_code": "p1"}, "min_count"),
+        ("prompt_unique", {"group": "sfw"}, "min_count"),
+        ("global_count", {}, "min_reports"),
+        ("event_count", {}, "min_reports"),
+    ]
+    for i in range(n):
+        ttype, cfg, threshold_key = kinds[i % len(kinds)]
+        session.add(EventTrigger(
+            event_id=event_id,
+            trigger_type=ttype,
+            config_json=json.dumps({**cfg, threshold_key: 1000 + i}),   # distinct configs
+            created_at=datetime.now(timezone.utc).isoformat(),
+        ))
+    session.flush()
+
+
+def _report(session, user, action_event):
+    ua = UserAction(
+        user_id=user.id,
+        action_event_id=action_event.id,
+        event_id=action_event.event_id,
+        created_by=user.user_discord_id,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+    session.add(ua)
+    session.flush()
+    return ua
+
+
+@pytest.mark.trigger
+@pytest.mark.event
+def test_trigger_pass_query_count_does_not_grow_with_triggers(test_session, base_user, base_event, base_action_event, base_prompts):
+    """The number of queries per evaluation is independent of how many triggers the event has."""
+    ua = _report(test_session, base_user, base_action_event)
+    _add_unreachable_triggers(test_session, base_event.id, 4)
+
+    # warm-up: creates the progress row from history and compiles the rules
+    check_and_apply_triggers_for_action(test_session, user=base_user, event=base_event, current_action=ua, current_prompts=[])
+
+    with count_queries(test_session) as few:
+        check_and_apply_triggers_for_action(test_session, user=base_user, event=base_event, current_action=ua, current_prompts=[])
+
+    _add_unreachable_triggers(test_session, base_event.id, 32)
+    invalidate_trigger_rules(base_event.id)
+    check_and_apply_triggers_for_action(test_session, user=base_user, event=base_event, current_action=ua, current_prompts=[])
+    with count_queries(test_session) as many:
+        lines = check_and_apply_triggers_for_action(test_session, user=base_user, event=base_event, current_action=ua, current_prompts=[])
+
+    assert lines == []
+    assert len(many) == len(few)
+    # granted logs, progress, event points, prompt index, global count (rules are cached)
+    assert len(many) <= 5
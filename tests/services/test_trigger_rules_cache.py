@@ -0,0 +1,87 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy.orm import Session
+
+from db.schema import EventTrigger
+from bot.services import trigger_rules_cache as rules_cache
+
+
+def _add_trigger(session, event_id, ttype, cfg):
+    trig = EventTrigger(
+        event_id=event_id,
+        trigger_type=ttype,
+        config_json=json.dumps(cfg),
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+    session.add(trig)
+    session.flush()
+    return trig
+
+
+# --- parse_trigger_config ---
+@pytest.mark.trigger
+@pytest.mark.basic
+@pytest.mark.parametrize("config_json,expected", [
+    ('{"min_count": "3", "group": "SFW"}', {"min_count": 3, "group": "SFW"}),
+    ('{"min_count": 2, "group": "all"}', {"min_count": 2, "group": None}),
+    ('{"min_days": "x"}', {"min_days": 0}),
+    ("not json", {"min_count": 0}),
+    (None, {"min_reports": 0}),
+])
+def test_parse_trigger_config(config_json, expected):
+    """Config is parsed once into typed, normalized fields."""
+    cfg = rules_cache.parse_trigger_config(config_json)
+    for key, value in expected.items():
+        assert getattr(cfg, key) == value
+
+
+# --- cache ---
+@pytest.mark.trigger
+def test_compiled_rules_are_cached_until_invalidated(test_session, base_event):
+    """Rules are compiled once per event; invalidation picks up edits."""
+    _add_trigger(test_session, base_event.id, "event_count", {"min_reports": 5})
+    _add_trigger(test_session, base_event.id, "not_a_trigger_type", {})
+
+    first = rules_cache.get_compiled_triggers(test_session, base_event.id)
+    assert [r.trigger_type for r in first] == ["event_count"]
+    assert first[0].config.min_reports == 5
+    assert first[0].label
+
+    _add_trigger(test_session, base_event.id, "streak", {"min_days": 3})
+    assert rules_cache.get_compiled_triggers(test_session, base_event.id) is first
+
+    rules_cache.invalidate_trigger_rules(base_event.id)
+    second = rules_cache.get_compiled_triggers(test_session, base_event.id)
+    assert sorted(r.trigger_type for r in second) == ["event_count", "streak"]
+
+
+@pytest.mark.trigger
+def test_stale_loader_does_not_repopulate_cache(test_session, base_event, monkeypatch):
+    """A compile that raced with an invalidation is returned but not cached."""
+    real_compile = rules_cache.compile_event_triggers
+
+    def compile_then_invalidate(session, event_id):
+        rules = real_compile(session, event_id)
+        rules_cache.invalidate_trigger_rules(event_id)   # edit committed meanwhile
+        return rules
+
+    monkeypatch.setattr(rules_cache, "compile_event_triggers", compile_then_invalidate)
+    rules_cache.get_compiled_triggers(test_session, base_event.id)
+    monkeypatch.setattr(rules_cache, "compile_event_triggers", real_compile)
+
+    assert base_event.id not in rules_cache._rules_by_event
+
+
+@pytest.mark.trigger
+def test_invalidate_on_commit_drops_rules_again_after_commit():
+    """Admin cogs edit inside their own session: rules compiled before the commit are dropped by it."""
+    session = Session()
+    rules_cache._rules_by_event[901] = ()
+    rules_cache.invalidate_trigger_rules_on_commit(session, 901)
+    assert 901 not in rules_cache._rules_by_event
+
+    rules_cache._rules_by_event[901] = ()     # compiled from the pre-commit rows
+    session.commit()
+    assert 901 not in rules_cache._rules_by_event
+    assert "_trigger_rules_invalidate" not in session.info
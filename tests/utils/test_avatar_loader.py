@@ -0,0 +1,75 @@
+import io
+import pytest
+from PIL import Image
+
+from bot.ui.renderers import avatar_loader
+from bot.utils.cache import DiskCache, LRUCache
+
+
+def _png_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", (256, 256), "blue").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class _FakeResponse:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def read(self):
+        return _png_bytes()
+
+
+class _FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return _FakeResponse()
+
+
+URL = "https://cdn.discordapp.com/avatars/1/abcdef.png?size=128"
+
+
+# --- Tile ---
+@pytest.mark.utils
+@pytest.mark.basic
+def test_avatar_tile_is_masked_120px():
+    tile = avatar_loader.make_avatar_tile(_png_bytes())
+    assert tile.size == avatar_loader.AVATAR_TILE_SIZE and tile.mode == "RGBA"
+    assert tile.getpixel((0, 0))[3] == 0        # corner outside the circle
+    assert tile.getpixel((60, 60))[3] == 255    # centre
+
+
+# --- Cache tiers ---
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_avatar_downloaded_once_per_url(monkeypatch):
+    """Memory tier: the second render reuses the tile without downloading."""
+    monkeypatch.setattr(avatar_loader, "_avatar_cache", LRUCache(maxsize=8))
+    monkeypatch.setattr(avatar_loader, "_avatar_disk", None)
+    session = _FakeSession()
+
+    first = await avatar_loader.load_avatar_tile(URL, session)
+    second = await avatar_loader.load_avatar_tile(URL, session)
+    assert first is second
+    assert session.urls == [URL]
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_avatar_disk_tier_survives_memory_eviction(monkeypatch, tmp_path):
+    """Disk tier: a fresh memory cache is refilled from disk, not from the CDN."""
+    monkeypatch.setattr(avatar_loader, "_avatar_disk", DiskCache(str(tmp_path), suffix=".png"))
+    monkeypatch.setattr(avatar_loader, "_avatar_cache", LRUCache(maxsize=8))
+    session = _FakeSession()
+    await avatar_loader.load_avatar_tile(URL, session)
+
+    monkeypatch.setattr(avatar_loader, "_avatar_cache", LRUCache(maxsize=8))
+    tile = await avatar_loader.load_avatar_tile(URL, session)
+    assert session.urls == [URL]
+    assert tile.size == avatar_loader.AVATAR_TILE_SIZE
@@ -0,0 +1,85 @@
+import asyncio
+import io
+import pytest
+from PIL import Image
+
+from bot.ui.renderers import badge_loader
+from bot.utils.cache import LRUCache
+
+
+def _png_bytes(size=(72, 72)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", size, "red").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class _FakeResponse:
+    def __init__(self, session):
+        self.session = session
+        self.status = 200
+
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.peak = max(self.session.peak, self.session.in_flight)
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.session.in_flight -= 1
+
+    async def read(self):
+        return _png_bytes()
+
+
+class _FakeSession:
+    def __init__(self):
+        self.urls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def get(self, url):
+        self.urls.append(url)
+        return _FakeResponse(self)
+
+
+@pytest.fixture
+def fresh_badge_cache(monkeypatch):
+    monkeypatch.setattr(badge_loader, "_badge_cache", LRUCache(maxsize=64))
+    monkeypatch.setattr(badge_loader, "_badge_disk", None)
+    monkeypatch.setattr(badge_loader, "_fetch_semaphore", asyncio.Semaphore(2))
+
+
+# --- Fetching ---
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_custom_emojis_fetched_concurrently_and_bounded(fresh_badge_cache):
+    """Misses are fetched in parallel, never more than the semaphore allows; order is kept."""
+    emojis = [f"<:badge{i}:1234567890123456{i:02d}>" for i in range(6)]
+    session = _FakeSession()
+
+    icons = await badge_loader.extract_badge_icons(emojis, session)
+
+    assert len(session.urls) == 6
+    assert session.peak == 2
+    assert all(isinstance(i, Image.Image) and i.size == badge_loader.BADGE_SIZE for i in icons)
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_second_render_hits_memory_cache(fresh_badge_cache):
+    """Decoded icons are reused: no download on the second call."""
+    emojis = ["<:badge:123456789012345678>"]
+    session = _FakeSession()
+    first = await badge_loader.extract_badge_icons(emojis, session)
+    second = await badge_loader.extract_badge_icons(emojis, session)
+
+    assert len(session.urls) == 1
+    assert first[0] is second[0]
+    assert badge_loader._badge_cache.stats()["hits"] == 1
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_unknown_unicode_emoji_falls_back_to_text(fresh_badge_cache):
+    icons = await badge_loader.extract_badge_icons(["\U0001FAE8\U0001FAE8"], _FakeSession())
+    assert icons == ["\U0001FAE8\U0001FAE8"]
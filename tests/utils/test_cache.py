@@ -0,0 +1,89 @@
+import os
+import time
+
+import pytest
+
+from bot.utils.cache import DiskCache, LRUCache, digest
+
+
+# --- LRUCache ---
+@pytest.mark.utils
+@pytest.mark.basic
+def test_lru_evicts_least_recently_used():
+    """Reading a key refreshes it; the oldest untouched key goes first."""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.utils
+def test_lru_counts_hits_and_misses():
+    cache = LRUCache(maxsize=4)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.utils
+def test_lru_rejects_empty_bound():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+# --- DiskCache / digest ---
+@pytest.mark.utils
+def test_disk_cache_round_trip(tmp_path):
+    disk = DiskCache(str(tmp_path), suffix=".png")
+    assert disk.get("k") is None
+    disk.set("k", b"data")
+    assert disk.get("k") == b"data"
+    assert (tmp_path / "k.png").exists()
+
+
+@pytest.mark.utils
+def test_digest_is_stable_and_order_sensitive():
+    assert digest(1, "a", ("x",)) == digest(1, "a", ("x",))
+    assert digest("a", "b") != digest("b", "a")
+
+
+@pytest.mark.utils
+def test_disk_cache_prunes_least_recently_used(tmp_path):
+    disk = DiskCache(str(tmp_path), suffix=".png", max_files=2, prune_every=1)
+    for i, key in enumerate(("a", "b")):
+        disk.set(key, b"x")
+        os.utime(tmp_path / f"{key}.png", (1000 + i, 1000 + i))
+    disk.get("a")               # refreshes a: b is now the least recently used
+    disk.set("c", b"x")
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.png", "c.png"]
+
+
+@pytest.mark.utils
+def test_disk_cache_prunes_by_age(tmp_path):
+    disk = DiskCache(str(tmp_path), suffix=".png", max_age=3600)
+    disk.set("old", b"x")
+    disk.set("new", b"x")
+    os.utime(tmp_path / "old.png", (time.time() - 7200, time.time() - 7200))
+
+    assert disk.prune() == 1
+    assert [p.name for p in tmp_path.iterdir()] == ["new.png"]
+
+
+@pytest.mark.utils
+def test_disk_cache_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    disk = DiskCache(str(tmp_path), suffix=".png")
+
+    def _fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", _fail)
+    disk.set("k", b"data")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,48 @@
+import csv
+import gzip
+import io
+
+import pytest
+
+from bot.utils.csv_export import write_csv_parts
+
+
+def _read(part, compressed=False):
+    data = part.file.read()
+    if compressed:
+        data = gzip.decompress(data)
+    return list(csv.reader(io.StringIO(data.decode("utf-8"))))
+
+
+# --- Single part ---
+@pytest.mark.utils
+@pytest.mark.basic
+def test_small_export_is_one_file_with_preamble_and_header():
+    (part,) = write_csv_parts(
+        iter([[1, "a,b"], [2, "c"]]), ["id", "name"], filename="report.csv", preamble=[["Title"], []]
+    )
+    assert (part.filename, part.rows) == ("report.csv", 2)
+    assert _read(part) == [["Title"], [], ["id", "name"], ["1", "a,b"], ["2", "c"]]
+
+
+# --- Splitting ---
+@pytest.mark.utils
+def test_export_is_split_under_the_size_cap():
+    rows = ([i, "x" * 40] for i in range(2000))
+    parts = write_csv_parts(rows, ["id", "pad"], filename="big.csv", max_bytes=10_000, compress=False)
+
+    assert len(parts) > 1
+    assert [p.filename for p in parts[:2]] == ["big.part1.csv", "big.part2.csv"]
+    assert all(p.size <= 10_000 for p in parts)
+    assert sum(p.rows for p in parts) == 2000
+    # every part repeats the header
+    assert all(_read(p)[0] == ["id", "pad"] for p in parts)
+
+
+# --- Compression ---
+@pytest.mark.utils
+def test_gzip_export_round_trips():
+    (part,) = write_csv_parts(([i] for i in range(500)), ["n"], filename="nums.csv", compress=True)
+    assert part.filename == "nums.csv.gz"
+    rows = _read(part, compressed=True)
+    assert rows[0] == ["n"] and len(rows) == 501
@@ -0,0 +1,44 @@
+import threading
+import pytest
+from sqlalchemy import text
+
+from db.database import run_db, run_in_session, db_session_async
+
+
+# --- run_db ---
+@pytest.mark.utils
+@pytest.mark.basic
+@pytest.mark.asyncio
+async def test_run_db_runs_off_the_event_loop_thread():
+    """Blocking work must be executed on the DB executor, not the loop thread."""
+    loop_thread = threading.get_ident()
+    worker_thread = await run_db(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_run_db_forwards_args_and_exceptions():
+    """Positional/keyword args are forwarded and exceptions surface to the awaiting coroutine."""
+    assert await run_db(int, "ff", base=16) == 255
+    with pytest.raises(ValueError):
+        await run_db(int, "not-a-number")
+
+
+# --- run_in_session / db_session_async ---
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_run_in_session_passes_a_live_session():
+    """fn receives a session as first argument and its return value is awaited back."""
+    result = await run_in_session(lambda s, n: s.execute(text("SELECT :n"), {"n": n}).scalar(), 7)
+    assert result == 7
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_db_session_async_runner():
+    """The async session facade runs each call on the executor with the same session."""
+    async with db_session_async() as s:
+        first = await s.run(lambda session: id(session))
+        second = await s.run(lambda session: id(session))
+    assert first == second
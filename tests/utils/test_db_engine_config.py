@@ -0,0 +1,81 @@
+import pytest
+
+from db.database import resolve_engine_settings, build_engine_kwargs, ENGINE_PROFILES, PoolMetrics
+
+
+# --- resolve_engine_settings ---
+@pytest.mark.utils
+@pytest.mark.basic
+@pytest.mark.parametrize("db_mode,profile", [
+    ("test", "test"),
+    ("dev", "dev"),
+    ("something-else", "dev"),
+    ("qa", "qa"),
+    ("staging", "qa"),
+    ("prod", "prod"),
+    ("production", "prod"),
+])
+def test_profile_per_db_mode(db_mode, profile):
+    """Each DB_MODE maps onto its engine profile, unknown modes fall back to dev."""
+    assert resolve_engine_settings(db_mode, env={}) == ENGINE_PROFILES[profile]
+
+
+@pytest.mark.utils
+def test_env_overrides_profile_values():
+    """DB_* variables override the profile; empty values are ignored."""
+    env = {"DB_POOL_SIZE": "42", "DB_POOL_PRE_PING": "false", "DB_POOL_TIMEOUT": "", "DB_STATEMENT_TIMEOUT_MS": "500"}
+    settings = resolve_engine_settings("prod", env=env)
+    assert settings["pool_size"] == 42
+    assert settings["pool_pre_ping"] is False
+    assert settings["pool_timeout"] == ENGINE_PROFILES["prod"]["pool_timeout"]
+    assert settings["statement_timeout_ms"] == 500
+
+
+@pytest.mark.utils
+def test_invalid_env_override_raises():
+    """A non-numeric override fails loudly at startup."""
+    with pytest.raises(RuntimeError):
+        resolve_engine_settings("dev", env={"DB_POOL_SIZE": "lots"})
+
+
+# --- build_engine_kwargs ---
+@pytest.mark.utils
+def test_statement_timeout_only_for_postgres():
+    """statement_timeout is passed as a libpq option on Postgres URLs only."""
+    settings = dict(ENGINE_PROFILES["prod"])
+    pg = build_engine_kwargs("postgresql+psycopg2://u:p@h/db", settings, env={})
+    assert pg["connect_args"] == {"options": "-c statement_timeout=15000"}
+    assert pg["pool_size"] == settings["pool_size"]
+    other = build_engine_kwargs("sqlite://", settings, env={})
+    assert "connect_args" not in other
+
+
+# --- PoolMetrics ---
+@pytest.mark.utils
+def test_pool_metrics_snapshot():
+    """Checkout waits, peak usage and timeouts are aggregated."""
+    m = PoolMetrics()
+    m.record_checkout(0.001, in_use=1)
+    m.record_checkout(0.003, in_use=3)
+    m.record_timeout(0.5)
+    snap = m.snapshot()
+    assert snap["checkouts"] == 2
+    assert snap["timeouts"] == 1
+    assert snap["in_use_peak"] == 3
+    assert snap["wait_avg_ms"] == pytest.approx(2.0)
+    assert snap["wait_max_ms"] == pytest.approx(500.0)
+
+
+@pytest.mark.utils
+def test_pool_metrics_reset_keeps_lock_and_window():
+    """reset() zeroes the counters in place instead of swapping the lock under concurrent recorders."""
+    m = PoolMetrics(window=5)
+    lock = m._lock
+    m.record_checkout(0.002, in_use=2)
+    m.record_timeout(0.1)
+    m.reset()
+    assert m._lock is lock and m._waits.maxlen == 5
+    assert m.snapshot() == {
+        "checkouts": 0, "timeouts": 0, "in_use_peak": 0,
+        "wait_avg_ms": 0.0, "wait_p95_ms": 0.0, "wait_max_ms": 0.0,
+    }
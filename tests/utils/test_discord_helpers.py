@@ -0,0 +1,41 @@
+import pytest
+from bot.utils import discord_helpers
+
+
+def _no_db(*args, **kwargs):
+    raise AssertionError("label rendering must not open a session when lookups are provided")
+
+
+# --- format_trigger_label ---
+@pytest.mark.utils
+@pytest.mark.trigger
+def test_format_trigger_label_with_lookups_uses_no_session(monkeypatch):
+    """Pre-resolved maps are used instead of the session-opening services."""
+    monkeypatch.setattr(discord_helpers, "get_prompt_dto_by_code_and_event", _no_db)
+    monkeypatch.setattr(discord_helpers, "get_action_event_dto_by_id", _no_db)
+
+    prompt = discord_helpers.format_trigger_label(
+        "prompt_repeat", {"prompt_code": "p1", "min_count": 3}, 1,
+        prompt_labels={"p1": "Moonlight"}, action_event_labels={},
+    )
+    action = discord_helpers.format_trigger_label(
+        "action_repeat", {"action_event_id": "7", "min_count": 2}, 1,
+        prompt_labels={}, action_event_labels={7: "Write a fic"},
+    )
+    assert prompt == 'Do "Moonlight" (p1) prompt 3 times'
+    assert action == 'Do "Write a fic" action 2 times'
+
+
+@pytest.mark.utils
+@pytest.mark.trigger
+@pytest.mark.parametrize("ttype,config,expected", [
+    ("prompt_repeat", {"prompt_code": "zz", "min_count": 2}, "Do (zz) prompt 2 times"),
+    ("action_repeat", {"action_event_id": 99, "min_count": 4}, "Do #99 action 4 times"),
+])
+def test_format_trigger_label_missing_lookup_falls_back(monkeypatch, ttype, config, expected):
+    """Unknown codes / ids fall back to the raw reference, still without DB access."""
+    monkeypatch.setattr(discord_helpers, "get_prompt_dto_by_code_and_event", _no_db)
+    monkeypatch.setattr(discord_helpers, "get_action_event_dto_by_id", _no_db)
+    assert discord_helpers.format_trigger_label(
+        ttype, config, 1, prompt_labels={}, action_event_labels={}
+    ) == expected
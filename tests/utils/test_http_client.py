@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import MagicMock
+
+from bot.utils import http_client
+from bot.presentation.profile_presentation import AVATAR_FETCH_SIZE, profile_avatar_url
+
+
+# --- Shared client ---
+@pytest.mark.utils
+@pytest.mark.basic
+@pytest.mark.asyncio
+async def test_http_client_is_shared_until_closed():
+    """Every caller gets the same pooled session; closing drops it and the next call makes a new one."""
+    first = await http_client.start_http_client()
+    assert http_client.get_http_client() is first
+    assert first.connector.limit_per_host == http_client.HTTP_LIMIT_PER_HOST
+
+    await http_client.close_http_client()
+    assert first.closed
+
+    second = http_client.get_http_client()
+    assert second is not first
+    await http_client.close_http_client()
+
+
+# --- Avatar size ---
+@pytest.mark.utils
+def test_profile_avatar_url_requests_small_static_png():
+    member = MagicMock()
+    member.display_avatar.replace.return_value.url = "https://cdn.example/avatar.png?size=128"
+
+    assert profile_avatar_url(member) == "https://cdn.example/avatar.png?size=128"
+    member.display_avatar.replace.assert_called_once_with(size=AVATAR_FETCH_SIZE, static_format="png")
@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+
+from db.instrumentation import (
+    CommandStats,
+    CommandTrace,
+    current_trace,
+    normalize_sql,
+    percentile,
+    record_statement,
+    trace_command,
+)
+from db.database import run_db
+
+
+# --- normalize_sql ---
+@pytest.mark.utils
+@pytest.mark.basic
+def test_normalize_sql_groups_same_shape():
+    a = normalize_sql("SELECT * FROM users WHERE id = 12 AND name = 'bob'  AND x IN (%(a)s, %(b)s)")
+    b = normalize_sql("select * from users where id = 7 and name = 'it''s' and x in (%(c)s)")
+    assert a == "SELECT * FROM users WHERE id = ? AND name = ? AND x IN (?...)"
+    assert b == "select * from users where id = ? and name = ? and x in (?)"
+    assert normalize_sql("SELECT :p::text") == "SELECT ?::text"
+
+
+# --- aggregates ---
+@pytest.mark.utils
+def test_command_stats_percentiles_and_queries_per_call():
+    stats = CommandStats(window=100)
+    for i in range(1, 21):
+        trace = CommandTrace("shop")
+        trace.record("SELECT 1", i / 1000)      # 1..20 ms
+        trace.record("SELECT 2", 0.0)
+        stats.record(trace, 0.05)
+
+    (row,) = stats.snapshot()
+    assert row["command"] == "shop" and row["calls"] == 20
+    assert row["db_p50_ms"] == pytest.approx(11.0)
+    assert row["db_p95_ms"] == pytest.approx(20.0)
+    assert row["queries_avg"] == 2.0
+    assert percentile([], 0.95) == 0.0
+
+
+@pytest.mark.utils
+def test_trace_keeps_slowest_statements():
+    trace = CommandTrace("x")
+    for ms in (5, 50, 1, 30, 40):
+        trace.record(f"SELECT {ms}", ms / 1000)
+    assert [round(t * 1000) for t, _ in trace.slowest] == [50, 40, 30]
+    assert trace.queries == 5
+
+
+# --- attribution ---
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_trace_follows_run_db_onto_the_executor():
+    with trace_command("profile") as trace:
+        await run_db(record_statement, "SELECT 1", 0.002)
+        await asyncio.gather(run_db(record_statement, "SELECT 2", 0.001), run_db(record_statement, "SELECT 3", 0.001))
+    assert trace.queries == 3
+    assert current_trace.get() is None
@@ -0,0 +1,62 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from bot.utils.metrics import (
+    Histogram,
+    first_response,
+    late_responses,
+    render_prometheus,
+    time_to_defer,
+    track_interaction,
+    unanswered,
+)
+
+
+def _interaction(age_seconds=0.0):
+    return SimpleNamespace(created_at=datetime.now(timezone.utc) - timedelta(seconds=age_seconds))
+
+
+# --- Histogram ---
+@pytest.mark.utils
+@pytest.mark.basic
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("t_seconds", "test", ("name",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, 'a"b')
+
+    lines = h.render()
+    assert 't_seconds_bucket{name="a\\"b",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{name="a\\"b",le="1.0"} 2' in lines
+    assert 't_seconds_bucket{name="a\\"b",le="+Inf"} 3' in lines
+    assert 't_seconds_count{name="a\\"b"} 3' in lines
+
+
+# --- track_interaction ---
+@pytest.mark.utils
+def test_defer_is_timed_and_late_answers_counted():
+    with track_interaction(_interaction(age_seconds=2.9), "command", "t_defer") as timing:
+        timing.mark_response("defer")
+        timing.started -= 0.5       # pretend the defer came 0.5 s in
+        timing.responded += 0.5
+        timing.mark_response("send_message")     # only the first response counts
+
+    assert time_to_defer.count("command", "t_defer") == 1
+    assert first_response.count("command", "t_defer") == 1
+    assert late_responses.value("command", "t_defer") == 1
+
+
+@pytest.mark.utils
+def test_handler_without_response_is_unanswered():
+    with track_interaction(_interaction(), "component", "t_silent"):
+        pass
+    assert unanswered.value("component", "t_silent") == 1
+    assert first_response.count("component", "t_silent") == 0
+
+
+@pytest.mark.utils
+def test_render_includes_pool_and_cache_series():
+    text = render_prometheus()
+    assert "# TYPE dw_interaction_handler_seconds histogram" in text
+    assert "dw_db_pool_checked_out" in text
+    assert "dw_event_loop_lag_max_seconds" in text
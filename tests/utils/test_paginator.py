@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bot.ui.common.paginator import LazyPage, LazyPaginator
+
+
+class _Response:
+    def __init__(self):
+        self.sent = []
+
+    async def edit_message(self, **kwargs):
+        self.sent.append(("edit", kwargs))
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append(("send", content))
+
+
+def _interaction():
+    return SimpleNamespace(user=SimpleNamespace(id=1), response=_Response(), message=None)
+
+
+class _Provider:
+    """Three pages (cursors None -> 1 -> 2); cursors in `fail` raise once."""
+
+    def __init__(self, last: int = 2, fail=(), delay: float = 0.0):
+        self.calls = []
+        self.last = last
+        self.fail = set(fail)
+        self.delay = delay
+
+    async def __call__(self, cursor):
+        self.calls.append(cursor)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        n = cursor or 0
+        if n in self.fail:
+            self.fail.discard(n)
+            raise RuntimeError(f"page {n} down")
+        return LazyPage(content=f"page {n}", next_cursor=n + 1 if n < self.last else None)
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_lazy_paginator_prefetches_and_detects_last_page():
+    provider = _Provider()
+    paginator = LazyPaginator(provider)
+
+    first = await paginator.start()
+    assert first["content"].startswith("page 0") and paginator.prev_button.disabled
+    await asyncio.sleep(0)
+    assert provider.calls == [None, 1]          # page 2 prefetched right away
+
+    await paginator.next_page(_interaction())
+    await paginator.next_page(_interaction())
+    assert [p.content for p in paginator.pages] == ["page 0", "page 1", "page 2"]
+    assert provider.calls == [None, 1, 2]       # each page fetched once
+    assert paginator.next_button.disabled and paginator._lookahead is None
+
+    await paginator.next_page(_interaction())   # on the last page: stays put
+    assert paginator.index == 2 and len(paginator.pages) == 3
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_lazy_paginator_concurrent_next_clicks_append_each_page_once():
+    provider = _Provider(delay=0.01)
+    paginator = LazyPaginator(provider)
+    await paginator.start()
+
+    await asyncio.gather(paginator.next_page(_interaction()), paginator.next_page(_interaction()))
+    assert [p.content for p in paginator.pages] == ["page 0", "page 1", "page 2"]
+    assert paginator.index == 2
+    assert provider.calls.count(1) == 1 and provider.calls.count(2) == 1
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_lazy_paginator_failed_page_is_retried_and_dropped_on_close():
+    provider = _Provider(fail={1})
+    paginator = LazyPaginator(provider)
+    await paginator.start()
+
+    failed = _interaction()
+    await paginator.next_page(failed)           # prefetch of page 1 raised
+    assert failed.response.sent == [("send", "❌ Couldn't load the next page.")]
+    assert paginator.index == 0 and len(paginator.pages) == 1
+
+    await paginator.next_page(_interaction())   # fetched again on the next click
+    assert paginator.pages[-1].content == "page 1"
+
+    provider.fail.add(2)
+    await asyncio.sleep(0)                      # prefetch of page 2 fails in the background
+    task = paginator._lookahead
+    assert task is not None and task.done()
+    await paginator.close(_interaction())
+    assert paginator._lookahead is None and paginator.is_finished()
+    assert isinstance(task.exception(), RuntimeError)
@@ -0,0 +1,124 @@
+import io
+import threading
+import pytest
+from PIL import Image
+
+from bot.ui.renderers import profile_card
+from bot.ui.renderers.profile_card import generate_profile_card, get_profile_card_assets, run_render
+
+
+def _avatar_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGBA", (64, 64), "purple").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+# --- Assets ---
+@pytest.mark.utils
+@pytest.mark.basic
+def test_assets_are_loaded_once(monkeypatch):
+    """Fonts/background/icons are decoded on first use only."""
+    calls = []
+    real_loader = profile_card.load_profile_card_assets
+    monkeypatch.setattr(profile_card, "_assets", None)
+    monkeypatch.setattr(profile_card, "load_profile_card_assets", lambda: calls.append(1) or real_loader())
+
+    first = get_profile_card_assets()
+    second = get_profile_card_assets()
+    assert first is second
+    assert len(calls) == 1
+
+
+@pytest.mark.utils
+def test_render_does_not_mutate_shared_background():
+    """Each card draws on a copy of the preloaded background."""
+    assets = get_profile_card_assets()
+    before = assets.background.tobytes()
+    generate_profile_card(_avatar_bytes(), "Someone", 10, 20, "The Title", ["⭐"], assets=assets)
+    assert assets.background.tobytes() == before
+
+
+# --- Executor ---
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_render_runs_off_the_event_loop():
+    """Pillow work happens on the render executor and returns a PNG buffer."""
+    loop_thread = threading.get_ident()
+
+    def _render_and_report_thread():
+        return threading.get_ident(), generate_profile_card(_avatar_bytes(), "Someone", 1, 2, None, [])
+
+    worker_thread, buf = await run_render(_render_and_report_thread)
+    assert worker_thread != loop_thread
+    assert buf.getvalue().startswith(b"\x89PNG")
+
+
+# --- Rendered card cache ---
+def _vm(**overrides):
+    from bot.presentation.profile_presentation import ProfileVM
+    fields = dict(
+        display_name="Someone", points=1, total_earned=2, title_text=None,
+        badge_emojis=["⭐"], avatar_url="https://cdn.example/avatars/1/abc.png",
+    )
+    fields.update(overrides)
+    return ProfileVM(**fields)
+
+
+@pytest.mark.utils
+def test_card_key_tracks_rendered_fields():
+    """Same content -> same key; any rendered field change -> new key."""
+    from bot.presentation.profile_presentation import profile_card_key
+    assert profile_card_key(_vm()) == profile_card_key(_vm())
+    assert profile_card_key(_vm()) != profile_card_key(_vm(points=5))
+    assert profile_card_key(_vm()) != profile_card_key(_vm(badge_emojis=["⭐", "🔥"]))
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_cached_card_skips_download_and_render(monkeypatch):
+    """A cache hit returns the stored bytes without any HTTP session or Pillow work."""
+    from bot.presentation import profile_presentation as pp
+    from bot.utils.cache import LRUCache
+
+    monkeypatch.setattr(pp, "_card_cache", LRUCache(maxsize=4))
+    monkeypatch.setattr(pp, "_card_disk", None)
+    vm = _vm()
+    pp._card_cache.set(pp.profile_card_key(vm), b"cached-png")
+
+    def _fail(*a, **k):
+        raise AssertionError("should not download or render on a hit")
+
+    monkeypatch.setattr(pp, "get_http_client", _fail)
+    monkeypatch.setattr(pp, "generate_profile_card", _fail)
+
+    buf = await pp.render_profile_card(vm)
+    assert buf.getvalue() == b"cached-png"
+
+
+@pytest.mark.utils
+@pytest.mark.asyncio
+async def test_degraded_card_is_not_cached(monkeypatch, tmp_path):
+    """A custom badge that fell back to text (CDN failure) keeps the card out of both caches."""
+    from bot.presentation import profile_presentation as pp
+    from bot.utils.cache import DiskCache, LRUCache
+
+    monkeypatch.setattr(pp, "_card_cache", LRUCache(maxsize=4))
+    monkeypatch.setattr(pp, "_card_disk", DiskCache(str(tmp_path), suffix=".png"))
+    monkeypatch.setattr(pp, "get_http_client", lambda: None)
+    monkeypatch.setattr(pp, "load_avatar_tile", lambda url, session: _async(_avatar_bytes()))
+    vm = _vm(badge_emojis=["<:star:123456789012345678>"])
+
+    monkeypatch.setattr(pp, "extract_badge_icons", lambda emojis, session: _async(list(emojis)))
+    await pp.render_profile_card(vm)
+    assert pp.profile_card_key(vm) not in pp._card_cache
+    assert not list(tmp_path.iterdir())
+
+    icon = Image.new("RGBA", (40, 40), "gold")
+    monkeypatch.setattr(pp, "extract_badge_icons", lambda emojis, session: _async([icon]))
+    await pp.render_profile_card(vm)
+    assert pp.profile_card_key(vm) in pp._card_cache
+    assert (tmp_path / f"{pp.profile_card_key(vm)}.png").exists()
+
+
+async def _async(value):
+    return value
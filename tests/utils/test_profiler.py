@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from bot.utils import profiler
+from bot.utils.profiler import (
+    SlowCallbackHandler,
+    collapsed_text,
+    hot_frames,
+    recent_slow_callbacks,
+    run_cprofile,
+    run_sampler,
+    sample_stacks,
+)
+
+
+def _spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+# --- stack sampler ---
+@pytest.mark.utils
+def test_sample_stacks_sees_busy_thread():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="spinner")
+    worker.start()
+    try:
+        stacks, rounds = sample_stacks(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert rounds > 0
+    spinner = [s for s in stacks if s.startswith("spinner;")]
+    assert spinner and all(s.endswith("test_profiler.py:_spin") for s in spinner)
+    assert not any(s.endswith("profiler.py:sample_stacks") for s in stacks)   # never samples itself
+
+
+@pytest.mark.utils
+@pytest.mark.basic
+def test_hot_frames_skip_idle_loop_and_other_threads():
+    stacks = Counter({
+        "MainThread;base_events.py:BaseEventLoop._run_once;selectors.py:EpollSelector.select": 70,
+        "MainThread;events.py:Handle._run;profile_card.py:generate_profile_card": 20,
+        "MainThread;events.py:Handle._run;shop.py:ShopCommands.shop": 10,
+        "db_0;thread.py:_worker;cursor.py:execute": 500,
+    })
+    top, busy, total = hot_frames(stacks, "MainThread")
+    assert top == [("profile_card.py:generate_profile_card", 20), ("shop.py:ShopCommands.shop", 10)]
+    assert (busy, total) == (30, 100)
+    assert collapsed_text(stacks).splitlines()[0] == "db_0;thread.py:_worker;cursor.py:execute 500"
+
+
+# --- guarded runs ---
+@pytest.mark.utils
+def test_only_one_profile_at_a_time():
+    async def scenario():
+        first = asyncio.create_task(run_cprofile(1))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ValueError):
+            await run_sampler(1)
+        return await first
+
+    result = asyncio.run(scenario())
+    assert result["calls"] > 0 and result["text"] and result["pstats"]
+    assert not profiler._profile_lock.locked()
+
+
+@pytest.mark.utils
+@pytest.mark.basic
+def test_duration_bounds():
+    with pytest.raises(ValueError):
+        asyncio.run(run_sampler(0))
+    with pytest.raises(ValueError):
+        asyncio.run(run_cprofile(profiler.PROFILE_MAX_SECONDS + 1))
+
+
+# --- slow callbacks ---
+@pytest.mark.utils
+def test_slow_callback_handler_keeps_offending_task():
+    profiler.slow_callbacks.clear()
+    handler = SlowCallbackHandler()
+    record = logging.LogRecord("asyncio", logging.WARNING, __file__, 1, "Executing %s took %.3f seconds",
+                               ("<Task pending name='Task-7' coro=<render() running at card.py:12>>", 0.25), None)
+    handler.emit(record)
+    handler.emit(logging.LogRecord("asyncio", logging.WARNING, __file__, 1, "other %s", ("x",), None))
+
+    entries = recent_slow_callbacks()
+    assert len(entries) == 1
+    assert entries[0]["ms"] == 250.0 and "coro=<render()" in entries[0]["callback"]
+
+
+@pytest.mark.utils
+def test_debug_mode_reports_blocking_coroutine():
+    profiler.slow_callbacks.clear()
+
+    async def blocker():
+        time.sleep(0.08)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        profiler.set_slow_callback_detection(loop, 50)
+        try:
+            await asyncio.create_task(blocker())
+        finally:
+            profiler.set_slow_callback_detection(loop, 0)
+        return loop.get_debug()
+
+    assert asyncio.run(scenario()) is False
+    assert any("blocker()" in e["callback"] for e in recent_slow_callbacks())
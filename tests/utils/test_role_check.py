@@ -44,4 +44,22 @@ async def test_is_admin_or_mod_true_if_mod_role_matches(guild_with_member):
     interaction = MagicMock(guild=guild, user=MagicMock(id=1234))
 
     with patch("bot.utils.MOD_ROLE_IDS", [mock_mod_role.id]):
-        assert await is_admin_or_mod(interaction) is True
\ No newline at end of file
+        assert await is_admin_or_mod(interaction) is True
+
+@pytest.mark.utils
+@pytest.mark.access
+@pytest.mark.asyncio
+async def test_is_admin_rejects_mod_role_without_administrator(guild_with_member):
+    """Admin-only commands (profiler, asyncio debug) are not open to mod roles."""
+    from bot.utils.permissions import is_admin
+    guild, member = guild_with_member
+    mock_mod_role = MagicMock()
+    mock_mod_role.id = MOD_ROLE_IDS[0] if MOD_ROLE_IDS else 123456789
+    member.roles = [mock_mod_role]
+
+    member.guild_permissions.administrator = False
+    interaction = MagicMock(guild=guild, user=MagicMock(id=1234))
+    assert await is_admin(interaction) is False
+
+    member.guild_permissions.administrator = True
+    assert await is_admin(interaction) is True